@@ -0,0 +1,3 @@
+@echo off
+python script\batch_dca.py
+pause
\ No newline at end of file
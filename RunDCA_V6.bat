@@ -1,3 +1,3 @@
 @echo off
-python script\DcaV6.py
+python script\DcaAll.py
 pause
\ No newline at end of file
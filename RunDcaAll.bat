@@ -0,0 +1,3 @@
+@echo off
+python script\DcaAll.py
+pause
\ No newline at end of file
@@ -0,0 +1,3 @@
+@echo off
+python script\workbook_store.py .\Data\show_data.xlsx .\Data\data_resampling_cumProd.xlsx .\Data\show_historicalData.xlsx
+pause
\ No newline at end of file
@@ -0,0 +1,3 @@
+@echo off
+python script\SmartWell.py
+pause
\ No newline at end of file
@@ -2,11 +2,11 @@ import dash
 from dash import dcc, html, Input, Output, dash_table
 import pandas as pd
 import os, webbrowser
+import flask
 from dash.exceptions import PreventUpdate
 from dash.dependencies import State
-
-df = pd.read_csv('./Data/dataset_toFilter.csv') 
-df['DATE'] = pd.to_datetime(df['DATE'])
+import data_provider
+import table_pages
 
 completion_features = ['VSH', 'PHI', 'SW', 'NET_THICK', 'N_OPEN_RESERVOIR']
 event_features = ['EVENT', 'LAST_EVENT', 'EVENT_PLATFORM', 'LAST_EVENT_PLATFORM', 'NORM_PROD_DAYS']
@@ -16,198 +16,246 @@ ratios = ['LIQUID', 'WATERCUT', 'GLR', 'GOR']
 targets = ['OIL', 'WATER', 'GAS']
 additional = ['Universal']
 
-app = dash.Dash(__name__)
-app.layout = html.Div(
-    style={'padding': '20px', 'font-family': 'Arial, sans-serif'},
-    children=[
-        html.Div(
-            children=[
-                html.H1("Bekapai DataFrame Display (WIP)",
-                        style={'text-align': 'center', 'margin-bottom': '30px', 'position': 'sticky', 'top': 0, 'z-index': 9999, 'background-color': '#f9f9f9', 'padding': '10px'}),
-            ]
-        ),
+app = dash.Dash(__name__, suppress_callback_exceptions=True)
+server = app.server
 
-        html.Div(
-            style={
-                'border': '1px solid #ddd', 
-                'padding': '20px', 
-                'border-radius': '8px',
-                'margin-bottom': '30px', 
-                'box-shadow': '0 4px 8px rgba(0, 0, 0, 0.1)'
-            },
-            children=[
-                html.Div(
-                    style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
-                    children=[
-                        html.Div(
-                            style={'width': '30%'},
-                            children=[
-                                html.Label('Select Platform:', style={'font-weight': 'bold'}),
-                                dcc.Dropdown(
-                                    id='platform-dropdown',
-                                    options=[{'label': platform, 'value': platform} for platform in df['Platform'].unique()],
-                                    value=df['Platform'].unique(), 
-                                    multi=True,
-                                    placeholder='Select one or more platforms...'
-                                )
-                            ]
-                        ),
-                        html.Div(
-                            style={'width': '30%'},
-                            children=[
-                                html.Label('Select Well:', style={'font-weight': 'bold'}),
-                                dcc.Dropdown(
-                                    id='universal-dropdown',
-                                    options=[{'label': universal, 'value': universal} for universal in df['Universal'].unique()],
-                                    value=df['Universal'].unique(),
-                                    multi=True,
-                                    placeholder='Select one or more Universal values...'
-                                )
-                            ]
-                        ),
-                        html.Div(
-                            style={'width': '30%'},
-                            children=[
-                                html.Label('Select Date Range:', style={'font-weight': 'bold'}),
-                                dcc.DatePickerRange(
-                                    id='date-picker-range',
-                                    start_date=df['DATE'].min(),
-                                    end_date=df['DATE'].max(),
-                                    display_format='DD-MM-YYYY'
-                                )
-                            ]
-                        )
-                    ]
-                ),
+def layout():
+    df = data_provider.filter_data()
+    return html.Div(
+        style={'padding': '20px', 'font-family': 'Arial, sans-serif'},
+        children=[
+            html.Div(
+                children=[
+                    html.H1("Bekapai DataFrame Display (WIP)",
+                            style={'text-align': 'center', 'margin-bottom': '30px', 'position': 'sticky', 'top': 0, 'z-index': 9999, 'background-color': '#f9f9f9', 'padding': '10px'}),
+                ]
+            ),
 
-                html.Div(
-                    style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
-                    children=[
-                        html.Div(
-                            style={'width': '48%'},
-                            children=[
-                                html.Label('Completion Features:', style={'font-weight': 'bold'}),
-                                dcc.Dropdown(
-                                    id='completion-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in completion_features],
-                                    value=completion_features,
-                                    multi=True,
-                                    placeholder='Select completion features...'
-                                )
-                            ]
-                        ),
-                        html.Div(
-                            style={'width': '48%'},
-                            children=[
-                                html.Label('Event Features:', style={'font-weight': 'bold'}),
-                                dcc.Dropdown(
-                                    id='event-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in event_features],
-                                    value=event_features, 
-                                    multi=True,
-                                    placeholder='Select event features...'
-                                )
-                            ]
-                        )
-                    ]
-                ),
+            html.Div(
+                style={
+                    'border': '1px solid #ddd', 
+                    'padding': '20px', 
+                    'border-radius': '8px',
+                    'margin-bottom': '30px', 
+                    'box-shadow': '0 4px 8px rgba(0, 0, 0, 0.1)'
+                },
+                children=[
+                    html.Div(
+                        style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
+                        children=[
+                            html.Div(
+                                style={'width': '30%'},
+                                children=[
+                                    html.Label('Select Platform:', style={'font-weight': 'bold'}),
+                                    dcc.Dropdown(
+                                        id='platform-dropdown',
+                                        options=[{'label': platform, 'value': platform} for platform in df['Platform'].unique()],
+                                        value=df['Platform'].unique(), 
+                                        multi=True,
+                                        placeholder='Select one or more platforms...'
+                                    )
+                                ]
+                            ),
+                            html.Div(
+                                style={'width': '30%'},
+                                children=[
+                                    html.Label('Select Well:', style={'font-weight': 'bold'}),
+                                    dcc.Dropdown(
+                                        id='universal-dropdown',
+                                        options=[{'label': universal, 'value': universal} for universal in df['Universal'].unique()],
+                                        value=df['Universal'].unique(),
+                                        multi=True,
+                                        placeholder='Select one or more Universal values...'
+                                    )
+                                ]
+                            ),
+                            html.Div(
+                                style={'width': '30%'},
+                                children=[
+                                    html.Label('Select Date Range:', style={'font-weight': 'bold'}),
+                                    dcc.DatePickerRange(
+                                        id='date-picker-range',
+                                        start_date=df['DATE'].min(),
+                                        end_date=df['DATE'].max(),
+                                        display_format='DD-MM-YYYY'
+                                    )
+                                ]
+                            )
+                        ]
+                    ),
 
-                html.Div(
-                    style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
-                    children=[
-                        html.Div(
-                            style={'width': '48%'},
-                            children=[
-                                html.Label('Main Features:', style={'font-weight': 'bold'}),
-                                dcc.Dropdown(
-                                    id='main-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in main_features],
-                                    value=main_features,  # Select all main features by default
-                                    multi=True,
-                                    placeholder='Select main features...'
-                                )
-                            ]
-                        ),
-                        html.Div(
-                            style={'width': '48%'},
-                            children=[
-                                html.Label('Additional Features:', style={'font-weight': 'bold'}),
-                                dcc.Dropdown(
-                                    id='additional-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in additional_features],
-                                    value=additional_features,  # Select all additional features by default
-                                    multi=True,
-                                    placeholder='Select additional features...'
-                                )
-                            ]
-                        )
-                    ]
-                ),
+                    html.Div(
+                        style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
+                        children=[
+                            html.Div(
+                                style={'width': '48%'},
+                                children=[
+                                    html.Label('Completion Features:', style={'font-weight': 'bold'}),
+                                    dcc.Dropdown(
+                                        id='completion-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in completion_features],
+                                        value=completion_features,
+                                        multi=True,
+                                        placeholder='Select completion features...'
+                                    )
+                                ]
+                            ),
+                            html.Div(
+                                style={'width': '48%'},
+                                children=[
+                                    html.Label('Event Features:', style={'font-weight': 'bold'}),
+                                    dcc.Dropdown(
+                                        id='event-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in event_features],
+                                        value=event_features, 
+                                        multi=True,
+                                        placeholder='Select event features...'
+                                    )
+                                ]
+                            )
+                        ]
+                    ),
 
-                html.Div(
-                    style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
-                    children=[
-                        html.Div(
-                            style={'width': '48%'},
-                            children=[
-                                html.Label('Sort By Column:', style={'font-weight': 'bold'}),
-                                dcc.Dropdown(
-                                    id='sort-column-dropdown',
-                                    options=[{'label': col, 'value': col} for col in df.columns],
-                                    value='DATE',  # Default to 'DATE'
-                                    placeholder='Select a column to sort by...'
-                                )
-                            ]
-                        ),
-                        html.Div(
-                            style={'width': '48%'},
-                            children=[
-                                html.Label('Sort Order:', style={'font-weight': 'bold'}),
-                                dcc.RadioItems(
-                                    id='sort-order-radio',
-                                    options=[
-                                        {'label': 'Ascending', 'value': 'asc'},
-                                        {'label': 'Descending', 'value': 'desc'}
-                                    ],
-                                    value='asc',  # Default to ascending
-                                    labelStyle={'display': 'inline-block', 'margin-right': '10px'}
-                                )
-                            ]
-                        )
-                    ]
-                )
-            ]
-        ),
+                    html.Div(
+                        style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
+                        children=[
+                            html.Div(
+                                style={'width': '48%'},
+                                children=[
+                                    html.Label('Main Features:', style={'font-weight': 'bold'}),
+                                    dcc.Dropdown(
+                                        id='main-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in main_features],
+                                        value=main_features,  # Select all main features by default
+                                        multi=True,
+                                        placeholder='Select main features...'
+                                    )
+                                ]
+                            ),
+                            html.Div(
+                                style={'width': '48%'},
+                                children=[
+                                    html.Label('Additional Features:', style={'font-weight': 'bold'}),
+                                    dcc.Dropdown(
+                                        id='additional-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in additional_features],
+                                        value=additional_features,  # Select all additional features by default
+                                        multi=True,
+                                        placeholder='Select additional features...'
+                                    )
+                                ]
+                            )
+                        ]
+                    ),
 
-        html.Div(
-            style={'margin-top': '30px'},
-            children=[
-                dash_table.DataTable(
-                    id='table',
-                    columns=[], 
-                    data=[],
-                    page_size=10,
-                    style_table={'overflowX': 'auto', 'border': '1px solid #ddd', 'border-radius': '8px'},
-                    style_cell={'textAlign': 'left', 'padding': '10px'},
-                    style_header={'fontWeight': 'bold', 'backgroundColor': '#f9f9f9'}
-                ),
-                html.Div(
-                    style={'margin-top': '20px', 'text-align': 'center'},
-                    children=[
-                        html.Button('Download Filtered Data', id='download-button', n_clicks=0),
-                        dcc.Download(id='download-csv')
-                    ]
-                )
-            ]
-        )
-    ]
-)
+                    html.Div(
+                        style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
+                        children=[
+                            html.Div(
+                                style={'width': '48%'},
+                                children=[
+                                    html.Label('Sort By Column:', style={'font-weight': 'bold'}),
+                                    dcc.Dropdown(
+                                        id='sort-column-dropdown',
+                                        options=[{'label': col, 'value': col} for col in df.columns],
+                                        value='DATE',  # Default to 'DATE'
+                                        placeholder='Select a column to sort by...'
+                                    )
+                                ]
+                            ),
+                            html.Div(
+                                style={'width': '48%'},
+                                children=[
+                                    html.Label('Sort Order:', style={'font-weight': 'bold'}),
+                                    dcc.RadioItems(
+                                        id='sort-order-radio',
+                                        options=[
+                                            {'label': 'Ascending', 'value': 'asc'},
+                                            {'label': 'Descending', 'value': 'desc'}
+                                        ],
+                                        value='asc',  # Default to ascending
+                                        labelStyle={'display': 'inline-block', 'margin-right': '10px'}
+                                    )
+                                ]
+                            )
+                        ]
+                    )
+                ]
+            ),
+
+            html.Div(
+                style={'margin-top': '30px'},
+                children=[
+                    dcc.Store(id='table-selection'),
+                    dash_table.DataTable(
+                        id='table',
+                        columns=[], 
+                        data=[],
+                        page_size=10,
+                        page_current=0,
+                        page_action='custom',
+                        sort_action='custom',
+                        sort_mode='multi',
+                        sort_by=[],
+                        style_table={'overflowX': 'auto', 'border': '1px solid #ddd', 'border-radius': '8px'},
+                        style_cell={'textAlign': 'left', 'padding': '10px'},
+                        style_header={'fontWeight': 'bold', 'backgroundColor': '#f9f9f9'}
+                    ),
+                    html.Div(
+                        style={'margin-top': '20px', 'text-align': 'center'},
+                        children=[
+                            dcc.RadioItems(
+                                id='download-format',
+                                options=[
+                                    {'label': 'CSV', 'value': 'csv'},
+                                    {'label': 'CSV (gzip)', 'value': 'csv.gz'},
+                                    {'label': 'Parquet', 'value': 'parquet'}
+                                ],
+                                value='csv',
+                                labelStyle={'display': 'inline-block', 'margin-right': '10px'}
+                            ),
+                            html.A(html.Button('Download Filtered Data', id='download-button', n_clicks=0), id='download-link', download='')
+                        ]
+                    )
+                ]
+            )
+        ]
+    )
+
+app.layout = layout
+
+def select_rows(params):
+    """Rows and columns of a filter state, ordered by the sort dropdowns"""
+    df = data_provider.filter_data()
+    filtered_df = df[df['Platform'].isin(params['platforms'])]
+    if params['universal']:
+        filtered_df = filtered_df[filtered_df['Universal'].isin(params['universal'])]
+    filtered_df = filtered_df[(filtered_df['DATE'] >= params['start_date']) & (filtered_df['DATE'] <= params['end_date'])]
+
+    filtered_df = filtered_df[params['columns']]
+
+    if params['sort_column'] and params['sort_order']:
+        filtered_df = filtered_df.sort_values(by=params['sort_column'], ascending=(params['sort_order'] == 'asc'))
+    return filtered_df
+
+def format_page(page):
+    page = page.copy()
+    page['DATE'] = page['DATE'].dt.strftime('%d-%m-%Y')
+    if 'GAS' in page.columns:
+        page['GAS'] = page['GAS'].round(2)
+    if 'WATER' in page.columns:
+        page['WATER'] = page['WATER'].astype(int)
+    if 'OIL' in page.columns:
+        page['OIL'] = page['OIL'].astype(int)
+    return page.to_dict('records')
 
 @app.callback(
     [Output('universal-dropdown', 'options'),
      Output('universal-dropdown', 'value'),
-     Output('table', 'data'),
-     Output('table', 'columns')],
+     Output('table', 'columns'),
+     Output('table', 'page_count'),
+     Output('table', 'page_current'),
+     Output('table-selection', 'data')],
     [Input('platform-dropdown', 'value'),
      Input('universal-dropdown', 'value'),
      Input('date-picker-range', 'start_date'),
@@ -217,86 +265,70 @@ app.layout = html.Div(
      Input('main-features-dropdown', 'value'),
      Input('additional-features-dropdown', 'value'),
      Input('sort-column-dropdown', 'value'),
-     Input('sort-order-radio', 'value')]
+     Input('sort-order-radio', 'value')],
+    State('table', 'page_size')
 )
 def update_filters(selected_platforms, selected_universal, start_date, end_date, 
                    selected_completion, selected_event, selected_main, 
-                   selected_additional, sort_column, sort_order):
+                   selected_additional, sort_column, sort_order, page_size):
 
     if not selected_platforms:
-        return [], [], [], []
-
-    filtered_df = df[df['Platform'].isin(selected_platforms)]
-    if selected_universal:
-        filtered_df = filtered_df[filtered_df['Universal'].isin(selected_universal)]
-    filtered_df = filtered_df[(filtered_df['DATE'] >= start_date) & (filtered_df['DATE'] <= end_date)]
+        return [], [], [], 1, 0, None
 
-    columns_to_keep = ['DATE'] + additional + targets + ratios + selected_completion + selected_event + selected_main + selected_additional
-    filtered_df = filtered_df[columns_to_keep]
-
-    if sort_column and sort_order:
-        filtered_df = filtered_df.sort_values(by=sort_column, ascending=(sort_order == 'asc'))
-
-    filtered_df['DATE'] = filtered_df['DATE'].dt.strftime('%d-%m-%Y')
-    if 'GAS' in filtered_df.columns:
-        filtered_df['GAS'] = filtered_df['GAS'].round(2)
-    if 'WATER' in filtered_df.columns:
-        filtered_df['WATER'] = filtered_df['WATER'].astype(int)
-    if 'OIL' in filtered_df.columns:
-        filtered_df['OIL'] = filtered_df['OIL'].astype(int)
+    # The rows stay on the server; the table fetches them page by page
+    params = {
+        'platforms': selected_platforms,
+        'universal': selected_universal,
+        'start_date': start_date,
+        'end_date': end_date,
+        'columns': ['DATE'] + additional + targets + ratios + selected_completion + selected_event + selected_main + selected_additional,
+        'sort_column': sort_column,
+        'sort_order': sort_order,
+    }
+    filtered_df = table_pages.rows(data_provider.FILTER_DATASET, params, select_rows)
 
     universal_options = [{'label': universal, 'value': universal} for universal in filtered_df['Universal'].unique()]
     if not set(selected_universal).issubset(set(filtered_df['Universal'].unique())):
         selected_universal = filtered_df['Universal'].unique()
 
-    table_data = filtered_df.to_dict('records')
     table_columns = [{'name': col, 'id': col} for col in filtered_df.columns]
 
-    return universal_options, selected_universal, table_data, table_columns
+    return universal_options, selected_universal, table_columns, table_pages.page_count(filtered_df, page_size), 0, params
 
 @app.callback(
-    Output('download-csv', 'data'),
-    Input('download-button', 'n_clicks'),
-    State('platform-dropdown', 'value'),
-    State('universal-dropdown', 'value'),
-    State('date-picker-range', 'start_date'),
-    State('date-picker-range', 'end_date'),
-    State('completion-features-dropdown', 'value'),
-    State('event-features-dropdown', 'value'),
-    State('main-features-dropdown', 'value'),
-    State('additional-features-dropdown', 'value'),
-    State('sort-column-dropdown', 'value'),
-    State('sort-order-radio', 'value')
+    Output('table', 'data'),
+    Input('table-selection', 'data'),
+    Input('table', 'page_current'),
+    Input('table', 'page_size'),
+    Input('table', 'sort_by')
 )
-def download_filtered_data(n_clicks, selected_platforms, selected_universal, start_date, end_date, 
-                           selected_completion, selected_event, selected_main, selected_additional, 
-                           sort_column, sort_order):
-    if n_clicks == 0:
-        raise PreventUpdate
-
-    filtered_df = df[df['Platform'].isin(selected_platforms)]
-    if selected_universal:
-        filtered_df = filtered_df[filtered_df['Universal'].isin(selected_universal)]
-    filtered_df = filtered_df[(filtered_df['DATE'] >= start_date) & (filtered_df['DATE'] <= end_date)]
-
-    columns_to_keep = ['DATE'] + additional + targets + ratios + selected_completion + selected_event + selected_main + selected_additional
-    filtered_df = filtered_df[columns_to_keep]
+def update_table_page(params, page_current, page_size, sort_by):
+    if not params:
+        return []
+    filtered_df = table_pages.rows(data_provider.FILTER_DATASET, params, select_rows, sort_by)
+    return format_page(table_pages.page(filtered_df, page_current, page_size))
 
-    if sort_column and sort_order:
-        filtered_df = filtered_df.sort_values(by=sort_column, ascending=(sort_order == 'asc'))
-
-    # Apply formatting to downloaded file
-    filtered_df['DATE'] = filtered_df['DATE'].dt.strftime('%d-%m-%Y')
-    # if 'GAS' in filtered_df.columns:
-    #     filtered_df['GAS'] = filtered_df['GAS'].round(2)
-    # if 'WATER' in filtered_df.columns:
-    #     filtered_df['WATER'] = filtered_df['WATER'].astype(int)
-    # if 'OIL' in filtered_df.columns:
-    #     filtered_df['OIL'] = filtered_df['OIL'].astype(int)
-
-    csv_string = filtered_df.to_csv(index=False, encoding='utf-8')
+@app.callback(
+    Output('download-link', 'href'),
+    Input('table-selection', 'data'),
+    Input('table', 'sort_by'),
+    Input('download-format', 'value')
+)
+def update_download_link(params, sort_by, file_format):
+    if not params:
+        return None
+    return table_pages.download_href(app, '/download/filtered-data', params, sort_by, file_format)
 
-    return dict(content=csv_string, filename='filtered_data.csv')
+# The rows are streamed from this route instead of going through a callback
+@server.route('/download/filtered-data')
+def download_filtered_data():
+    try:
+        params, sort_by, file_format = table_pages.download_request(flask.request.args)
+        filtered_df = table_pages.rows(data_provider.FILTER_DATASET, params, select_rows, sort_by)
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Error reading download request: {str(e)}")
+        flask.abort(400)
+    return table_pages.download_response(filtered_df, file_format, 'filtered_data')
 
 if __name__ == '__main__':
     if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
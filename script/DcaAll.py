@@ -0,0 +1,651 @@
+import dash
+import os, webbrowser, base64
+import dash_bootstrap_components as dbc
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+import curve_cum_function as ccf
+import data_cache
+import workbook_store
+import downsample
+import figure_patch
+import dca_data
+import decline_bands
+import probabilistic_reserves
+from dash import dcc, html, dash_table, callback_context, ClientsideFunction
+from dash.dependencies import Input, Output, State
+from datetime import datetime
+
+# One DCA app for wells, platforms and fields. All modes read through
+# dca_data, so a single process and cache serve every mode. Component ids
+# start with 'dca-' so the layout can be mounted next to other pages.
+
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
+app.title = 'DCA'
+server = app.server
+excel_file = './Data/show_data.xlsx'
+
+MODE_LABELS = {'well': 'Well', 'platform': 'Platform', 'field': 'Field'}
+DEFAULT_WELL = 'B-L-18'
+
+# b values searched for the best hyperbolic fit: hundredths instead of the
+# default tenths, which keeps the fit within a few ms of the default grid
+B_SEARCH_GRID = ccf.decline_exponent_grid(0.01)
+
+# Models refined by the least-squares fit; the exponential and harmonic fits
+# keep their closed form, so the fit costs one robust solve, not three
+REFINED_MODELS = ('hyperbolic',)
+
+# Inputs that only move the forecast, and the dca-oil-plot traces they redraw
+FORECAST_INPUTS = {'dca-foil-date-picker', 'dca-months-end-date', 'dca-oil-rate-intervention', 'dca-b-value-slider', 'dca-limit-value', 'dca-selected-b-options'}
+FORECAST_TRACES = [4, 5]
+
+# Uncertainty bands follow the initial date marker, trace 6, and are refitted
+# for every qi/Di adjustment
+BAND_TRACES_START = 7
+BAND_INPUTS = {'dca-qi-value-slider', 'dca-di-value-slider'}
+
+# Sliders redrawn in the browser by assets/arps_forecast.js while dragged
+CLIENTSIDE_INPUTS = {'dca-oil-rate-intervention', 'dca-b-value-slider', 'dca-qi-value-slider', 'dca-di-value-slider'}
+
+label_style = {'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}
+input_style = {'border': '1px solid #616161', 'borderRadius': '6px', 'width': '134px', 'height': '30px', 'color': 'black', 'overflow': 'hidden', 'display': 'flex', 'alignItems': 'center'}
+option_style = {'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}
+title_style = {'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}
+
+def feature_box(title, children, height):
+    return html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'minHeight': height}, children=[
+        html.H1(title, className='Feature-title', style=title_style),
+        html.Div(style={'padding': '10px 25px'}, children=children)
+    ])
+
+layout = html.Div([
+    html.Header([
+        html.Nav([
+            html.Nav([
+                html.Div([
+                    html.Img(src="assets/PHM.png", style={'width': '174px'})
+                ], style={'backgroundColor': 'white', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingLeft': '37px', 'paddingRight': '37px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'})
+            ], style={'backgroundColor': '#C3304A', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingBottom': '20px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'}),
+            html.Nav([
+                html.Div([
+                    html.P("Historical", style={"fontWeight": "400", "fontSize": '16px', "color": 'white'}),
+                    html.P("DCA", style={"fontWeight": "800", 'fontSize': '16px', "color": 'white'}),
+                    html.P('ML', style={"fontWeight": "400", "fontSize": '16px', "color": 'white'})
+                ], style={'display': 'flex', 'alignItems': 'center', 'gap': '71px', 'paddingLeft': '35px'}),
+            ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'space-between', 'width': '100%', 'paddingLeft': '76px', 'paddingRight': '76px', 'paddingTop': '30px', 'paddingBottom': '30px'})
+        ], style={'backgroundColor': '#3F849B', 'display': 'flex', 'flexDirection': 'column', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%'})
+    ], style={'width': '100%', 'display': "flex", 'flexDirection': 'column'}),
+    html.Div(style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'width': "100%", 'paddingBottom': '20px'}, children=[
+        html.Div([
+            html.Button(children=[
+                html.Img(src="assets/upload.png", style={'width': '18px', 'height': '15.65px'}),
+                html.H1("Upload File", style={'fontSize': '16px', 'fontWeight': '500', 'color': '#3F849B'})
+            ], id="dca-open-upload-button", n_clicks=0, style={'marginTop': '50px', 'display': 'flex', 'gap': '8px', 'justifyItems': 'center', 'border': 'none', 'backgroundColor': 'transparent'}),
+            html.Div(
+                id="dca-upload-modal",
+                children=[
+                    html.Div([
+                        dcc.Upload(
+                            id="dca-file-upload",
+                            children=[
+                                html.Img(src="assets/uploadv2.png"),
+                                html.H6("Browse file (.xlsx) to upload")
+                            ],
+                            style={
+                                'width': '779px', 'height': '286px', 'lineHeight': '60px', 'display': 'flex', 'flexDirection': 'column',
+                                'borderWidth': '1px', 'borderStyle': 'dashed', 'borderColor': '#B6B2B2',
+                                'borderRadius': '15px', 'textAlign': 'center', 'alignItems': 'center', 'justifyItems': 'center', 'justifyContent': 'center'
+                            },
+                            multiple=False
+                        ),
+                        html.Button("Close", id="dca-close-upload-button", n_clicks=0, style={'width': '100%', 'height': '63px', 'backgroundColor': '#3F849B', 'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'color': '#F9F9F9', 'fontSize': '16px', 'fontWeight': '500', 'border': 'none', 'borderRadius': '12px'})
+                    ], style={'padding': '44px', 'backgroundColor': 'white', 'borderRadius': '5px', 'border': '1px solid #3F849B', 'display': 'flex', 'flexDirection': 'column', 'gap': '12px'}),
+                ],
+                style={
+                    'display': 'none',
+                    'position': 'fixed', 'top': '0', 'left': '0', 'width': '100%', 'height': '100%',
+                    'backgroundColor': 'rgba(0, 0, 0, 0.5)', 'alignItems': 'center', 'justifyContent': 'center'
+                }
+            ),
+            html.Div(style={'display': 'flex', 'gap': 28, 'paddingTop': '17px'}, children=[
+                html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                    feature_box('Mode', [
+                        dcc.RadioItems(
+                            id='dca-mode',
+                            options=[{'label': label, 'value': mode} for mode, label in MODE_LABELS.items()],
+                            value='well',
+                            labelStyle=option_style,
+                            inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                        ),
+                    ], '153px'),
+                    feature_box('Plot Type', [
+                        dcc.Checklist(
+                            id='dca-plot-type',
+                            options=[
+                                {'label': 'Scatter', 'value': 'scatter'},
+                                {'label': 'Line', 'value': 'line'},
+                                {'label': 'Band', 'value': 'band'},
+                            ],
+                            value=['scatter', 'line'],
+                            labelStyle=option_style,
+                            inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                        ),
+                    ], '153px'),
+                    feature_box('Legend', [
+                        dcc.Checklist(
+                            id='dca-legend-status',
+                            options=[{'label': 'Enable', 'value': 'on'}],
+                            value=['on'],
+                            labelStyle=option_style,
+                            inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                        ),
+                    ], '93px'),
+                    feature_box('Models', [
+                        dcc.RadioItems(
+                            id='dca-selected-b-options',
+                            options=[
+                                {'label': 'Exponential', 'value': 0},
+                                {'label': 'Hyperbolic', 'value': 0.5},
+                                {'label': 'Harmonic', 'value': 1},
+                            ],
+                            value=0.5,
+                            labelStyle=option_style,
+                            inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                        ),
+                    ], '153px'),
+                    feature_box('Fit', [
+                        dcc.RadioItems(
+                            id='dca-fit-engine',
+                            options=[
+                                {'label': 'Closed form', 'value': 'closed_form'},
+                                {'label': 'Least squares', 'value': 'least_squares'},
+                            ],
+                            value='closed_form',
+                            labelStyle=option_style,
+                            inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                        ),
+                    ], '123px'),
+                    html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'minHeight': '123px'}, children=[
+                        html.H1('Settings', className='Feature-title', style=title_style),
+                        html.Div(style={'padding': '10px', 'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                            html.Div(style={'width': '100%'}, children=[
+                                html.Label('Start Forecast Date:', style=label_style),
+                                dcc.DatePickerSingle(id='dca-foil-date-picker', date=datetime(2024, 4, 1), display_format='DD/MM/YYYY', style=input_style)
+                            ]),
+                            html.Div(style=label_style, children=[
+                                html.Label('Forecast Months:', style=label_style),
+                                dcc.Input(id='dca-months-end-date', type='number', value=120, min=1, style=input_style)
+                            ]),
+                            html.Div(style=label_style, children=[
+                                html.Label('Rate Limit Value (bopd):', style=label_style),
+                                dcc.Input(id='dca-limit-value', type='number', value=0.0, step=0.1, style=input_style)
+                            ]),
+                        ])
+                    ]),
+                ]),
+                html.Div(style={'width': '60rem'}, children=[
+                    html.Div(style={'border': '1px solid grey', 'padding': '21px', 'borderRadius': '30px'}, children=[
+                        dbc.Row([
+                            dbc.Col([
+                                html.Label('Select Object:'),
+                                dcc.Dropdown(id='dca-object', clearable=False),
+                            ], width=4),
+                            dbc.Col([
+                                html.Label('Adjust b Value:'),
+                                dcc.Slider(
+                                    id='dca-b-value-slider',
+                                    min=0.0,
+                                    max=1.0,
+                                    step=0.001,
+                                    value=0.5,
+                                    marks={0: '0.000', 0.5: '0.500', 1: '1.000'},
+                                    tooltip={"placement": "bottom", "always_visible": True}
+                                )
+                            ], width=8),
+                        ]),
+                        dbc.Row([
+                            dbc.Col(dcc.Graph(id='dca-oil-plot'), width=12),
+                        ]),
+                        dbc.Row([
+                            dbc.Col(html.Div(id='dca-reserves-output'), width=12),
+                        ], style={'marginBottom': '10px'}),
+                        dbc.Row([
+                            dbc.Col([
+                                html.Button("Probabilistic reserves (P90/P50/P10)", id="dca-probabilistic-button", n_clicks=0),
+                                dcc.Loading(type="dot", children=[html.Div(id='dca-probabilistic-output', style={'marginTop': '10px'})]),
+                            ], width=12),
+                        ], style={'marginBottom': '10px'}),
+                        dbc.Row([
+                            dbc.Col([
+                                html.Label('Select Date Range:'),
+                                dcc.RangeSlider(
+                                    id='dca-date-slider',
+                                    min=0,
+                                    max=15000,
+                                    step=1,
+                                    value=[0, 15000],
+                                    marks={},
+                                    tooltip={"placement": "bottom", "always_visible": True}
+                                )
+                            ], width=12, style={'marginBottom': '30px'}),
+                        ]),
+                        dbc.Row([
+                            dbc.Col([
+                                html.Label('Adjust Rate Intervention (bopd):'),
+                                dcc.Slider(
+                                    id='dca-oil-rate-intervention',
+                                    min=0,
+                                    max=1000,
+                                    step=1,
+                                    value=0,
+                                    marks={0: '0', 250: '250', 500: '500', 750: '750', 1000: '1000'},
+                                    tooltip={"placement": "bottom", "always_visible": True}
+                                )
+                            ], width=4),
+                            dbc.Col([
+                                html.Label('Adjust Qi Value Changes:'),
+                                dcc.Slider(
+                                    id='dca-qi-value-slider',
+                                    min=-500,
+                                    max=500,
+                                    step=1,
+                                    value=0,
+                                    marks={-500: '-500', 0: '0', 500: '500'},
+                                    tooltip={"placement": "bottom", "always_visible": True}
+                                )
+                            ], width=4),
+                            dbc.Col([
+                                html.Label('Adjust Di Value Changes:'),
+                                dcc.Slider(
+                                    id='dca-di-value-slider',
+                                    min=100,
+                                    max=10000,
+                                    step=1,
+                                    value=100,
+                                    marks={100: '100', 10000: '10000'},
+                                    tooltip={"placement": "bottom", "always_visible": True}
+                                )
+                            ], width=4),
+                        ], style={'marginBottom': '30px'}),
+                        dbc.Row([
+                            dbc.Col([
+                                html.Div(id='dca-alert', children=[])
+                            ], width=12),
+                        ]),
+                        dash_table.DataTable(
+                            id="dca-data-table",
+                            columns=[{"name": column, "id": column} for column in [
+                                "Mode", "Name", "Start Date", "End Date", "b", "Di", "qi", "Start Forecast Date",
+                                "Reserves (bbl)", "EUR", "Rate Intervention (bopd)", "Cut Off Date"]],
+                            data=[],
+                            editable=True,
+                            row_deletable=True,
+                            style_table={'marginTop': '20px'}
+                        ),
+                        html.Div([
+                            html.Button("Update data", id="dca-update-button", n_clicks=0),
+                            html.Button("Download data table", id="dca-download-button", n_clicks=0)
+                        ], style={"display": "flex", "gap": "10px", "marginTop": "10px"}),
+                        dcc.Download(id="dca-download-csv")
+                    ]),
+                ]),
+                dcc.Location(id="dca-page-reloader", refresh=True),
+                dcc.Store(id='dca-plot-view'),
+                dcc.Store(id='dca-forecast-model')
+            ])
+        ])
+    ]),
+])
+
+app.layout = layout
+
+def save_file(contents, filename):
+    content_type, content_string = contents.split(',')
+    decoded = base64.b64decode(content_string)
+
+    with open(excel_file, "wb") as f:
+        f.write(decoded)
+    data_cache.invalidate(excel_file)
+    workbook_store.ingest_workbook(excel_file)
+
+def callbacks(app):
+    @app.callback(
+        Output("dca-upload-modal", "style"),
+        Output("dca-page-reloader", 'href'),
+        Input("dca-open-upload-button", "n_clicks"),
+        Input("dca-close-upload-button", "n_clicks"),
+        Input('dca-file-upload', 'contents'),
+        State('dca-file-upload', 'filename')
+    )
+    def toggle_upload_modal(open_clicks, close_clicks, contents, filename):
+        default_style = {
+            'position': 'fixed', 'top': '0', 'left': '0', 'width': '100%', 'height': '100%',
+            'backgroundColor': 'rgba(0, 0, 0, 0.5)', 'alignItems': 'center', 'justifyContent': 'center'
+        }
+        if contents is not None:
+            save_file(contents, filename)
+            return {**default_style, 'display': 'none'}, app.config.requests_pathname_prefix
+        if open_clicks > close_clicks:
+            return {**default_style, 'display': 'flex'}, None
+        return {**default_style, 'display': 'none'}, None
+
+    @app.callback(
+        Output('dca-object', 'options'),
+        Output('dca-object', 'value'),
+        Input('dca-mode', 'value'),
+    )
+    def update_objects(mode):
+        names = dca_data.objects(excel_file, mode)
+        value = DEFAULT_WELL if DEFAULT_WELL in names else (names[0] if names else None)
+        return [{'label': name, 'value': name} for name in names], value
+
+    @app.callback(
+        Output('dca-date-slider', 'min'),
+        Output('dca-date-slider', 'max'),
+        Output('dca-date-slider', 'marks'),
+        Output('dca-date-slider', 'value'),
+        Input('dca-object', 'value'),
+        State('dca-mode', 'value'),
+    )
+    def update_slider(name, mode):
+        if name is None:
+            return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+        df = dca_data.rate_data(excel_file, mode, name)
+
+        slider_min = 0
+        slider_max = max(len(df) - 1, 0)
+        marks = {i: {'label': '', 'style': {'display': 'none'}} for i in range(len(df))}
+        return slider_min, slider_max, marks, [slider_min, slider_max]
+
+    @app.callback(
+        Output('dca-oil-plot', 'figure'),
+        Output('dca-alert', 'children'),
+        Output('dca-reserves-output', 'children'),
+        Output('dca-data-table', 'data'),
+        Output('dca-selected-b-options', 'value'),
+        Output('dca-b-value-slider', 'value'),
+        Output('dca-forecast-model', 'data'),
+        Input('dca-update-button', 'n_clicks'),
+        Input('dca-object', 'value'),
+        Input('dca-foil-date-picker', 'date'),
+        Input('dca-months-end-date', 'value'),
+        Input('dca-date-slider', 'value'),
+        Input('dca-oil-rate-intervention', 'value'),
+        Input('dca-b-value-slider', 'value'),
+        Input('dca-qi-value-slider', 'value'),
+        Input('dca-di-value-slider', 'value'),
+        Input('dca-limit-value', 'value'),
+        Input('dca-data-table', 'data'),
+        Input('dca-legend-status', 'value'),
+        Input('dca-plot-type', 'value'),
+        Input('dca-selected-b-options', 'value'),
+        Input('dca-plot-view', 'data'),
+        Input('dca-fit-engine', 'value'),
+        State('dca-mode', 'value'),
+    )
+    def update_plots(n_clicks, name, foil_date, months_end_date, slider_value, rate_intervention, b_value, qi_change, di_change, limit_value, rows, legend_status, plot_type, selected_b_options, x_range, fit_engine, mode):
+        if rows is None:
+            rows = []
+
+        show_legend = 'on' in legend_status
+        scatter = 'scatter' in plot_type
+        line = 'line' in plot_type
+        band = 'band' in plot_type
+
+        triggered = figure_patch.triggered_ids(callback_context)
+        if triggered == {'dca-legend-status'}:
+            return (figure_patch.legend_patch(show_legend),) + (dash.no_update,) * 6
+
+        if name is None:
+            return go.Figure(), [], "", rows, dash.no_update, dash.no_update, None
+
+        df = dca_data.rate_data(excel_file, mode, name)
+        if df.empty or df[dca_data.RATE_COLUMN].eq(0).all():
+            alert = dbc.Alert(f"No production data for {MODE_LABELS[mode].lower()} {name}", color='warning')
+            return go.Figure(), [alert], "", rows, dash.no_update, dash.no_update, None
+
+        foil_date = pd.to_datetime(foil_date)
+        slider_value = [min(index, len(df) - 1) for index in slider_value]
+        start_date = df['DATE_STAMP'].iloc[slider_value[0]]
+        end_date = df['DATE_STAMP'].iloc[slider_value[1]]
+
+        mask = (df['DATE_STAMP'] >= start_date) & (df['DATE_STAMP'] <= end_date)
+        dfx = df.loc[mask]
+        cumulative = dca_data.cumulative(excel_file, mode, name, start_date, end_date)
+        cumulative_to_date = cumulative[-1] if len(cumulative) else 0.0
+
+        best_b_oil, oil_exp_di, oil_har_di, oil_hyper_di, oil_exp_model, oil_har_model, oil_hyper_model, df_oil = dca_data.fit(
+            excel_file, mode, name, start_date, end_date, qi_change, di_change, fit_engine, B_SEARCH_GRID, REFINED_MODELS)
+
+        producing = dfx[dfx[dca_data.RATE_COLUMN] != 0][dca_data.RATE_COLUMN]
+        if producing.empty or df_oil.empty:
+            alert = dbc.Alert("No production in the selected date range", color='warning')
+            return go.Figure(), [alert], "", rows, dash.no_update, dash.no_update, None
+        last_rate = producing.iloc[-1]
+        current_rate = last_rate + (rate_intervention or 0)
+
+        # Model category based on b value
+        triggered_id = callback_context.triggered[0]['prop_id'].split('.')[0]
+        if triggered_id == 'dca-selected-b-options':
+            selectedData = selected_b_options
+            b_value = selected_b_options
+        elif triggered_id == 'dca-b-value-slider':
+            if b_value == 0 or b_value == 1: selectedData = b_value
+            else: selectedData = 0.5
+        else:
+            selectedData = selected_b_options
+
+        if b_value == 0:
+            model_name, di, color = 'Exponential', oil_exp_di, 'LightBlue'
+        elif b_value == 1:
+            model_name, di, color = 'Harmonic', oil_har_di, 'LightSalmon'
+        else:
+            model_name, di, color = 'Hyperbolic', oil_hyper_di, 'LightGreen'
+        forecast_df, EUR, reserves, crossing_date = ccf.forecast_decline(current_rate, di, b_value, foil_date, months_end_date, limit_value, cumulative_to_date)
+        forecast_end = forecast_df['DATE'].iloc[-1]
+
+        # Every trace is added, hidden when its plot type is off, so each keeps its
+        # index: 0 data, 1-3 models, 4 forecast, 5 rate limit, 6 initial date, then bands
+        oil_fig = go.Figure()
+        # Daily traces are thinned to the points visible at the current zoom
+        data_index = downsample.indices(df['DATE_STAMP'], df[dca_data.RATE_COLUMN], x_range)
+        oil_fig.add_trace(go.Scatter(x=df['DATE_STAMP'].values[data_index], y=df[dca_data.RATE_COLUMN].values[data_index], mode='markers', name='Data', marker=dict(color='brown', size=5), visible=scatter))
+        model_time = []
+        for model, model_color, trace_name in ((oil_exp_model, 'blue', 'Exponential Model'), (oil_hyper_model, 'green', f'Hyperbolic Model (best b = {best_b_oil})'), (oil_har_model, 'orange', 'Harmonic Model')):
+            index = downsample.indices(df_oil['DATE_STAMP'], model, x_range, downsample.CURVE_POINTS)
+            model_time.append(df_oil['TIME'].values[index].tolist())
+            oil_fig.add_trace(go.Scatter(x=df_oil['DATE_STAMP'].values[index], y=np.asarray(model)[index], mode='lines', name=trace_name, line=dict(color=model_color), visible=line))
+        oil_fig.add_trace(go.Scatter(x=forecast_df['DATE'], y=forecast_df['Forecast_Rate'], mode='lines', name=f'Forecast Line (di={di:.2f}, qi={last_rate:.2f})', line=dict(color=color), visible=line))
+        oil_fig.add_trace(go.Scatter(x=[foil_date, forecast_end], y=[limit_value, limit_value], mode='lines', name=f'Rate Limit ({limit_value} bopd)', line=dict(color='red', dash='dash'), visible=line))
+        marker_y = df.loc[df['DATE_STAMP'] == start_date, dca_data.RATE_COLUMN].values[0]
+        oil_fig.add_trace(go.Scatter(x=[start_date], y=[marker_y], mode='markers', name='Initial Date', marker=dict(color='black', size=7), visible=scatter))
+
+        if band:
+            bands, band_dates = dca_data.bands(excel_file, mode, name, start_date, end_date, qi_change, di_change, fit_engine, B_SEARCH_GRID, REFINED_MODELS)
+            oil_fig.add_traces(decline_bands.band_traces(bands, band_dates, x_range))
+
+        oil_fig.update_layout(
+            title=f'Oil Rate Comparison of Decline Models {MODE_LABELS[mode]} {name}',
+            xaxis=dict(title='Date', tickformat='%d-%m-%Y'),
+            yaxis=dict(title='Oil Rate (bopd)'),
+            showlegend=show_legend,
+            legend_title="Legend",
+            uirevision=f'{mode}/{name}'
+        )
+
+        # Hover Values; the fitted parameters are in the data table, as the
+        # sliders redraw the lines in the browser
+        oil_fig.update_traces(
+            hovertemplate=(
+                "<b>Date: %{x}</b><br>" +
+                "<b>Oil Rate: %{y:.2f} bopd</b><br>" +
+                "<extra></extra>"
+            )
+        )
+
+        alert_message = []
+        if crossing_date is not None:
+            alert_message.append(
+                dbc.Alert(
+                    [
+                        "Alert: Forecast crosses limit on ",
+                        html.Span(crossing_date.strftime("%d-%m-%Y"), style={'fontWeight': 'bold'}),
+                    ],
+                    color='danger', dismissable=True, duration=7000,
+                )
+            )
+        reserves_output = "Forecasted Reserves: ", html.Span(f"{reserves:,.2f} bbl", style={'fontWeight': 'bold'})
+
+        new_row = {
+            "Mode": MODE_LABELS[mode],
+            "Name": name,
+            "Start Date": start_date.strftime('%d-%m-%Y'),
+            "End Date": end_date.strftime('%d-%m-%Y'),
+            "b": b_value,
+            "Di": f"{di:.7f}",
+            "qi": f"{current_rate:.3f}",
+            "Start Forecast Date": foil_date.strftime('%d-%m-%Y'),
+            "Reserves (bbl)": f"{reserves:.5f}",
+            "EUR": f"{EUR:.2f}",
+            "Rate Intervention (bopd)": rate_intervention,
+            "Cut Off Date": crossing_date.strftime('%d-%m-%Y') if crossing_date is not None else "N/A"
+        }
+
+        if n_clicks:
+            existing_row = next((row for row in rows if (row['Mode'], row['Name']) == (new_row['Mode'], new_row['Name'])), None)
+            if existing_row:
+                rows[rows.index(existing_row)] = new_row
+            else:
+                rows.append(new_row)
+            rows = sorted(rows, key=lambda x: float(x['Reserves (bbl)']), reverse=True)
+
+        # Fitted parameters the browser needs to redraw the model and forecast lines
+        fit_time = df_oil['TIME']
+        forecast_model = {
+            # qi without the adjustment, the browser adds the dragged qi change
+            'qi': {'exponential': ccf.model_qi(oil_exp_model, fit_time, oil_exp_di, 0) - qi_change,
+                   'harmonic': ccf.model_qi(oil_har_model, fit_time, oil_har_di, 1) - qi_change,
+                   'hyperbolic': ccf.model_qi(oil_hyper_model, fit_time, oil_hyper_di, best_b_oil) - qi_change},
+            'best_b': best_b_oil,
+            'di': {'exponential': oil_exp_di, 'harmonic': oil_har_di, 'hyperbolic': oil_hyper_di},
+            'di_change': di_change,
+            'model_time': model_time,
+            'last_rate': float(last_rate),
+            'limit': limit_value,
+            'horizon': len(forecast_df) - 1,
+        }
+
+        # The sliders were already drawn in the browser, except for the bands of a
+        # new qi/Di; only the forecast and limit lines depend on the other forecast
+        # inputs, and saving or editing the table leaves the plot as it is
+        if triggered <= CLIENTSIDE_INPUTS:
+            if band and triggered & BAND_INPUTS:
+                oil_fig = figure_patch.trace_patch(oil_fig, range(BAND_TRACES_START, len(oil_fig.data)), shared_props=())
+            else:
+                oil_fig = dash.no_update
+        elif triggered <= FORECAST_INPUTS:
+            oil_fig = figure_patch.trace_patch(oil_fig, FORECAST_TRACES, shared_props=())
+        elif triggered <= {'dca-update-button', 'dca-data-table'}:
+            oil_fig = dash.no_update
+
+        return oil_fig, alert_message, reserves_output, rows, selectedData, b_value, forecast_model
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='arps', function_name='update_forecast'),
+        Output('dca-oil-plot', 'figure', allow_duplicate=True),
+        Output('dca-reserves-output', 'children', allow_duplicate=True),
+        Input('dca-b-value-slider', 'drag_value'),
+        Input('dca-qi-value-slider', 'drag_value'),
+        Input('dca-di-value-slider', 'drag_value'),
+        Input('dca-oil-rate-intervention', 'drag_value'),
+        State('dca-forecast-model', 'data'),
+        State('dca-oil-plot', 'figure'),
+        prevent_initial_call=True
+    )
+
+    @app.callback(
+        Output('dca-probabilistic-output', 'children'),
+        Input('dca-probabilistic-button', 'n_clicks'),
+        State('dca-mode', 'value'),
+        State('dca-object', 'value'),
+        State('dca-foil-date-picker', 'date'),
+        State('dca-months-end-date', 'value'),
+        State('dca-date-slider', 'value'),
+        State('dca-oil-rate-intervention', 'value'),
+        State('dca-b-value-slider', 'value'),
+        State('dca-qi-value-slider', 'value'),
+        State('dca-di-value-slider', 'value'),
+        State('dca-limit-value', 'value'),
+        State('dca-fit-engine', 'value'),
+        prevent_initial_call=True
+    )
+    def update_probabilistic_reserves(n_clicks, mode, name, foil_date, months_end_date, slider_value, rate_intervention, b_value, qi_change, di_change, limit_value, fit_engine):
+        if name is None:
+            return dash.no_update
+        df = dca_data.rate_data(excel_file, mode, name)
+        if df.empty:
+            return dbc.Alert(f"No production data for {MODE_LABELS[mode].lower()} {name}", color='warning')
+        slider_value = [min(index, len(df) - 1) for index in slider_value]
+        start_date = df['DATE_STAMP'].iloc[slider_value[0]]
+        end_date = df['DATE_STAMP'].iloc[slider_value[1]]
+
+        best_b_oil, oil_exp_di, oil_har_di, oil_hyper_di, oil_exp_model, oil_har_model, oil_hyper_model, df_oil = dca_data.fit(
+            excel_file, mode, name, start_date, end_date, qi_change, di_change, fit_engine, B_SEARCH_GRID, REFINED_MODELS)
+        if df_oil.empty:
+            return dbc.Alert("No production in the selected date range", color='warning')
+
+        # qi and Di of the fitted model the forecast follows; the least-squares fit has its own qi
+        if b_value == 0:
+            di, qi = oil_exp_di, ccf.model_qi(oil_exp_model, df_oil['TIME'], oil_exp_di, 0)
+        elif b_value == 1:
+            di, qi = oil_har_di, ccf.model_qi(oil_har_model, df_oil['TIME'], oil_har_di, 1)
+        else:
+            di, qi = oil_hyper_di, ccf.model_qi(oil_hyper_model, df_oil['TIME'], oil_hyper_di, best_b_oil)
+        current_rate = df_oil[dca_data.RATE_COLUMN].iloc[-1] + (rate_intervention or 0)
+        cumulative = dca_data.cumulative(excel_file, mode, name, start_date, end_date)
+        cumulative_to_date = cumulative[-1] if len(cumulative) else 0.0
+
+        foil_date = pd.to_datetime(foil_date)
+        forecast_dates = pd.date_range(start=foil_date, end=foil_date + pd.DateOffset(months=months_end_date), freq='MS')
+
+        # Fixed seed, so the same inputs always book the same percentiles
+        results = probabilistic_reserves.simulate_reserves(df_oil['TIME'], df_oil[dca_data.RATE_COLUMN], qi, di, b_value, current_rate, limit_value, cumulative_to_date, forecast_dates, seed=0)
+        table = probabilistic_reserves.summary_table(results)
+        return dbc.Table.from_dataframe(table, striped=True, bordered=True, size='sm')
+
+    @app.callback(
+        Output('dca-plot-view', 'data'),
+        Input('dca-oil-plot', 'relayoutData'),
+        Input('dca-object', 'value'),
+        State('dca-plot-view', 'data'),
+        prevent_initial_call=True
+    )
+    def update_plot_view(relayout_data, name, x_range):
+        # Another object starts zoomed out, like the figure
+        if callback_context.triggered[0]['prop_id'] == 'dca-object.value':
+            return None if x_range else dash.no_update
+
+        view = downsample.relayout_range(relayout_data)
+        if view is None:
+            return dash.no_update
+        return None if view == 'autorange' else view
+
+    @app.callback(
+        Output("dca-download-csv", "data"),
+        Input("dca-download-button", "n_clicks"),
+        State("dca-data-table", "data"),
+        prevent_initial_call=True
+    )
+    def download_table(n_clicks, rows):
+        if rows:
+            df = pd.DataFrame(rows)
+            csv_string = df.to_csv(index=False, encoding="utf-8")
+            return dict(content=csv_string, filename="data_table.csv")
+
+callbacks(app)
+
+if __name__ == '__main__':
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        webbrowser.open_new("http://127.0.0.1:8050/")
+    app.run_server(debug=True, dev_tools_ui=True)
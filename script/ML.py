@@ -1,7 +1,13 @@
-import os, webbrowser, base64, sys
+import os, webbrowser, base64
+import flask
 import pandas as pd
 import numpy as np
 import ml_process as mlp
+import ml_jobs
+import run_store
+import data_provider
+import table_pages
+import well_catalog
 from PIL import Image
 
 import dash
@@ -10,9 +16,7 @@ from dash.exceptions import PreventUpdate
 from dash.dependencies import State, ALL, Output, Input
 import dash_bootstrap_components as dbc
 
-excel_file = './Data/data_ml.csv'
-df = pd.read_csv(excel_file)
-df['DATE'] = pd.to_datetime(df['DATE'])
+excel_file = data_provider.ML_DATASET
 
 completion_features = ['VSH', 'PHI', 'SW', 'NET_THICK', 'N_OPEN_RESERVOIR']
 event_features = ['EVENT', 'LAST_EVENT', 'EVENT_PLATFORM', 'LAST_EVENT_PLATFORM', 'NORM_PROD_DAYS']
@@ -24,6 +28,33 @@ additional = ['Universal']
 
 directory_path = 'export'
 
+def run_label(dir_path, dir_name):
+    manifest = run_store.load_manifest(dir_path)
+    if manifest is None:
+        return dir_name
+    return f"{dir_name} ({manifest['created']}, train until {manifest['end_date']}, {len(manifest['wells'])} wells)"
+
+def run_rows():
+    rows = []
+    for run in run_store.list_runs():
+        row = {
+            'Run': os.path.basename(run['path']),
+            'Created': run['created'],
+            'Train Until': run['end_date'],
+            'Wells': len(run['wells']),
+            'Features': ', '.join(run['features']),
+            'Train R2': round(run['train_score'], 3),
+            'Test R2': round(run['test_score'], 3),
+        }
+        for mark in ['TEST', 'BLIND']:
+            for target in targets:
+                row[f'MAE {target} ({mark})'] = run['mae'].get(mark, {}).get(target)
+        rows.append(row)
+    return rows
+
+run_columns = ['Run', 'Created', 'Train Until', 'Wells', 'Features', 'Train R2', 'Test R2'] + \
+    [f'MAE {target} ({mark})' for mark in ['TEST', 'BLIND'] for target in targets]
+
 def generate_directory_structure(path):
     folder_content = []
     
@@ -32,7 +63,7 @@ def generate_directory_structure(path):
             dir_path = os.path.join(root, dir_name)
             folder_content.append(
                 html.Details([
-                    html.Summary(dir_name),
+                    html.Summary(run_label(dir_path, dir_name)),
                     html.Div(generate_directory_structure(dir_path))
                 ])
             )
@@ -50,21 +81,6 @@ def generate_directory_structure(path):
 
     return folder_content
 
-Objects = {}
-for name in df['Universal'].unique():
-    parents = name.split("-")
-    main, sub, detail = parents[0], parents[1], parents[2]
-
-    field_key = f"{main}ekapai Field"
-    platform_key = f"Platform {sub}"
-
-    if field_key not in Objects:
-        Objects[field_key] = {}
-    if platform_key not in Objects[field_key]:
-        Objects[field_key][platform_key] = []
-
-    Objects[field_key][platform_key].append(name)
-
 def create_nested_checkboxes(structure):
     elements = []
     
@@ -106,268 +122,302 @@ def create_nested_checkboxes(structure):
         elements.append(html.Div([main_checkbox, html.Div(sub_elements, style={'marginLeft': '32px'})]))
     return elements
 
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
-app.layout = html.Div([
-        html.Header([
-            html.Nav([
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
+server = app.server
+def layout():
+    df = data_provider.ml_data()
+    Objects = well_catalog.object_tree(df['Universal'].unique())
+    return html.Div([
+            html.Header([
                 html.Nav([
-                    html.Div([
+                    html.Nav([
                         html.Div([
-                            html.Img(src="assets/logo.png", style={'width': '50px', 'height': '38.19px'}),
                             html.Div([
-                                html.H1("WENNI", style={'fontWeight': '600', 'fontSize': "20px", 'color': '#006CB8', 'lineHeight': "25.2px"}),
-                                html.P("Well Forecast and Monitoring", style={'fontWeight': '400', 'fontSize': "14px", 'color': '#9B9797', 'lineHeight': '17.64px'})
-                            ], style={'flexDirection': 'column'})
-                        ], style={'display': 'flex', 'alignItems': 'center', 'gap': '13.11px', 'paddingTop': '27px'}),
-                        html.Img(src="assets/PHM.png", style={'width': '174px'})
-                    ], style={'backgroundColor': 'white', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingLeft': '37px', 'paddingRight': '37px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'})
-                ], style={'backgroundColor': '#C3304A', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingBottom': '20px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'}),
-                html.Nav([
-                    html.Div([
-                        html.P("Historical", style={"fontWeight": "400", "fontSize": '16px', "color": 'white'}),
-                        html.P("DCA", style={"fontWeight": "400", 'fontSize': '16px', "color": 'white'}),
-                        html.P('Forecast', style={"fontWeight": "800", "fontSize": '16px', "color": 'white'})
-                    ], style={'display': 'flex', 'alignItems': 'center', 'gap': '71px', 'paddingLeft': '35px'}),
-                    html.Div([
-                        html.H1('Admin 1', style={"fontWeight": "700", 'fontSize': '16px', "color": 'white'}),
-                        html.P('Role Admin', style={"fontWeight": "400", "fontSize": '14px', "color": 'white'})
-                    ], style={'display': 'flex', 'flexDirection': 'column', 'gap':'1px', 'paddingRight': '35px'})
-                ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'space-between', 'width': '100%', 'paddingLeft': '76px', 'paddingRight': '76px', 'paddingTop': '30px', 'paddingBottom': '30px'})
-            ], style={'backgroundColor': '#3F849B', 'display': 'flex', 'flexDirection': 'column', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%'})
-        ], style={'width': '100%', 'display': "flex", 'flexDirection': 'column'}),
-        html.Div(style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'width': "100%", 'paddingBottom': '20px'}, children=[
-            html.Div([
-                html.Button(children=[
-                    html.Img(src="assets/upload.png", style={'width': '18px', 'height': '15.65px'}),
-                    html.H1("Upload File", style={'fontSize': '16px', 'fontWeight': '500', 'color': '#3F849B'})
-                ], id="open-upload-button", n_clicks=0, style={'marginTop': '50px', 'display': 'flex', 'gap': '8px', 'justifyItems': 'center', 'border': 'none', 'backgroundColor': 'transparent'}),
-                html.Div(
-                    id="upload-modal",
-                    children=[
+                                html.Img(src="assets/logo.png", style={'width': '50px', 'height': '38.19px'}),
+                                html.Div([
+                                    html.H1("WENNI", style={'fontWeight': '600', 'fontSize': "20px", 'color': '#006CB8', 'lineHeight': "25.2px"}),
+                                    html.P("Well Forecast and Monitoring", style={'fontWeight': '400', 'fontSize': "14px", 'color': '#9B9797', 'lineHeight': '17.64px'})
+                                ], style={'flexDirection': 'column'})
+                            ], style={'display': 'flex', 'alignItems': 'center', 'gap': '13.11px', 'paddingTop': '27px'}),
+                            html.Img(src="assets/PHM.png", style={'width': '174px'})
+                        ], style={'backgroundColor': 'white', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingLeft': '37px', 'paddingRight': '37px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'})
+                    ], style={'backgroundColor': '#C3304A', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingBottom': '20px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'}),
+                    html.Nav([
                         html.Div([
-                            dcc.Upload(
-                                id="file-upload",
-                                children=[
-                                    html.Img(src="assets/uploadv2.png"),
-                                    html.H6("Browse file (.csv) or (.xlsx) to upload")
-                                ],
-                                style={
-                                    'width': '779px', 'height': '286px', 'lineHeight': '60px', 'display': 'flex', 'flexDirection': 'column',
-                                    'borderWidth': '1px', 'borderStyle': 'dashed', 'borderColor': '#B6B2B2',
-                                    'borderRadius': '15px', 'textAlign': 'center', 'alignItems': 'center', 'justifyItems': 'center', 'justifyContent': 'center'
-                                },
-                                multiple=False
-                            ),
-                            html.Button("Close", id="close-upload-button", n_clicks=0, style={'width': '100%', 'height': '63px', 'backgroundColor': '#3F849B', 'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'color': '#F9F9F9', 'fontSize': '16px', 'fontWeight': '500', 'border': 'none', 'borderRadius': '12px'})
-                        ], style={'padding': '44px', 'backgroundColor': 'white', 'borderRadius': '5px', 'border': '1px solid #3F849B', 'display': 'flex', 'flexDirection': 'column', 'gap': '12px'}),
-                    ],
-                    style={
-                        'display': 'none',
-                        'position': 'fixed', 'top': '0', 'left': '0', 'width': '100%', 'height': '100%',
-                        'backgroundColor': 'rgba(0, 0, 0, 0.5)', 'alignItems': 'center', 'justifyContent': 'center'
-                    }
-                ),
-                html.Div(style={'display': 'flex', 'gap': 28, 'paddingTop': '17px'}, children=[
-                    html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
-                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '220px'}, children=[
-                            html.H1('Completion Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                            html.Div(style={'padding': '10px 25px'}, children=[
-                                dcc.Checklist(
-                                    id='completion-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in completion_features],
-                                    value=completion_features, 
-                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
-                                ),
-                            ])
-                        ]),
-                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '220px'}, children=[
-                            html.H1('Event Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                            html.Div(style={'padding': '10px 25px'}, children=[
-                                dcc.Checklist(
-                                    id='event-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in event_features],
-                                    value=event_features,  
-                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
-                                ),
-                            ])
-                        ]),
-                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '130px'}, children=[
-                            html.H1('Main Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                            html.Div(style={'padding': '10px 25px'}, children=[
-                                dcc.Checklist(
-                                    id='main-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in main_features],
-                                    value=main_features,  
-                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
-                                ),
-                            ])
-                        ]),
-                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'minHeight': '93px'}, children=[
-                            html.H1('Additional Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                            html.Div(style={'padding': '10px 25px'}, children=[
-                                dcc.Checklist(
-                                    id='additional-features-dropdown',
-                                    options=[{'label': feature, 'value': feature} for feature in additional_features],
-                                    value=additional_features, 
-                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                            html.P("Historical", style={"fontWeight": "400", "fontSize": '16px', "color": 'white'}),
+                            html.P("DCA", style={"fontWeight": "400", 'fontSize': '16px', "color": 'white'}),
+                            html.P('Forecast', style={"fontWeight": "800", "fontSize": '16px', "color": 'white'})
+                        ], style={'display': 'flex', 'alignItems': 'center', 'gap': '71px', 'paddingLeft': '35px'}),
+                        html.Div([
+                            html.H1('Admin 1', style={"fontWeight": "700", 'fontSize': '16px', "color": 'white'}),
+                            html.P('Role Admin', style={"fontWeight": "400", "fontSize": '14px', "color": 'white'})
+                        ], style={'display': 'flex', 'flexDirection': 'column', 'gap':'1px', 'paddingRight': '35px'})
+                    ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'space-between', 'width': '100%', 'paddingLeft': '76px', 'paddingRight': '76px', 'paddingTop': '30px', 'paddingBottom': '30px'})
+                ], style={'backgroundColor': '#3F849B', 'display': 'flex', 'flexDirection': 'column', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%'})
+            ], style={'width': '100%', 'display': "flex", 'flexDirection': 'column'}),
+            html.Div(style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'width': "100%", 'paddingBottom': '20px'}, children=[
+                html.Div([
+                    html.Button(children=[
+                        html.Img(src="assets/upload.png", style={'width': '18px', 'height': '15.65px'}),
+                        html.H1("Upload File", style={'fontSize': '16px', 'fontWeight': '500', 'color': '#3F849B'})
+                    ], id="open-upload-button", n_clicks=0, style={'marginTop': '50px', 'display': 'flex', 'gap': '8px', 'justifyItems': 'center', 'border': 'none', 'backgroundColor': 'transparent'}),
+                    html.Div(
+                        id="upload-modal",
+                        children=[
+                            html.Div([
+                                dcc.Upload(
+                                    id="file-upload",
+                                    children=[
+                                        html.Img(src="assets/uploadv2.png"),
+                                        html.H6("Browse file (.csv) or (.xlsx) to upload")
+                                    ],
+                                    style={
+                                        'width': '779px', 'height': '286px', 'lineHeight': '60px', 'display': 'flex', 'flexDirection': 'column',
+                                        'borderWidth': '1px', 'borderStyle': 'dashed', 'borderColor': '#B6B2B2',
+                                        'borderRadius': '15px', 'textAlign': 'center', 'alignItems': 'center', 'justifyItems': 'center', 'justifyContent': 'center'
+                                    },
+                                    multiple=False
                                 ),
-                            ])
-                        ]), 
-                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '193px'}, children=[
-                            html.H1('Date Range', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                            html.Div(style={'padding': '10px', 'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
-                                html.Div(style={'width': '100%'}, children=[
-                                    html.Label('Start Forecast Date:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
-                                    dcc.DatePickerSingle(
-                                        id='date-picker-range-start',
-                                        date=df['DATE'].min(),
-                                        display_format='DD/MM/YYYY', 
-                                        style={ 'border': '1px solid #616161', 'borderRadius': '6px', 'width': '134px', 'height': '30px', 'color': 'black', 'overflow': 'hidden', 'display': 'flex', 'alignItems': 'center' },
-                                    )
-                                ]),
-                                html.Div(style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}, children=[
-                                    html.Label('End Forecast Date:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
-                                    dcc.DatePickerSingle(
-                                        id='date-picker-range-end',
-                                        date=df['DATE'].max(), 
-                                        display_format='DD/MM/YYYY',
-                                        style={'border': '1px solid #616161', 'borderRadius': '6px', 'width': '134px', 'height': '30px', 'color': 'black', 'overflow': 'hidden', 'display': 'flex', 'alignItems': 'center'}
-                                    )
-                                ]),
-                            ])
+                                html.Button("Close", id="close-upload-button", n_clicks=0, style={'width': '100%', 'height': '63px', 'backgroundColor': '#3F849B', 'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'color': '#F9F9F9', 'fontSize': '16px', 'fontWeight': '500', 'border': 'none', 'borderRadius': '12px'})
+                            ], style={'padding': '44px', 'backgroundColor': 'white', 'borderRadius': '5px', 'border': '1px solid #3F849B', 'display': 'flex', 'flexDirection': 'column', 'gap': '12px'}),
+                        ],
+                        style={
+                            'display': 'none',
+                            'position': 'fixed', 'top': '0', 'left': '0', 'width': '100%', 'height': '100%',
+                            'backgroundColor': 'rgba(0, 0, 0, 0.5)', 'alignItems': 'center', 'justifyContent': 'center'
+                        }
+                    ),
+                    html.Div(style={'display': 'flex', 'gap': 28, 'paddingTop': '17px'}, children=[
+                        html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                            html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '220px'}, children=[
+                                html.H1('Completion Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                                html.Div(style={'padding': '10px 25px'}, children=[
+                                    dcc.Checklist(
+                                        id='completion-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in completion_features],
+                                        value=completion_features, 
+                                        labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                        inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                    ),
+                                ])
+                            ]),
+                            html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '220px'}, children=[
+                                html.H1('Event Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                                html.Div(style={'padding': '10px 25px'}, children=[
+                                    dcc.Checklist(
+                                        id='event-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in event_features],
+                                        value=event_features,  
+                                        labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                        inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                    ),
+                                ])
+                            ]),
+                            html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '130px'}, children=[
+                                html.H1('Main Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                                html.Div(style={'padding': '10px 25px'}, children=[
+                                    dcc.Checklist(
+                                        id='main-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in main_features],
+                                        value=main_features,  
+                                        labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                        inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                    ),
+                                ])
+                            ]),
+                            html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'minHeight': '93px'}, children=[
+                                html.H1('Additional Features', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                                html.Div(style={'padding': '10px 25px'}, children=[
+                                    dcc.Checklist(
+                                        id='additional-features-dropdown',
+                                        options=[{'label': feature, 'value': feature} for feature in additional_features],
+                                        value=additional_features, 
+                                        labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                        inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                    ),
+                                ])
+                            ]), 
+                            html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '240px', 'height': '193px'}, children=[
+                                html.H1('Date Range', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                                html.Div(style={'padding': '10px', 'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                                    html.Div(style={'width': '100%'}, children=[
+                                        html.Label('Start Forecast Date:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
+                                        dcc.DatePickerSingle(
+                                            id='date-picker-range-start',
+                                            date=df['DATE'].min(),
+                                            display_format='DD/MM/YYYY', 
+                                            style={ 'border': '1px solid #616161', 'borderRadius': '6px', 'width': '134px', 'height': '30px', 'color': 'black', 'overflow': 'hidden', 'display': 'flex', 'alignItems': 'center' },
+                                        )
+                                    ]),
+                                    html.Div(style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}, children=[
+                                        html.Label('End Forecast Date:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
+                                        dcc.DatePickerSingle(
+                                            id='date-picker-range-end',
+                                            date=df['DATE'].max(), 
+                                            display_format='DD/MM/YYYY',
+                                            style={'border': '1px solid #616161', 'borderRadius': '6px', 'width': '134px', 'height': '30px', 'color': 'black', 'overflow': 'hidden', 'display': 'flex', 'alignItems': 'center'}
+                                        )
+                                    ]),
+                                ])
+                            ]),
                         ]),
-                    ]),
-                    html.Div(style={'width': '60vw'}, children=[
-                        html.Div(style={'border': '1px solid #909090',  'backgroundColor': '#3F849B', 'width': '141px',  'height': '39px',  'borderTopLeftRadius': '10px',  'borderTopRightRadius': '10px', 'display': 'flex', 'alignItems': 'center', 'justifyItems': 'center', 'paddingLeft': '10px', 'paddingTop': '10px'},
-                            children=[
-                                html.H1("Preview", style={'color': 'white', 'fontSize': '14px', 'fontWeight': '700', 'textAlign': 'center'})
-                            ]
-                        ),
-                        html.Div(style={'border': '1px solid grey', 'padding': '21px', 'borderBottomLeftRadius': '30px', 'borderBottomRightRadius': '30px', 'borderTopRightRadius': '30px'}, children=[
-                            html.Div(
-                                style={
-                                    'border': '1px solid #ddd', 
-                                    'padding': '20px', 
-                                    'border-radius': '8px',
-                                    'margin-bottom': '30px', 
-                                    'box-shadow': '0 4px 8px rgba(0, 0, 0, 0.1)'
-                                },
-                                children=[
-                                    html.Div(
-                                        style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
-                                        children=[
-                                            html.Div(
-                                                style={'width': '48%'},
-                                                children=[
-                                                    html.Label('Sort By Column:', style={'font-weight': 'bold'}),
-                                                    dcc.Dropdown(
-                                                        id='sort-column-dropdown',
-                                                        options=[{'label': col, 'value': col} for col in df.columns],
-                                                        value='DATE',
-                                                        placeholder='Select a column to sort by...'
-                                                    )
-                                                ]
-                                            ),
-                                            html.Div(
-                                                style={'width': '48%'},
-                                                children=[
-                                                    html.Label('Sort Order:', style={'font-weight': 'bold'}),
-                                                    dcc.RadioItems(
-                                                        id='sort-order-radio',
-                                                        options=[
-                                                            {'label': 'Ascending', 'value': 'asc'},
-                                                            {'label': 'Descending', 'value': 'desc'}
-                                                        ],
-                                                        value='asc',
-                                                        labelStyle={'display': 'inline-block', 'margin-right': '10px'}
-                                                    )
-                                                ]
-                                            )
-                                        ]
-                                    )
-                                ]
-                            ),
-                            html.Div(
-                                style={'margin-top': '30px', 'width': '60vw'},
-                                children=[
-                                    html.Div(
-                                        style={'overflow': 'scroll', 'width': '57vw'},
-                                        children=[
-                                            dash_table.DataTable(
-                                                id='table',
-                                                columns=[], 
-                                                data=[],
-                                                page_size=10,
-                                                style_table={'border': '1px solid #ddd', 'border-radius': '8px'},
-                                                style_cell={'textAlign': 'left', 'padding': '10px'},
-                                                style_header={'fontWeight': 'bold', 'backgroundColor': '#f9f9f9'}
-                                            ),
-                                        ]
-                                    )
-                                ]
-                            ),
-                            html.Div(
-                                style={'margin-top': '20px', 'text-align': 'center'},
+                        html.Div(style={'width': '60vw'}, children=[
+                            html.Div(style={'border': '1px solid #909090',  'backgroundColor': '#3F849B', 'width': '141px',  'height': '39px',  'borderTopLeftRadius': '10px',  'borderTopRightRadius': '10px', 'display': 'flex', 'alignItems': 'center', 'justifyItems': 'center', 'paddingLeft': '10px', 'paddingTop': '10px'},
                                 children=[
-                                    html.Button('Download Filtered Data', id='download-button', n_clicks=0, 
-                                                style={'margin-right': '15px'}),
-                                    dcc.Download(id='download-csv'),
-                                    html.Button('Train', id='train-button', n_clicks=0, 
-                                                style={'margin-right': '15px'}),
-                                    dcc.Loading(
-                                        id="loading-train",
-                                        type="default",
-                                        children=html.Div(id="train-status", children="", style={'margin': '15px', 'padding': '20px'}),
-                                    ),
+                                    html.H1("Preview", style={'color': 'white', 'fontSize': '14px', 'fontWeight': '700', 'textAlign': 'center'})
                                 ]
                             ),
-                            html.Div(
-                                style={'margin-top': '30px', 'padding': '10px', 'border': '1px solid #ddd', 'border-radius': '8px'},
-                                children=[
-                                    html.H3("Directory Contents", style={'text-align': 'center'}),
-                                    html.P("Note: Training may take some time. Existing folders will appear below.", 
-                                        style={'text-align': 'center', 'color': '#555', 'margin-bottom': '20px'}),
-                                        # Directory View
-                                        html.Div([
-                                            html.H2("Existing Directory"),
-                                            html.Ul(generate_directory_structure(directory_path))
-                                        ], style={'width': '48%', 'display': 'inline-block', 'vertical-align': 'top'}),
-                                        # File Preview Section
-                                        html.Div([
-                                            html.H2("File Preview"),
-                                            html.Div(id='file-preview')
-                                        ], style={'width': '48%', 'display': 'inline-block', 'vertical-align': 'top'})
+                            html.Div(style={'border': '1px solid grey', 'padding': '21px', 'borderBottomLeftRadius': '30px', 'borderBottomRightRadius': '30px', 'borderTopRightRadius': '30px'}, children=[
+                                html.Div(
+                                    style={
+                                        'border': '1px solid #ddd', 
+                                        'padding': '20px', 
+                                        'border-radius': '8px',
+                                        'margin-bottom': '30px', 
+                                        'box-shadow': '0 4px 8px rgba(0, 0, 0, 0.1)'
+                                    },
+                                    children=[
+                                        html.Div(
+                                            style={'display': 'flex', 'justify-content': 'space-between', 'margin-bottom': '20px'},
+                                            children=[
+                                                html.Div(
+                                                    style={'width': '48%'},
+                                                    children=[
+                                                        html.Label('Sort By Column:', style={'font-weight': 'bold'}),
+                                                        dcc.Dropdown(
+                                                            id='sort-column-dropdown',
+                                                            options=[{'label': col, 'value': col} for col in df.columns],
+                                                            value='DATE',
+                                                            placeholder='Select a column to sort by...'
+                                                        )
+                                                    ]
+                                                ),
+                                                html.Div(
+                                                    style={'width': '48%'},
+                                                    children=[
+                                                        html.Label('Sort Order:', style={'font-weight': 'bold'}),
+                                                        dcc.RadioItems(
+                                                            id='sort-order-radio',
+                                                            options=[
+                                                                {'label': 'Ascending', 'value': 'asc'},
+                                                                {'label': 'Descending', 'value': 'desc'}
+                                                            ],
+                                                            value='asc',
+                                                            labelStyle={'display': 'inline-block', 'margin-right': '10px'}
+                                                        )
+                                                    ]
+                                                )
+                                            ]
+                                        )
                                     ]
-                            )
+                                ),
+                                html.Div(
+                                    style={'margin-top': '30px', 'width': '60vw'},
+                                    children=[
+                                        html.Div(
+                                            style={'overflow': 'scroll', 'width': '57vw'},
+                                            children=[
+                                                dcc.Store(id='table-selection'),
+                                                dash_table.DataTable(
+                                                    id='table',
+                                                    columns=[], 
+                                                    data=[],
+                                                    page_size=10,
+                                                    page_current=0,
+                                                    page_action='custom',
+                                                    sort_action='custom',
+                                                    sort_mode='multi',
+                                                    sort_by=[],
+                                                    style_table={'border': '1px solid #ddd', 'border-radius': '8px'},
+                                                    style_cell={'textAlign': 'left', 'padding': '10px'},
+                                                    style_header={'fontWeight': 'bold', 'backgroundColor': '#f9f9f9'}
+                                                ),
+                                            ]
+                                        )
+                                    ]
+                                ),
+                                html.Div(
+                                    style={'margin-top': '20px', 'text-align': 'center'},
+                                    children=[
+                                        dcc.RadioItems(
+                                            id='download-format',
+                                            options=[
+                                                {'label': 'CSV', 'value': 'csv'},
+                                                {'label': 'CSV (gzip)', 'value': 'csv.gz'},
+                                                {'label': 'Parquet', 'value': 'parquet'}
+                                            ],
+                                            value='csv',
+                                            labelStyle={'display': 'inline-block', 'margin-right': '10px'}
+                                        ),
+                                        html.A(html.Button('Download Filtered Data', id='download-button', n_clicks=0, 
+                                                           style={'margin-right': '15px'}),
+                                               id='download-link', download=''),
+                                        html.Button('Train', id='train-button', n_clicks=0, 
+                                                    style={'margin-right': '15px'}),
+                                        html.Button('Cancel', id='cancel-train-button', n_clicks=0, 
+                                                    style={'margin-right': '15px', 'display': 'none'}),
+                                        html.Div(id="train-status", children="", style={'margin': '15px', 'padding': '20px'}),
+                                        dcc.Store(id='train-job-id'),
+                                        dcc.Interval(id='train-poll', interval=1000, disabled=True),
+                                    ]
+                                ),
+                                html.Div(
+                                    style={'margin-top': '30px', 'padding': '10px', 'border': '1px solid #ddd', 'border-radius': '8px'},
+                                    children=[
+                                        html.H3("Directory Contents", style={'text-align': 'center'}),
+                                        html.P("Note: Training may take some time. Existing folders will appear below.", 
+                                            style={'text-align': 'center', 'color': '#555', 'margin-bottom': '20px'}),
+                                            # Directory View
+                                            html.Div([
+                                                html.H2("Existing Directory"),
+                                                html.Ul(generate_directory_structure(directory_path), id='directory-tree')
+                                            ], style={'width': '48%', 'display': 'inline-block', 'vertical-align': 'top'}),
+                                            # File Preview Section
+                                            html.Div([
+                                                html.H2("File Preview"),
+                                                html.Div(id='file-preview')
+                                            ], style={'width': '48%', 'display': 'inline-block', 'vertical-align': 'top'}),
+                                            # Run Comparison
+                                            html.Div([
+                                                html.H2("Runs"),
+                                                dash_table.DataTable(
+                                                    id='runs-table',
+                                                    columns=[{'name': col, 'id': col} for col in run_columns],
+                                                    data=run_rows(),
+                                                    sort_action='native',
+                                                    style_table={'overflowX': 'auto'},
+                                                    style_cell={'textAlign': 'left'}
+                                                )
+                                            ], style={'margin-top': '20px'})
+                                        ]
+                                )
+                            ]),
                         ]),
-                    ]),
-                    html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
-                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '229px', 'minHeight': '40px'}, children=[
-                            html.H1('Objects', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                            html.Div(style={'padding': '10px', 'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
-                                html.Div(style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161', 'display': 'none'}, children=[
-                                    html.Label('Select Well:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
-                                    dcc.Dropdown(
-                                        id='universal-dropdown', 
-                                        options=[{'label': name, 'value': name} for name in df['Universal'].unique()], 
-                                        value=df['Universal'].unique(),
-                                        clearable=False,
-                                    )
-                                ]),
-                                html.Div(children=create_nested_checkboxes(Objects))
-                            ])
-                        ]), 
-                    ]),
-                    dcc.Location(id="page-reloader", refresh=True)
+                        html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                            html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '229px', 'minHeight': '40px'}, children=[
+                                html.H1('Objects', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                                html.Div(style={'padding': '10px', 'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                                    html.Div(style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161', 'display': 'none'}, children=[
+                                        html.Label('Select Well:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
+                                        dcc.Dropdown(
+                                            id='universal-dropdown', 
+                                            options=[{'label': name, 'value': name} for name in df['Universal'].unique()], 
+                                            value=df['Universal'].unique(),
+                                            clearable=False,
+                                        )
+                                    ]),
+                                    html.Div(children=create_nested_checkboxes(Objects))
+                                ])
+                            ]), 
+                        ]),
+                        dcc.Location(id="page-reloader", refresh=True)
+                    ])
                 ])
-            ])
-        ]),
-    ]
-)
+            ]),
+        ]
+    )
+
+app.layout = layout
 
 def save_file(contents, filename):
     content_type, content_string = contents.split(',')
@@ -394,7 +444,7 @@ def toggle_upload_modal(open_clicks, close_clicks, contents, filename):
     }
     if contents is not None:
         save_file(contents, filename)
-        return {**default_style, 'display': 'none'}, "/"
+        return {**default_style, 'display': 'none'}, app.config.requests_pathname_prefix
     if open_clicks > close_clicks:
         return {**default_style, 'display': 'flex'}, None
     return {**default_style, 'display': 'none'}, None
@@ -427,11 +477,40 @@ def update_detail_checkboxes(sub_checked):
             style.append({'display': 'none'})
     return style
 
+def select_rows(params):
+    """Rows and columns of a filter state, ordered by the sort dropdowns"""
+    df = data_provider.ml_data()
+    filtered_df = df[df['Platform'].isin(params['platforms'])]
+
+    if params['universal']:
+        filtered_df = filtered_df[filtered_df['Universal'].isin(params['universal'])]
+
+    filtered_df = filtered_df[(filtered_df['DATE'] >= params['start_date']) & (filtered_df['DATE'] <= params['end_date'])]
+
+    filtered_df = filtered_df[params['columns']]
+
+    if params['sort_column'] and params['sort_order']:
+        filtered_df = filtered_df.sort_values(by=params['sort_column'], ascending=(params['sort_order'] == 'asc'))
+    return filtered_df
+
+def format_page(page):
+    page = page.copy()
+    page['DATE'] = page['DATE'].dt.strftime('%d-%m-%Y')
+    if 'GAS' in page.columns:
+        page['GAS'] = page['GAS'].round(2)
+    if 'WATER' in page.columns:
+        page['WATER'] = page['WATER'].astype(int)
+    if 'OIL' in page.columns:
+        page['OIL'] = page['OIL'].astype(int)
+    return page.to_dict('records')
+
 @app.callback(
     [Output('universal-dropdown', 'options'),
      Output('universal-dropdown', 'value'),
-     Output('table', 'data'),
-     Output('table', 'columns')],
+     Output('table', 'columns'),
+     Output('table', 'page_count'),
+     Output('table', 'page_current'),
+     Output('table-selection', 'data')],
     [Input({'type': 'sub-checkbox', 'name': ALL}, 'value'),
      Input({'type': 'detail-checkbox', 'name': ALL}, 'value'),
      Input('date-picker-range-start', 'date'),
@@ -442,13 +521,14 @@ def update_detail_checkboxes(sub_checked):
      Input('additional-features-dropdown', 'value'),
      Input('sort-column-dropdown', 'value'),
      Input('sort-order-radio', 'value'),
-     Input({'type': 'detail-checkbox', 'name': ALL}, 'value')]
+     Input({'type': 'detail-checkbox', 'name': ALL}, 'value')],
+    State('table', 'page_size')
 )
 def update_filters(selected_platforms, selected_universal, start_date, end_date, 
                    selected_completion, selected_event, selected_main, 
-                   selected_additional, sort_column, sort_order, detail_checkbox):
+                   selected_additional, sort_column, sort_order, detail_checkbox, page_size):
     if not selected_platforms:
-        return [], None, [], []
+        return [], None, [], 1, 0, None
     
     platform = []
     for item in selected_platforms:
@@ -464,58 +544,68 @@ def update_filters(selected_platforms, selected_universal, start_date, end_date,
     selected_universal = universal
 
     
-    filtered_df = df[df['Platform'].isin(selected_platforms)]
-
-    universal_options = [{'label': universal, 'value': universal} for universal in filtered_df['Universal'].unique()]
+    df = data_provider.ml_data()
+    platform_wells = df.loc[df['Platform'].isin(selected_platforms), 'Universal'].unique()
 
-    if selected_universal:
-        selected_universal = [univ for univ in selected_universal if univ in filtered_df['Universal'].unique()]
+    universal_options = [{'label': universal, 'value': universal} for universal in platform_wells]
 
     if selected_universal:
-        filtered_df = filtered_df[filtered_df['Universal'].isin(selected_universal)]
-
-    filtered_df = filtered_df[(filtered_df['DATE'] >= start_date) & (filtered_df['DATE'] <= end_date)]
-
-    columns_to_keep = ['DATE'] + additional + targets + selected_main + ['CHOKE'] + ratios + selected_completion + selected_event + selected_additional
-    filtered_df = filtered_df[columns_to_keep]
-
-    if sort_column and sort_order:
-        filtered_df = filtered_df.sort_values(by=sort_column, ascending=(sort_order == 'asc'))
-
-    filtered_df['DATE'] = filtered_df['DATE'].dt.strftime('%d-%m-%Y')
-    if 'GAS' in filtered_df.columns:
-        filtered_df['GAS'] = filtered_df['GAS'].round(2)
-    if 'WATER' in filtered_df.columns:
-        filtered_df['WATER'] = filtered_df['WATER'].astype(int)
-    if 'OIL' in filtered_df.columns:
-        filtered_df['OIL'] = filtered_df['OIL'].astype(int)
+        selected_universal = [univ for univ in selected_universal if univ in platform_wells]
+
+    # The rows stay on the server; the table fetches them page by page
+    params = {
+        'platforms': selected_platforms,
+        'universal': selected_universal,
+        'start_date': start_date,
+        'end_date': end_date,
+        'columns': ['DATE'] + additional + targets + selected_main + ['CHOKE'] + ratios + selected_completion + selected_event + selected_additional,
+        'sort_column': sort_column,
+        'sort_order': sort_order,
+    }
+    filtered_df = table_pages.rows(data_provider.ML_DATASET, params, select_rows)
 
-    table_data = filtered_df.to_dict('records')
     table_columns = [{'name': col, 'id': col} for col in filtered_df.columns]
 
-    return universal_options, selected_universal, table_data, table_columns
+    return universal_options, selected_universal, table_columns, table_pages.page_count(filtered_df, page_size), 0, params
+
+@app.callback(
+    Output('table', 'data'),
+    Input('table-selection', 'data'),
+    Input('table', 'page_current'),
+    Input('table', 'page_size'),
+    Input('table', 'sort_by')
+)
+def update_table_page(params, page_current, page_size, sort_by):
+    if not params:
+        return []
+    filtered_df = table_pages.rows(data_provider.ML_DATASET, params, select_rows, sort_by)
+    return format_page(table_pages.page(filtered_df, page_current, page_size))
 
 
 @app.callback(
-    Output('download-csv', 'data'),
-    Input('download-button', 'n_clicks'),
-    State({'type': 'sub-checkbox', 'name': ALL}, 'value'),
-    State({'type': 'detail-checkbox', 'name': ALL}, 'value'),
-    State('date-picker-range-start', 'date'),
-    State('date-picker-range-end', 'date'),
-    State('completion-features-dropdown', 'value'),
-    State('event-features-dropdown', 'value'),
-    State('main-features-dropdown', 'value'),
-    State('additional-features-dropdown', 'value'),
-    State('sort-column-dropdown', 'value'),
-    State('sort-order-radio', 'value')
+    Output('download-link', 'href'),
+    Input('table-selection', 'data'),
+    Input('table', 'sort_by'),
+    Input('download-format', 'value')
 )
-def download_filtered_data(n_clicks, selected_platforms, selected_universal, start_date, end_date, 
-                           selected_completion, selected_event, selected_main, selected_additional, 
-                           sort_column, sort_order):
-    if n_clicks == 0:
-        raise PreventUpdate
-    
+def update_download_link(params, sort_by, file_format):
+    if not params:
+        return None
+    return table_pages.download_href(app, '/download/filtered-data', params, sort_by, file_format)
+
+# The rows are streamed from this route instead of going through a callback
+@server.route('/download/filtered-data')
+def download_filtered_data():
+    try:
+        params, sort_by, file_format = table_pages.download_request(flask.request.args)
+        filtered_df = table_pages.rows(data_provider.ML_DATASET, params, select_rows, sort_by)
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Error reading download request: {str(e)}")
+        flask.abort(400)
+    return table_pages.download_response(filtered_df, file_format, 'filtered_data')
+
+def filter_training_data(selected_platforms, selected_universal, selected_completion, selected_event, 
+                         selected_main, selected_additional, sort_column, sort_order):
     platform = []
     for item in selected_platforms:
         if len(item) > 0: platform.append(item[0].split()[-1])
@@ -529,25 +619,44 @@ def download_filtered_data(n_clicks, selected_platforms, selected_universal, sta
     
     selected_universal = universal
 
+    df = data_provider.ml_data()
     filtered_df = df[df['Platform'].isin(selected_platforms)]
+    
     if selected_universal:
         filtered_df = filtered_df[filtered_df['Universal'].isin(selected_universal)]
-    filtered_df = filtered_df[(filtered_df['DATE'] >= start_date) & (filtered_df['DATE'] <= end_date)]
 
     columns_to_keep = ['DATE'] + additional + selected_main + ['CHOKE'] + targets + ratios + selected_completion + selected_event + selected_additional
     filtered_df = filtered_df[columns_to_keep]
 
     if sort_column and sort_order:
         filtered_df = filtered_df.sort_values(by=sort_column, ascending=(sort_order == 'asc'))
-
-    filtered_df['DATE'] = filtered_df['DATE'].dt.strftime('%d-%m-%Y')
-    csv_string = filtered_df.to_csv(index=False, encoding='utf-8')
-
-    return dict(content=csv_string, filename='filtered_data.csv')
+    filtered_df.drop(columns=['WHP', 'WHT'], inplace=True)
+    return filtered_df
+
+def job_status_view(job):
+    percent = int(round(job['progress'] * 100))
+    running = job['status'] in ml_jobs.ACTIVE_STATUSES
+    children = [
+        dbc.Progress(value=percent, label=f"{percent}%", striped=running, animated=running),
+        html.P(job['message'], style={'margin-top': '10px', 'color': '#555'}),
+    ]
+    if job['status'] == 'failed':
+        children.append(html.P(f"Error: {job['error']}", style={'color': 'red'}))
+    if job['status'] == 'done':
+        children.append(html.P(f"Results in {job['result']}", style={'color': '#555'}))
+    return children
 
 @app.callback(
     Output('train-status', 'children'),
+    Output('train-job-id', 'data'),
+    Output('train-poll', 'disabled'),
+    Output('cancel-train-button', 'style'),
+    Output('directory-tree', 'children'),
+    Output('runs-table', 'data'),
     Input('train-button', 'n_clicks'),
+    Input('cancel-train-button', 'n_clicks'),
+    Input('train-poll', 'n_intervals'),
+    State('train-job-id', 'data'),
     State({'type': 'sub-checkbox', 'name': ALL}, 'value'),
     State({'type': 'detail-checkbox', 'name': ALL}, 'value'),
     State('date-picker-range-start', 'date'),
@@ -559,53 +668,38 @@ def download_filtered_data(n_clicks, selected_platforms, selected_universal, sta
     State('sort-column-dropdown', 'value'),
     State('sort-order-radio', 'value')
 )
-def run_ml_and_update_directory(n_clicks, selected_platforms, selected_universal, start_date, end_date, 
-                                selected_completion, selected_event, selected_main, selected_additional, 
-                                sort_column, sort_order):
-    if n_clicks == 0:
+def run_ml_and_update_directory(n_clicks, cancel_clicks, n_intervals, job_id, selected_platforms, selected_universal, 
+                                start_date, end_date, selected_completion, selected_event, selected_main, 
+                                selected_additional, sort_column, sort_order):
+    # Training runs in a worker process; this callback only starts, cancels and polls it
+    triggered = callback_context.triggered[0]['prop_id'].split('.')[0]
+    cancel_style = {'margin-right': '15px'}
+
+    if triggered == 'train-button':
+        if n_clicks == 0:
+            raise PreventUpdate
+        job = ml_jobs.runner.status(job_id) if job_id else None
+        if job is None or job['status'] not in ml_jobs.ACTIVE_STATUSES:
+            filtered_df = filter_training_data(selected_platforms, selected_universal, selected_completion, selected_event, 
+                                               selected_main, selected_additional, sort_column, sort_order)
+            job_id = ml_jobs.runner.submit(mlp.run_ml, filtered_df, start_date, end_date)
+    elif triggered == 'cancel-train-button':
+        if not job_id:
+            raise PreventUpdate
+        ml_jobs.runner.cancel(job_id)
+    elif not job_id:
         raise PreventUpdate
-    
-    platform = []
-    for item in selected_platforms:
-        if len(item) > 0: platform.append(item[0].split()[-1])
 
-    selected_platforms = platform
+    job = ml_jobs.runner.status(job_id)
+    if job is None:
+        return "Training job not found.", None, True, {**cancel_style, 'display': 'none'}, dash.no_update, dash.no_update
 
-    universal = []
-    for items in selected_universal:
-        for item in items:
-            universal.append(item)
-    
-    selected_universal = universal
+    if job['status'] in ml_jobs.ACTIVE_STATUSES:
+        return job_status_view(job), job_id, False, cancel_style, dash.no_update, dash.no_update
 
-    filtered_df = df[df['Platform'].isin(selected_platforms)]
-    
-    if selected_universal:
-        filtered_df = filtered_df[filtered_df['Universal'].isin(selected_universal)]
-
-    columns_to_keep = ['DATE'] + additional + selected_main + ['CHOKE'] + targets + ratios + selected_completion + selected_event + selected_additional
-    filtered_df = filtered_df[columns_to_keep]
-
-    if sort_column and sort_order:
-        filtered_df = filtered_df.sort_values(by=sort_column, ascending=(sort_order == 'asc'))
-    filtered_df.drop(columns=['WHP', 'WHT'], inplace=True)
-    
-    folder_marker = mlp.run_ml(filtered_df, start_date, end_date)
-    
-    directory_content = []
-    for item in os.listdir(folder_marker):
-        item_path = os.path.join(folder_marker, item)
-        if os.path.isdir(item_path):
-            directory_content.append(html.Li(f"Folder: {item}", id={'type': 'folder', 'name': item}))
-        else:
-            file_type = item.split('.')[-1]
-            if file_type in ['png', 'csv', 'xlsx']:
-                directory_content.append(html.Li(
-                    html.A(item, href="#", id={'type': 'file', 'name': item}),
-                    id={'type': 'file-list', 'name': item}
-                ))
-    os.execv(sys.executable, ['python'] + sys.argv)
-    return directory_content
+    if job['status'] != 'done':
+        return job_status_view(job), job_id, True, {**cancel_style, 'display': 'none'}, dash.no_update, dash.no_update
+    return job_status_view(job), job_id, True, {**cancel_style, 'display': 'none'}, generate_directory_structure(directory_path), run_rows()
 
 def serve_image(image_path):
     with open(image_path, 'rb') as image_file:
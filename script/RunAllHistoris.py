@@ -4,27 +4,24 @@ import RunAll_5PlotsData, RunHistoris
 import dash_bootstrap_components as dbc
 import base64, os
 import pandas as pd
+import workbook_store
+import data_cache
+import data_provider
 
 # Initialize Dash app
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], title="Smart Well Monitoring", suppress_callback_exceptions=True)
 server = app.server
 
-excel_file = pd.ExcelFile("./Data/show_historicalData.xlsx")
-df = pd.read_excel(excel_file, sheet_name="monthly_rate_per_day_combined")
-df2 = pd.read_excel(excel_file, sheet_name="pi_sensor_per_month")
-dfPlot = pd.read_excel(excel_file, sheet_name="plot_data")
+excel_file = data_provider.HISTORICAL_WORKBOOK
 
-df['MDATE'] = pd.to_datetime(df['MDATE'], format='%m/%d/%Y')
-df2['START_TIME'] = pd.to_datetime(df2['START_TIME'], format='%Y-%m-%d')
-dfPlot['DATE_STAMP'] = pd.to_datetime(dfPlot['DATE_STAMP'], format='%d/%m/%Y %H:%M')
+def layout():
+    return html.Div(style={'padding': 0, 'margin': 0}, children=[
+        html.Div(id='page-content', style={'padding': 0, 'margin': 0}, children=[
+            RunHistoris.layout(),
+        ]),
+    ])
 
-dropdown_options = sorted(df['Universal'].unique())
-
-app.layout = html.Div(style={'padding': 0, 'margin': 0}, children=[
-    html.Div(id='page-content', style={'padding': 0, 'margin': 0}, children=[
-        RunHistoris.app.layout,
-    ]),
-])
+app.layout = layout
 
 RunHistoris.callback(app)
 RunAll_5PlotsData.callbacks(app)
@@ -36,6 +33,8 @@ def save_file(contents, filename):
     file_path = os.path.join(excel_file)
     with open(file_path, "wb") as f:
         f.write(decoded)
+    data_cache.invalidate(excel_file)
+    workbook_store.ingest_workbook(excel_file)
 
 @app.callback(
     Output("upload-modal", "style"),
@@ -54,7 +53,7 @@ def toggle_upload_modal(open_clicks, close_clicks, contents, filename):
     }
     if contents is not None:
         save_file(contents, filename)
-        return {**default_style, 'display': 'none'}, "/"
+        return {**default_style, 'display': 'none'}, app.config.requests_pathname_prefix
     if open_clicks > close_clicks:
         return {**default_style, 'display': 'flex'}, None
     return {**default_style, 'display': 'none'}, None
@@ -65,9 +64,9 @@ def toggle_upload_modal(open_clicks, close_clicks, contents, filename):
 )
 def change_plot_type(plot_type):
     if plot_type == 'multi':
-        return RunAll_5PlotsData.app.layout
+        return RunAll_5PlotsData.layout()
     else:
-        return RunHistoris.app.layout
+        return RunHistoris.layout()
 
 @app.callback(
     Output({'type': 'sub-checkbox', 'name': ALL}, 'labelStyle'),
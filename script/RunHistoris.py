@@ -1,31 +1,20 @@
 import pandas as pd
 import os, webbrowser
-from dash import dcc, html, Input, Output, State, ALL, callback, Dash
+from dash import dcc, html, Input, Output, State, ALL, callback, Dash, Patch, callback_context
 import plotly.graph_objects as go
 import dash_bootstrap_components as dbc
 import base64
+import workbook_store
+import data_cache
+import data_provider
+import well_catalog
+import figure_patch
 
-excel_file = pd.ExcelFile("./Data/show_historicalData.xlsx")
-df = pd.read_excel(excel_file, sheet_name="monthly_rate_per_day_combined")
-df['MDATE'] = pd.to_datetime(df['MDATE'], format='%m/%d/%Y')
+excel_file = data_provider.HISTORICAL_WORKBOOK
 
-app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
 app.title = "Smart Well Monitoring - Universitas Pertamina"
-
-Objects = {}
-for name in df['Universal'].unique():
-    parents = name.split("-")
-    main, sub, detail = parents[0], parents[1], parents[2]
-
-    field_key = f"{main}ekapai Field"
-    platform_key = f"Platform {sub}"
-
-    if field_key not in Objects:
-        Objects[field_key] = {}
-    if platform_key not in Objects[field_key]:
-        Objects[field_key][platform_key] = []
-
-    Objects[field_key][platform_key].append(name)
+server = app.server
 
 def create_nested_checkboxes(structure):
     elements = []
@@ -68,167 +57,171 @@ def create_nested_checkboxes(structure):
         elements.append(html.Div([main_checkbox, html.Div(sub_elements, style={'marginLeft': '32px'})]))
     return elements
 
-app.layout = html.Div([
-    html.Header([
-        html.Nav([
+def layout():
+    Objects = well_catalog.object_tree(data_provider.historical_index("monthly_rate_per_day_combined").names)
+    return html.Div([
+        html.Header([
             html.Nav([
-                html.Div([
+                html.Nav([
                     html.Div([
-                        html.Img(src="assets/logo.png", style={'width': '50px', 'height': '38.19px'}),
                         html.Div([
-                            html.H1("WENNI", style={'fontWeight': '600', 'fontSize': "20px", 'color': '#006CB8', 'lineHeight': "25.2px"}),
-                            html.P("Well Forecast and Monitoring", style={'fontWeight': '400', 'fontSize': "14px", 'color': '#9B9797', 'lineHeight': '17.64px'})
-                        ], style={'flexDirection': 'column'})
-                    ], style={'display': 'flex', 'alignItems': 'center', 'gap': '13.11px', 'paddingTop': '27px'}),
-                    html.Img(src="assets/PHM.png", style={'width': '174px'})
-                ], style={'backgroundColor': 'white', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingLeft': '37px', 'paddingRight': '37px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'})
-            ], style={'backgroundColor': '#C3304A', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingBottom': '20px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'}),
-            html.Nav([
-                html.Div([
-                    html.P("Historical", style={"fontWeight": "800", "fontSize": '16px', "color": 'white'}),
-                    html.P("DCA", style={"fontWeight": "400", 'fontSize': '16px', "color": 'white'}),
-                    html.P('Forecast', style={"fontWeight": "400", "fontSize": '16px', "color": 'white'})
-                ], style={'display': 'flex', 'alignItems': 'center', 'gap': '71px', 'paddingLeft': '35px'}),
-                html.Div([
-                    html.H1('Admin 1', style={"fontWeight": "700", 'fontSize': '16px', "color": 'white'}),
-                    html.P('Role Admin', style={"fontWeight": "400", "fontSize": '14px', "color": 'white'})
-                ], style={'display': 'flex', 'flexDirection': 'column', 'gap':'1px', 'paddingRight': '35px'})
-            ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'space-between', 'width': '100%', 'paddingLeft': '76px', 'paddingRight': '76px', 'paddingTop': '30px', 'paddingBottom': '30px'})
-        ], style={'backgroundColor': '#3F849B', 'display': 'flex', 'flexDirection': 'column', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%'})
-    ], style={'width': '100%', 'display': "flex", 'flexDirection': 'column'}),
-    html.Div(style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'width': "100%", 'paddingBottom': '20px'}, children=[
-        html.Div([    
-            html.Button(children=[
-                html.Img(src="assets/upload.png", style={'width': '18px', 'height': '15.65px'}),
-                html.H1("Upload File", style={'fontSize': '16px', 'fontWeight': '500', 'color': '#3F849B'})
-            ], id="open-upload-button", n_clicks=0, style={'marginTop': '50px', 'display': 'flex', 'gap': '8px', 'justifyItems': 'center', 'border': 'none', 'backgroundColor': 'transparent'}),
-            html.Div(
-                id="upload-modal",
-                children=[
+                            html.Img(src="assets/logo.png", style={'width': '50px', 'height': '38.19px'}),
+                            html.Div([
+                                html.H1("WENNI", style={'fontWeight': '600', 'fontSize': "20px", 'color': '#006CB8', 'lineHeight': "25.2px"}),
+                                html.P("Well Forecast and Monitoring", style={'fontWeight': '400', 'fontSize': "14px", 'color': '#9B9797', 'lineHeight': '17.64px'})
+                            ], style={'flexDirection': 'column'})
+                        ], style={'display': 'flex', 'alignItems': 'center', 'gap': '13.11px', 'paddingTop': '27px'}),
+                        html.Img(src="assets/PHM.png", style={'width': '174px'})
+                    ], style={'backgroundColor': 'white', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingLeft': '37px', 'paddingRight': '37px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'})
+                ], style={'backgroundColor': '#C3304A', 'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%', 'paddingBottom': '20px', 'borderBottomLeftRadius': "20px", 'borderBottomRightRadius': '20px'}),
+                html.Nav([
                     html.Div([
-                        dcc.Upload(
-                            id="file-upload",
-                            children=[
-                                html.Img(src="assets/uploadv2.png"),
-                                html.H6("Browse file (.csv) or (.xlsx) to upload")
-                            ],
-                            style={
-                                'width': '779px', 'height': '286px', 'lineHeight': '60px', 'display': 'flex', 'flexDirection': 'column',
-                                'borderWidth': '1px', 'borderStyle': 'dashed', 'borderColor': '#B6B2B2',
-                                'borderRadius': '15px', 'textAlign': 'center', 'alignItems': 'center', 'justifyItems': 'center', 'justifyContent': 'center'
-                            },
-                            multiple=False
-                        ),
-                        html.Button("Close", id="close-upload-button", n_clicks=0, style={'width': '100%', 'height': '63px', 'backgroundColor': '#3F849B', 'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'color': '#F9F9F9', 'fontSize': '16px', 'fontWeight': '500', 'border': 'none', 'borderRadius': '12px'})
-                    ], style={'padding': '44px', 'backgroundColor': 'white', 'borderRadius': '5px', 'border': '1px solid #3F849B', 'display': 'flex', 'flexDirection': 'column', 'gap': '12px'}),
-                ],
-                style={
-                    'display': 'none',
-                    'position': 'fixed', 'top': '0', 'left': '0', 'width': '100%', 'height': '100%',
-                    'backgroundColor': 'rgba(0, 0, 0, 0.5)', 'alignItems': 'center', 'justifyContent': 'center'
-                }
-            ),
-            html.Div(style={'display': 'flex', 'gap': 28, 'paddingTop': '17px'}, children=[
-                html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
-                    html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '130px'}, children=[
-                        html.H1('Rate Scale', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                        html.Div(style={'padding': '10px 25px'}, children=[
-                            dcc.RadioItems(
-                                id="dropdown-scale",
-                                options=[
-                                    {'label': 'Linear', 'value': 'linear'},
-                                    {'label': 'Logarithmic', 'value': 'log'},
-                                ],
-                                value='linear', 
-                                labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
-                            ),
-                        ])
-                    ]),
-                    html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '93px'}, children=[
-                        html.H1('Legend', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                        html.Div(style={'padding': '10px 25px'}, children=[
-                            dcc.Checklist(
-                                id='legend-status',
-                                options=[
-                                    {'label': 'Enable', 'value': 'on'},
+                        html.P("Historical", style={"fontWeight": "800", "fontSize": '16px', "color": 'white'}),
+                        html.P("DCA", style={"fontWeight": "400", 'fontSize': '16px', "color": 'white'}),
+                        html.P('Forecast', style={"fontWeight": "400", "fontSize": '16px', "color": 'white'})
+                    ], style={'display': 'flex', 'alignItems': 'center', 'gap': '71px', 'paddingLeft': '35px'}),
+                    html.Div([
+                        html.H1('Admin 1', style={"fontWeight": "700", 'fontSize': '16px', "color": 'white'}),
+                        html.P('Role Admin', style={"fontWeight": "400", "fontSize": '14px', "color": 'white'})
+                    ], style={'display': 'flex', 'flexDirection': 'column', 'gap':'1px', 'paddingRight': '35px'})
+                ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'space-between', 'width': '100%', 'paddingLeft': '76px', 'paddingRight': '76px', 'paddingTop': '30px', 'paddingBottom': '30px'})
+            ], style={'backgroundColor': '#3F849B', 'display': 'flex', 'flexDirection': 'column', 'justifyContent': 'space-between', 'alignItems': 'center', 'width': '100%'})
+        ], style={'width': '100%', 'display': "flex", 'flexDirection': 'column'}),
+        html.Div(style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'width': "100%", 'paddingBottom': '20px'}, children=[
+            html.Div([    
+                html.Button(children=[
+                    html.Img(src="assets/upload.png", style={'width': '18px', 'height': '15.65px'}),
+                    html.H1("Upload File", style={'fontSize': '16px', 'fontWeight': '500', 'color': '#3F849B'})
+                ], id="open-upload-button", n_clicks=0, style={'marginTop': '50px', 'display': 'flex', 'gap': '8px', 'justifyItems': 'center', 'border': 'none', 'backgroundColor': 'transparent'}),
+                html.Div(
+                    id="upload-modal",
+                    children=[
+                        html.Div([
+                            dcc.Upload(
+                                id="file-upload",
+                                children=[
+                                    html.Img(src="assets/uploadv2.png"),
+                                    html.H6("Browse file (.csv) or (.xlsx) to upload")
                                 ],
-                                value=['on'], 
-                                labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                style={
+                                    'width': '779px', 'height': '286px', 'lineHeight': '60px', 'display': 'flex', 'flexDirection': 'column',
+                                    'borderWidth': '1px', 'borderStyle': 'dashed', 'borderColor': '#B6B2B2',
+                                    'borderRadius': '15px', 'textAlign': 'center', 'alignItems': 'center', 'justifyItems': 'center', 'justifyContent': 'center'
+                                },
+                                multiple=False
                             ),
+                            html.Button("Close", id="close-upload-button", n_clicks=0, style={'width': '100%', 'height': '63px', 'backgroundColor': '#3F849B', 'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'color': '#F9F9F9', 'fontSize': '16px', 'fontWeight': '500', 'border': 'none', 'borderRadius': '12px'})
+                        ], style={'padding': '44px', 'backgroundColor': 'white', 'borderRadius': '5px', 'border': '1px solid #3F849B', 'display': 'flex', 'flexDirection': 'column', 'gap': '12px'}),
+                    ],
+                    style={
+                        'display': 'none',
+                        'position': 'fixed', 'top': '0', 'left': '0', 'width': '100%', 'height': '100%',
+                        'backgroundColor': 'rgba(0, 0, 0, 0.5)', 'alignItems': 'center', 'justifyContent': 'center'
+                    }
+                ),
+                html.Div(style={'display': 'flex', 'gap': 28, 'paddingTop': '17px'}, children=[
+                    html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '130px'}, children=[
+                            html.H1('Rate Scale', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                            html.Div(style={'padding': '10px 25px'}, children=[
+                                dcc.RadioItems(
+                                    id="dropdown-scale",
+                                    options=[
+                                        {'label': 'Linear', 'value': 'linear'},
+                                        {'label': 'Logarithmic', 'value': 'log'},
+                                    ],
+                                    value='linear', 
+                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                ),
+                            ])
+                        ]),
+                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '93px'}, children=[
+                            html.H1('Legend', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                            html.Div(style={'padding': '10px 25px'}, children=[
+                                dcc.Checklist(
+                                    id='legend-status',
+                                    options=[
+                                        {'label': 'Enable', 'value': 'on'},
+                                    ],
+                                    value=['on'], 
+                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                ),
+                            ]),
+                        ]),
+                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '223px'}, children=[
+                            html.H1('Object', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                            html.Div(style={'padding': '10px 25px'}, children=[
+                                dcc.Checklist(
+                                    id='figure-checklist',
+                                    options=[
+                                        {'label': 'Gas Rate', 'value': 'Gas'},
+                                        {'label': 'Water Rate', 'value': 'Water'},
+                                        {'label': 'Oil Rate', 'value': 'Oil'},
+                                        {'label': "WHP Rate", 'value': "WHP Rate", 'disabled': True},
+                                        {'label': "WHT Rate", 'value': "WHT Rate", 'disabled': True}
+                                    ],
+                                    value=['Gas', 'Water', 'Oil'], 
+                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
+                                ),
+                            ])
+                        ]),
+                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '130px'}, children=[
+                            html.H1('Plot Area', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                            html.Div(style={'padding': '10px 25px'}, children=[
+                                dcc.RadioItems(
+                                    id="plot-type",
+                                    options=[
+                                        {'label': 'Single Plot', 'value': 'single'},
+                                        {'label': 'Multi Plot', 'value': 'multi'},
+                                    ],
+                                    value='single', 
+                                    labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
+                                    inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'},
+                                ),
+                            ])
                         ]),
                     ]),
-                    html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '223px'}, children=[
-                        html.H1('Object', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                        html.Div(style={'padding': '10px 25px'}, children=[
-                            dcc.Checklist(
-                                id='figure-checklist',
-                                options=[
-                                    {'label': 'Gas Rate', 'value': 'Gas'},
-                                    {'label': 'Water Rate', 'value': 'Water'},
-                                    {'label': 'Oil Rate', 'value': 'Oil'},
-                                    {'label': "WHP Rate", 'value': "WHP Rate", 'disabled': True},
-                                    {'label': "WHT Rate", 'value': "WHT Rate", 'disabled': True}
-                                ],
-                                value=['Gas', 'Water', 'Oil'], 
-                                labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'}
-                            ),
-                        ])
+                    html.Div(style={"width": '50rem'}, children=[
+                        dcc.Tabs(id='tab-container',
+                            value='B-L-18',
+                            children=[],
+                            content_style={'textAlign':'center'}
+                        ),
+                        html.Div(style={'border': '1px solid grey', 'padding': '21px', 'borderBottomLeftRadius': '30px', 'borderBottomRightRadius': '30px', 'borderTopRightRadius': '30px', 'width': '100%'}, children=[
+                            dbc.Row([
+                                dbc.Col(html.Div(id='combined-graph', children=[
+                                    dcc.Graph(id='history-graph')
+                                ]), width=12),
+                            ]),
+                        ])            
                     ]),
-                    html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '174px', 'height': '130px'}, children=[
-                        html.H1('Plot Area', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                        html.Div(style={'padding': '10px 25px'}, children=[
-                            dcc.RadioItems(
-                                id="plot-type",
-                                options=[
-                                    {'label': 'Single Plot', 'value': 'single'},
-                                    {'label': 'Multi Plot', 'value': 'multi'},
-                                ],
-                                value='single', 
-                                labelStyle={'display': 'flex', 'marginBottom': '9.5px', 'gap': '15px', 'alignItems': 'center', 'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'},
-                                inputStyle={'transform': 'scale(1.5)', 'borderRadius': '6px'},
-                            ),
-                        ])
+                    html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px', 'width': '25rem'}, children=[
+                        html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '229px', 'minHeight': '40px'}, children=[
+                            html.H1('Objects', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
+                            html.Div(style={'padding': '10px', 'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
+                                html.Div(style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161', 'display': 'none'}, children=[
+                                    html.Label('Select Well:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
+                                    dcc.Dropdown(
+                                        id='dropdown-well', 
+                                        options=[{'label': value, 'value': value} for value in data_provider.historical_wells()],
+                                        value=data_provider.historical_wells()[0],
+                                        clearable=False,
+                                    )
+                                ]),
+                                html.Div(children=create_nested_checkboxes(Objects))
+                            ])
+                        ]), 
                     ]),
+                    dcc.Location(id="page-reloader", refresh=True)
                 ]),
-                html.Div(style={"width": '50rem'}, children=[
-                    dcc.Tabs(id='tab-container',
-                        value='B-L-18',
-                        children=[],
-                        content_style={'textAlign':'center'}
-                    ),
-                    html.Div(style={'border': '1px solid grey', 'padding': '21px', 'borderBottomLeftRadius': '30px', 'borderBottomRightRadius': '30px', 'borderTopRightRadius': '30px', 'width': '100%'}, children=[
-                        dbc.Row([
-                            dbc.Col(html.Div(id='combined-graph', children=[
-                                
-                            ]), width=12),
-                        ]),
-                    ])            
-                ]),
-                html.Div(style={'display': 'flex', 'flexDirection': 'column', 'gap': '10px', 'width': '25rem'}, children=[
-                    html.Div(className='feature-container', style={'border': '1px solid #3F849B', 'padding': '0', 'borderRadius': '16px', 'width': '229px', 'minHeight': '40px'}, children=[
-                        html.H1('Objects', className='Feature-title', style={'color': 'white', 'fontWeight': '700', 'fontSize': '16px', 'padding': '8px 17px', 'backgroundColor': '#3F849B', 'borderRadius': '10px'}),
-                        html.Div(style={'padding': '10px', 'display': 'flex', 'flexDirection': 'column', 'gap': '10px'}, children=[
-                            html.Div(style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161', 'display': 'none'}, children=[
-                                html.Label('Select Well:', style={'fontWeight': '400', 'fontSize': '14px', 'color': '#616161'}),
-                                dcc.Dropdown(
-                                    id='dropdown-well', 
-                                    options=[{'label': value, 'value': value} for value in sorted(df['Universal'].unique())],
-                                    value=sorted(df['Universal'].unique())[0],
-                                    clearable=False,
-                                )
-                            ]),
-                            html.Div(children=create_nested_checkboxes(Objects))
-                        ])
-                    ]), 
-                ]),
-                dcc.Location(id="page-reloader", refresh=True)
             ]),
         ]),
-    ]),
-])
+    ])
+
+app.layout = layout
 
 def save_file(contents, filename):
     content_type, content_string = contents.split(',')
@@ -237,6 +230,8 @@ def save_file(contents, filename):
     file_path = os.path.join(excel_file)
     with open(file_path, "wb") as f:
         f.write(decoded)
+    data_cache.invalidate(excel_file)
+    workbook_store.ingest_workbook(excel_file)
 
 @app.callback(
     Output("upload-modal", "style"),
@@ -255,7 +250,7 @@ def toggle_upload_modal(open_clicks, close_clicks, contents, filename):
     }
     if contents is not None:
         save_file(contents, filename)
-        return {**default_style, 'display': 'none'}, "/"
+        return {**default_style, 'display': 'none'}, app.config.requests_pathname_prefix
     if open_clicks > close_clicks:
         return {**default_style, 'display': 'flex'}, None
     return {**default_style, 'display': 'none'}, None
@@ -316,7 +311,7 @@ def update_tabs(selected_items):
 
 def callback(app):
     @app.callback(
-        Output('combined-graph', 'children'),
+        Output('history-graph', 'figure'),
         [
         Input('dropdown-well', 'value'),
         Input('dropdown-scale', 'value'),
@@ -330,38 +325,54 @@ def callback(app):
         water = 'Water' in plot_type
         oil = 'Oil' in plot_type
 
-        filtered_df = df[df['Universal'] == selected_well]
+        # Another well redraws the figure, the other inputs only patch it
+        triggered = figure_patch.triggered_ids(callback_context)
+        if triggered <= {'dropdown-scale', 'legend-status', 'figure-checklist'}:
+            fig = Patch()
+            if 'legend-status' in triggered:
+                fig['layout']['legend']['visible'] = show_legend
+            if 'dropdown-scale' in triggered:
+                for axis in ('yaxis', 'yaxis2'):
+                    fig['layout'][axis]['type'] = y_axis_type
+                    fig['layout'][axis]['title']['text'] = y_axis_type + ' rate'
+            if 'figure-checklist' in triggered:
+                for i, visible in enumerate((oil, water, gas)):
+                    fig['data'][i]['visible'] = visible
+            return fig
+
+        filtered_df = data_provider.historical_index("monthly_rate_per_day_combined").rows(selected_well)
 
+        # Hidden traces are kept so each rate keeps its index: 0 oil, 1 water, 2 gas
         fig = go.Figure()
 
-        if(oil):
-            fig.add_trace(go.Scatter(
-                x=filtered_df['MDATE'],
-                y=filtered_df['OIL_per_day'],
-                mode='lines',
-                name='Oil Rate (stbd)(bbl/d)',
-                line=dict(color='green', width=1.5),
-                hovertemplate='Oil Rate: %{y:.2f} bbl/d<extra></extra>',
-            ))
-        if(water):
-            fig.add_trace(go.Scatter(
-                x=filtered_df['MDATE'],
-                y=filtered_df['WATER_per_day'],
-                mode='lines',
-                name='Water Rate (stbd)(bbl/d)',
-                line=dict(color='blue', width=1.5),
-                hovertemplate='Water Rate: %{y:.2f} bbl/d<extra></extra>',
-            ))
-        if(gas):
-            fig.add_trace(go.Scatter(
-                x=filtered_df['MDATE'],
-                y=filtered_df['GAS_per_day'],
-                mode='lines',
-                name='Gas Rate (mmscfd)(cf/d)',
-                line=dict(color='red', width=1.5),
-                yaxis='y2',
-                hovertemplate='Gas Rate: %{y:.2f} mmscfd<extra></extra>',
-            ))
+        fig.add_trace(go.Scatter(
+            x=filtered_df['MDATE'],
+            y=filtered_df['OIL_per_day'],
+            mode='lines',
+            name='Oil Rate (stbd)(bbl/d)',
+            line=dict(color='green', width=1.5),
+            hovertemplate='Oil Rate: %{y:.2f} bbl/d<extra></extra>',
+            visible=oil,
+        ))
+        fig.add_trace(go.Scatter(
+            x=filtered_df['MDATE'],
+            y=filtered_df['WATER_per_day'],
+            mode='lines',
+            name='Water Rate (stbd)(bbl/d)',
+            line=dict(color='blue', width=1.5),
+            hovertemplate='Water Rate: %{y:.2f} bbl/d<extra></extra>',
+            visible=water,
+        ))
+        fig.add_trace(go.Scatter(
+            x=filtered_df['MDATE'],
+            y=filtered_df['GAS_per_day'],
+            mode='lines',
+            name='Gas Rate (mmscfd)(cf/d)',
+            line=dict(color='red', width=1.5),
+            yaxis='y2',
+            hovertemplate='Gas Rate: %{y:.2f} mmscfd<extra></extra>',
+            visible=gas,
+        ))
 
         fig.update_layout(
             xaxis=dict(title='Year'),
@@ -377,10 +388,11 @@ def callback(app):
             hovermode='x unified',
             template='simple_white',
             margin=dict(l=40, r=40, t=50, b=50),
+            uirevision=selected_well,
         )
 
         
-        return dcc.Graph(figure=fig)
+        return fig
 
 callback(app)
 
@@ -0,0 +1,83 @@
+import os, webbrowser
+import sys
+import importlib.util
+import threading
+from flask import Flask
+from werkzeug.middleware.dispatcher import DispatcherMiddleware
+from werkzeug.serving import run_simple
+
+# Every SmartWell page in one process. Each page is an existing Dash app,
+# mounted under its own path and imported on its first request, so a page
+# loads its data only once someone visits it. Pages share the process-wide
+# caches (data_cache, workbook_store), so the same workbook is held once.
+
+SCRIPT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Mount path: (script, title)
+PAGES = {
+    '/historis': ('RunAllHistoris.py', 'Historical'),
+    '/dca': ('DcaAll.py', 'DCA'),
+    '/dtf': ('DTF.py', 'Data Filter'),
+    '/ml': ('ML.py', 'ML'),
+}
+
+# Dash reads its request prefix from the environment while an app is built
+_import_lock = threading.Lock()
+
+
+class LazyPage:
+    """
+    WSGI app importing a page's Dash app on its first request
+
+    Args:
+        script: File name of the page in the script directory
+        prefix: Path the page is mounted under
+    """
+    def __init__(self, script, prefix):
+        self.script = script
+        self.prefix = prefix
+        self._server = None
+
+    def load(self):
+        with _import_lock:
+            if self._server is None:
+                os.environ['DASH_REQUESTS_PATHNAME_PREFIX'] = f'{self.prefix}/'
+                try:
+                    name = os.path.splitext(self.script)[0].replace('-', '_')
+                    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPT_DIRECTORY, self.script))
+                    module = importlib.util.module_from_spec(spec)
+                    # Registered first, so Dash finds the page's assets folder
+                    sys.modules[name] = module
+                    try:
+                        spec.loader.exec_module(module)
+                    except Exception:
+                        del sys.modules[name]
+                        raise
+                finally:
+                    del os.environ['DASH_REQUESTS_PATHNAME_PREFIX']
+                self._server = module.app.server
+        return self._server
+
+    def __call__(self, environ, start_response):
+        return self.load()(environ, start_response)
+
+
+index = Flask(__name__)
+
+@index.route('/')
+def page_index():
+    links = ''.join(f'<li><a href="{prefix}/">{title}</a></li>' for prefix, (_, title) in PAGES.items())
+    return f'<html><head><title>Smart Well Monitoring</title></head><body><h1>Smart Well Monitoring</h1><ul>{links}</ul></body></html>'
+
+application = DispatcherMiddleware(index, {prefix: LazyPage(script, prefix) for prefix, (script, _) in PAGES.items()})
+
+
+def preload():
+    """Import every page now instead of on its first request"""
+    for page in application.mounts.values():
+        page.load()
+
+if __name__ == '__main__':
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        webbrowser.open_new("http://127.0.0.1:8050/")
+    run_simple('127.0.0.1', 8050, application, use_reloader=True, threaded=True)
@@ -0,0 +1,119 @@
+// Arps rates and reserves of curve_cum_function and decline_solver, so the
+// b, qi, Di and rate intervention sliders of DcaAll redraw the model
+// and forecast lines in the browser while they are dragged. The server sends
+// the fitted parameters once per fit in the dca-forecast-model store.
+
+function exponentialRate(qi, di, t) {
+    return qi * Math.exp(-di * t);
+}
+
+function harmonicRate(qi, di, t) {
+    return qi / (1 + di * t);
+}
+
+function hyperbolicRate(qi, di, b, t) {
+    b = b === 1 ? 0.9999 : b === 0 ? 0.0001 : b;
+    return qi / Math.pow(1 + b * di * t, 1 / b);
+}
+
+// Rate of decline_solver: b == 0 exponential, b == 1 harmonic, else hyperbolic
+function arpsRate(qi, di, b, t) {
+    if (b === 0) return exponentialRate(qi, di, t);
+    if (b === 1) return harmonicRate(qi, di, t);
+    return qi / Math.pow(1 + b * di * t, 1 / b);
+}
+
+function cumulativeAt(qi, di, b, t) {
+    if (!(t > 0)) return 0;
+    // No decline stays at qi; a negative Di rises along the same curve
+    if (di === 0) return qi * t;
+    if (b === 0) return (qi - arpsRate(qi, di, b, t)) / di;
+    if (b === 1) return qi / di * Math.log1p(di * t);
+    return qi / (di * (1 - b)) * (1 - Math.pow(arpsRate(qi, di, b, t) / qi, 1 - b));
+}
+
+function timeToLimit(qi, di, b, limitRate) {
+    const ratio = limitRate > 0 ? qi / limitRate : Infinity;
+    if (ratio <= 1) return 0;
+    // A flat or rising rate never falls to the limit
+    if (!(di > 0)) return Infinity;
+    if (b === 0) return Math.log(ratio) / di;
+    if (b === 1) return (ratio - 1) / di;
+    return (Math.pow(ratio, b) - 1) / (b * di);
+}
+
+// Reserves of decline_solver.solve_eur with month_grid=True
+function monthlyReserves(qi, di, b, limitRate, horizon) {
+    const end = Math.floor(Math.min(timeToLimit(qi, di, b, limitRate), horizon));
+    return cumulativeAt(qi, di, b, end);
+}
+
+function formatNumber(value, decimals) {
+    return value.toLocaleString('en-US', {minimumFractionDigits: decimals, maximumFractionDigits: decimals});
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    arps: {
+        update_forecast: function(b, qiChange, diChange, rateIntervention, model, figure) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!model || !figure || b === null || b === undefined) {
+                return [noUpdate, noUpdate];
+            }
+            qiChange = qiChange || 0;
+            rateIntervention = rateIntervention || 0;
+            // Di of the fits moves with the Di slider in millionths
+            const shift = ((diChange || 0) - model.di_change) / 1000000;
+            const di = {
+                exponential: model.di.exponential + shift,
+                harmonic: model.di.harmonic + shift,
+                hyperbolic: model.di.hyperbolic + shift,
+            };
+
+            const data = figure.data.slice();
+            const update = function(index, props) {
+                data[index] = Object.assign({}, data[index], props);
+            };
+
+            // Model lines, traces 1-3
+            const qi = {
+                exponential: model.qi.exponential + qiChange,
+                harmonic: model.qi.harmonic + qiChange,
+                hyperbolic: model.qi.hyperbolic + qiChange,
+            };
+            update(1, {y: model.model_time[0].map(t => exponentialRate(qi.exponential, di.exponential, t))});
+            update(2, {y: model.model_time[1].map(t => hyperbolicRate(qi.hyperbolic, di.hyperbolic, model.best_b, t))});
+            update(3, {y: model.model_time[2].map(t => harmonicRate(qi.harmonic, di.harmonic, t))});
+
+            // Forecast line, trace 4
+            const currentRate = model.last_rate + rateIntervention;
+            const steps = [...Array(model.horizon + 1).keys()];
+            let forecast, forecastDi, color;
+            if (b === 0) {
+                forecastDi = di.exponential;
+                forecast = steps.map(t => exponentialRate(currentRate, forecastDi, t));
+                color = 'LightBlue';
+            } else if (b === 1) {
+                forecastDi = di.harmonic;
+                forecast = steps.map(t => harmonicRate(currentRate, forecastDi, t));
+                color = 'LightSalmon';
+            } else {
+                forecastDi = di.hyperbolic;
+                forecast = steps.map(t => hyperbolicRate(currentRate, forecastDi, b, t));
+                color = 'LightGreen';
+            }
+            update(4, {
+                y: forecast,
+                name: `Forecast Line (di=${forecastDi.toFixed(2)}, qi=${model.last_rate.toFixed(2)})`,
+                line: Object.assign({}, data[4].line, {color: color}),
+            });
+
+            const reserves = monthlyReserves(currentRate, forecastDi, b, model.limit, model.horizon);
+            const reservesOutput = [
+                'Forecasted Reserves: ',
+                {type: 'Span', namespace: 'dash_html_components',
+                 props: {children: `${formatNumber(reserves, 2)} bbl`, style: {fontWeight: 'bold'}}},
+            ];
+            return [Object.assign({}, figure, {data: data}), reservesOutput];
+        }
+    }
+});
@@ -0,0 +1,144 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+import curve_cum_function as ccf
+from cumulative_production import cumulative
+import data_cache
+import decline_solver
+import probabilistic_reserves
+import workbook_store
+
+# Model name and the b used for its forecast (None = best b from the fit)
+MODELS = [('Exponential', 0), ('Harmonic', 1), ('Hyperbolic', None)]
+
+# qi is the rate the forecast starts from, as in the DCA apps; Fit qi is the
+# qi of the fitted model, which the Di belongs to
+RESERVES_COLUMNS = ["Well Name", "Model", "Start Date", "End Date", "Start Forecast Date",
+                    "qi", "Fit qi", "Di", "b", "Cum Prod", "EUR", "Reserves", "Cut Off Date"]
+
+# Added when the reserves are also simulated (--samples)
+PROBABILISTIC_COLUMNS = [f"{column} {case}" for column in ("EUR", "Cut Off Date")
+                         for case in probabilistic_reserves.PERCENTILES]
+
+
+def fit_well(excel_file, well_name, forecast_start=None, months=120, limit_value=0.0, rate_intervention=0,
+             engine='closed_form', samples=0):
+    """
+    Fit all three decline models to the full history of one well
+
+    Mirrors the DCA apps with the date slider over the whole history and
+    returns one reserves row per model. With samples > 0 the rows also get
+    the Monte Carlo P90/P50/P10 EUR and cut-off dates.
+    """
+    df = data_cache.read_well_sheet(excel_file, well_name)
+    start_date = df['DATE_STAMP'].iloc[0]
+    end_date = df['DATE_STAMP'].iloc[-1]
+
+    best_b, exp_di, har_di, hyper_di, exp_model, har_model, hyper_model, df_oil = ccf.process_data(
+        df, None, start_date, end_date, 0, 0, 'CORR_OIL_RATE_STBD', 'oil', engine=engine)
+    if df_oil.empty:
+        return []
+
+    last_rate = df[df['CORR_OIL_RATE_STBD'] != 0]['CORR_OIL_RATE_STBD'].iloc[-1] + rate_intervention
+    if 'OIL_CUMULATIVE_PRODUCTION' in df.columns:
+        cumulative_production = df['OIL_CUMULATIVE_PRODUCTION'].iloc[-1]
+    else:
+        cumulative_production = cumulative(df['DATE_STAMP'], df['CORR_OIL_RATE_STBD'])[-1]
+
+    if forecast_start is None:
+        forecast_start = end_date + pd.offsets.MonthBegin(1)
+    forecast_start = pd.to_datetime(forecast_start).replace(day=1)
+
+    decline_rates = {'Exponential': exp_di, 'Harmonic': har_di, 'Hyperbolic': hyper_di}
+    exponents = [best_b if b is None else b for _, b in MODELS]
+    # The least_squares engine fits qi too, so it is not the first rate
+    model_lines = {'Exponential': exp_model, 'Harmonic': har_model, 'Hyperbolic': hyper_model}
+    fitted_qi = [ccf.model_qi(model_lines[model], df_oil['TIME'], decline_rates[model], exponents[i])
+                 for i, (model, _) in enumerate(MODELS)]
+
+    # All models in one solve, on the same monthly grid as the DCA apps
+    EURs, reserves, steps = decline_solver.solve_eur(
+        last_rate, [decline_rates[model] for model, _ in MODELS], exponents, limit_value,
+        cumulative_production, horizon=months, month_grid=True)
+    forecast_dates = pd.date_range(forecast_start, periods=months + 1, freq='MS')
+
+    rows = []
+    for i, (model, _) in enumerate(MODELS):
+        cut_off_date = decline_solver.cut_off_date(forecast_dates, steps[i])
+        rows.append({
+            "Well Name": well_name,
+            "Model": model,
+            "Start Date": start_date.strftime('%d-%m-%Y'),
+            "End Date": end_date.strftime('%d-%m-%Y'),
+            "Start Forecast Date": forecast_start.strftime('%d-%m-%Y'),
+            "qi": last_rate,
+            "Fit qi": fitted_qi[i],
+            "Di": decline_rates[model],
+            "b": exponents[i],
+            "Cum Prod": cumulative_production,
+            "EUR": EURs[i],
+            "Reserves": reserves[i],
+            "Cut Off Date": cut_off_date.strftime('%d-%m-%Y') if cut_off_date is not None else "N/A",
+        })
+
+        if samples > 0:
+            results = probabilistic_reserves.simulate_reserves(
+                df_oil['TIME'], df_oil['CORR_OIL_RATE_STBD'], fitted_qi[i],
+                decline_rates[model], exponents[i], last_rate, limit_value, cumulative_production,
+                forecast_dates, n_samples=samples, seed=0)
+            for case, result in results.items():
+                rows[-1][f"EUR {case}"] = result['EUR']
+                rows[-1][f"Cut Off Date {case}"] = result['cut_off_date'].strftime('%d-%m-%Y') if result['cut_off_date'] is not None else "N/A"
+    return rows
+
+
+def run_batch(excel_file, output_file, workers=None, **forecast_options):
+    """Fit every sheet of a workbook in a process pool and write the reserves table"""
+    sheet_names = workbook_store.sheet_names(excel_file)
+    rows = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fit_well, excel_file, well, **forecast_options): well for well in sheet_names}
+        for future in as_completed(futures):
+            try:
+                rows.extend(future.result())
+            except Exception as e:
+                print(f"Error fitting well {futures[future]}: {str(e)}")
+
+    columns = RESERVES_COLUMNS + (PROBABILISTIC_COLUMNS if forecast_options.get('samples') else [])
+    table = pd.DataFrame(rows, columns=columns)
+    table['Well Name'] = pd.Categorical(table['Well Name'], categories=sheet_names, ordered=True)
+    table = table.sort_values(['Well Name', 'Model']).reset_index(drop=True)
+
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    if output_file.lower().endswith('.xlsx'):
+        table.to_excel(output_file, index=False)
+    else:
+        table.to_csv(output_file, index=False, encoding='utf-8')
+    return table
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fit decline curves for every well in a workbook')
+    parser.add_argument('workbook', nargs='?', default='./Data/data_resampling_cumProd.xlsx')
+    parser.add_argument('-o', '--output', default='./Data/reserves_table.csv', help='.csv or .xlsx')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Processes (default: all cores)')
+    parser.add_argument('--forecast-start', default=None, help='First forecast month (default: month after last data)')
+    parser.add_argument('--months', type=int, default=120, help='Forecast months')
+    parser.add_argument('--limit', type=float, default=0.0, help='Rate limit value (bopd)')
+    parser.add_argument('--intervention', type=float, default=0, help='Rate intervention (bopd)')
+    parser.add_argument('--engine', choices=['closed_form', 'least_squares'], default='closed_form',
+                        help='Decline fitting engine')
+    parser.add_argument('--samples', type=int, default=0,
+                        help='Monte Carlo samples per model for P90/P50/P10 columns (default: off)')
+    args = parser.parse_args()
+
+    table = run_batch(args.workbook, args.output, workers=args.workers,
+                      forecast_start=args.forecast_start, months=args.months,
+                      limit_value=args.limit, rate_intervention=args.intervention,
+                      engine=args.engine, samples=args.samples)
+    print(f"{table['Well Name'].nunique()} wells written to {args.output}")
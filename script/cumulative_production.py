@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import data_cache
+
+# Upper bound for the cumulative series kept in memory (bytes)
+MAX_CUMULATIVE_CACHE_BYTES = 64 * 1024 * 1024
+
+METHODS = ('daily', 'days_between', 'trapezoid')
+
+_cumulative_cache = data_cache.LRUCache(MAX_CUMULATIVE_CACHE_BYTES, sizeof=lambda values: values.nbytes)
+
+
+def days_between(dates):
+    """Whole days between consecutive dates"""
+    dates = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+    return np.diff(dates).astype('timedelta64[D]').astype(float)
+
+
+def cumulative(dates, rates, method='daily'):
+    """
+    Cumulative production at every sample, starting from 0 at the first one
+
+    Args:
+        dates: Sample dates
+        rates: Rate per day at each sample
+        method: 'daily' adds the previous sample's rate once per sample (daily
+            data), 'days_between' multiplies it by the days since the previous
+            sample (e.g. monthly data), 'trapezoid' integrates the average of
+            both samples over the days between them
+    """
+    rates = np.asarray(rates, dtype=float)
+    if len(rates) == 0:
+        return np.zeros(0)
+
+    if method == 'daily':
+        increments = rates[:-1]
+    elif method == 'days_between':
+        increments = days_between(dates) * rates[:-1]
+    elif method == 'trapezoid':
+        increments = days_between(dates) * (rates[:-1] + rates[1:]) / 2
+    else:
+        raise ValueError(f"Unknown cumulative method: {method}")
+
+    return np.concatenate(([0.0], np.cumsum(increments)))
+
+
+def well_cumulative(excel_file, well_name, start_date, end_date, method='daily', rate_column='CORR_OIL_RATE_STBD'):
+    """
+    Cumulative production of one well between two dates (inclusive)
+
+    Cached per workbook version, well, date range and method, so moving other
+    controls does not recompute it.
+    """
+    path, mtime = data_cache.file_version(excel_file)
+    key = (path, mtime, well_name, pd.Timestamp(start_date), pd.Timestamp(end_date), method, rate_column)
+
+    values = _cumulative_cache.get(key)
+    if values is None:
+        df = data_cache.read_well_sheet(excel_file, well_name)
+        mask = (df['DATE_STAMP'] >= start_date) & (df['DATE_STAMP'] <= end_date)
+        values = cumulative(df.loc[mask, 'DATE_STAMP'], df.loc[mask, rate_column], method)
+        _cumulative_cache.put(key, values)
+
+    return values.copy()
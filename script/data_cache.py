@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+import workbook_store
+
+# Upper bound for the parsed well sheets kept in memory (bytes)
+MAX_SHEET_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by total size
+
+    Args:
+        max_bytes: Evict the oldest entries once the summed size exceeds this
+        sizeof: Function returning the size of a cached value in bytes
+        ttl: Seconds an entry stays valid after it is stored, None for no limit
+    """
+    def __init__(self, max_bytes, sizeof=sys.getsizeof, ttl=None):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            value, size, expires = self._items[key]
+            if expires is not None and time.monotonic() > expires:
+                del self._items[key]
+                self._total -= size
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._items:
+                self._total -= self._items.pop(key)[1]
+            self._items[key] = (value, size, expires)
+            self._total += size
+            # Always keep the newest entry, even if it alone exceeds the budget
+            while self._total > self.max_bytes and len(self._items) > 1:
+                _, (_, old_size, _) = self._items.popitem(last=False)
+                self._total -= old_size
+
+    def discard(self, predicate):
+        """Drop every entry whose key matches predicate(key)"""
+        with self._lock:
+            for key in [key for key in self._items if predicate(key)]:
+                self._total -= self._items.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._total = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+_sheet_cache = LRUCache(MAX_SHEET_CACHE_BYTES, sizeof=frame_nbytes)
+_shared_sheet_cache = LRUCache(MAX_SHEET_CACHE_BYTES, sizeof=frame_nbytes)
+
+
+def file_version(excel_file):
+    """Key identifying the current content of a workbook on disk"""
+    path = os.path.abspath(excel_file)
+    return path, os.stat(path).st_mtime_ns
+
+
+def read_well_sheet(excel_file, sheet_name):
+    """
+    Read one well sheet with DATE_STAMP parsed and a TIME index column added
+
+    Parsed sheets are kept in memory keyed by (file path, mtime, sheet), so
+    repeated callbacks on the same well do not go back to the workbook store.
+    The cached frame maps the columnar copy on disk, so worker processes
+    share it; a copy is returned because callers add columns to the frame.
+    """
+    path, mtime = file_version(excel_file)
+    key = (path, mtime, sheet_name)
+
+    df = _sheet_cache.get(key)
+    if df is None:
+        df = workbook_store.read_sheet(path, sheet_name, workbook_store.WELL_DATE_FORMATS, shared=True)
+        df['TIME'] = range(len(df))
+        _sheet_cache.put(key, df)
+
+    return df.copy()
+
+
+def read_sheet(excel_file, sheet_name):
+    """
+    One sheet of a workbook, shared by every page of the process
+
+    Unlike read_well_sheet the cached frame itself is returned, so pages
+    reading the same sheet hold one copy. Its columns map the columnar copy
+    on disk, shared by every worker process too; callers must not modify it.
+    """
+    path, mtime = file_version(excel_file)
+    key = (path, mtime, sheet_name)
+
+    df = _shared_sheet_cache.get(key)
+    if df is None:
+        df = workbook_store.read_sheet(path, sheet_name, workbook_store.date_formats_for(path), shared=True)
+        _shared_sheet_cache.put(key, df)
+
+    return df
+
+
+def read_csv(csv_file, date_columns=()):
+    """
+    A CSV file with its date columns parsed, shared like read_sheet
+
+    Re-read once the file changes on disk. Its columns map the columnar copy
+    next to the file, like read_sheet; callers must not modify it.
+    """
+    path, mtime = file_version(csv_file)
+    key = (path, mtime, None)
+
+    df = _shared_sheet_cache.get(key)
+    if df is None:
+        df = workbook_store.read_csv(path, date_columns, shared=True)
+        _shared_sheet_cache.put(key, df)
+
+    return df
+
+
+def invalidate(excel_file=None):
+    """Forget cached sheets of one workbook, or of every workbook if None"""
+    if excel_file is None:
+        _sheet_cache.clear()
+        _shared_sheet_cache.clear()
+        return
+    path = os.path.abspath(excel_file)
+    _sheet_cache.discard(lambda key: key[0] == path)
+    _shared_sheet_cache.discard(lambda key: key[0] == path)
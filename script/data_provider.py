@@ -0,0 +1,42 @@
+import data_cache
+import well_catalog
+
+# Datasets of the apps. Importing a page reads nothing: each dataset is
+# loaded on its first use and kept in data_cache, so every module of the
+# process shares one copy, read again only once the file changes on disk.
+
+HISTORICAL_WORKBOOK = './Data/show_historicalData.xlsx'
+ML_DATASET = './Data/data_ml.csv'
+FILTER_DATASET = './Data/dataset_toFilter.csv'
+INTERVENTION_WORKBOOK = './Data/Well Intervention Jobs Example.xlsx'
+INTERVENTION_COLUMNS = ['Well', 'Job', 'Job Code', 'DCA POP Date', 'Reserves', 'Gas Rate', 'Oil Rate']
+
+
+def historical(sheet_name):
+    """One sheet of the historical workbook"""
+    return data_cache.read_sheet(HISTORICAL_WORKBOOK, sheet_name)
+
+
+def historical_index(sheet_name):
+    """WellIndex of one sheet of the historical workbook"""
+    return well_catalog.sheet_index(HISTORICAL_WORKBOOK, sheet_name)
+
+
+def historical_wells():
+    """Well names (Universal) of the historical workbook, sorted"""
+    return sorted(historical_index("monthly_rate_per_day_combined").names)
+
+
+def ml_data():
+    """Training data of the ML page"""
+    return data_cache.read_csv(ML_DATASET, date_columns=['DATE'])
+
+
+def filter_data():
+    """Dataset of the data filter page"""
+    return data_cache.read_csv(FILTER_DATASET, date_columns=['DATE'])
+
+
+def interventions():
+    """Intervention jobs, from the first sheet of the intervention workbook"""
+    return data_cache.read_sheet(INTERVENTION_WORKBOOK, 0)[INTERVENTION_COLUMNS]
@@ -0,0 +1,125 @@
+import pandas as pd
+import curve_cum_function as ccf
+import cumulative_production
+import data_cache
+import decline_bands
+from well_catalog import object_tree
+import platform_aggregate
+import workbook_store
+
+# Data access of the consolidated DCA app. A well is one sheet of the well
+# workbook, named <field>-<platform>-<well>; a platform or a field is the
+# oil rate summed over its wells. Every mode reads through data_cache, so
+# one process and one cache serve wells, platforms and fields.
+
+MODES = ('well', 'platform', 'field')
+RATE_COLUMN = 'CORR_OIL_RATE_STBD'
+
+_aggregate_fit_cache = data_cache.LRUCache(ccf.MAX_FIT_CACHE_BYTES, sizeof=lambda fit: data_cache.frame_nbytes(fit[-1]),
+                                           ttl=ccf.FIT_CACHE_TTL)
+_aggregate_band_cache = data_cache.LRUCache(decline_bands.MAX_BAND_CACHE_BYTES,
+                                            sizeof=lambda bands: sum(lower.nbytes + upper.nbytes for lower, upper in bands.values()),
+                                            ttl=ccf.FIT_CACHE_TTL)
+
+
+def objects(excel_file, mode):
+    """Names that can be selected in a mode: well sheets, platforms or fields"""
+    tree = object_tree(workbook_store.sheet_names(excel_file))
+    if mode == 'well':
+        return [well for platforms in tree.values() for wells in platforms.values() for well in wells]
+    if mode == 'platform':
+        return sorted({platform for platforms in tree.values() for platform in platforms})
+    if mode == 'field':
+        return list(tree)
+    raise ValueError(f"Unknown DCA mode: {mode}")
+
+
+def wells_of(excel_file, mode, name):
+    """Well sheets making up a well, platform or field"""
+    if mode == 'well':
+        return [name]
+    tree = object_tree(workbook_store.sheet_names(excel_file))
+    if mode == 'platform':
+        return [well for platforms in tree.values() for well in platforms.get(name, [])]
+    if mode == 'field':
+        return [well for wells in tree.get(name, {}).values() for well in wells]
+    raise ValueError(f"Unknown DCA mode: {mode}")
+
+
+def rate_data(excel_file, mode, name):
+    """
+    Rate history of a well, platform or field
+
+    Returns:
+        DataFrame with DATE_STAMP, CORR_OIL_RATE_STBD and a TIME index, one
+        row per date
+    """
+    if mode == 'well':
+        return data_cache.read_well_sheet(excel_file, name)
+    wells = wells_of(excel_file, mode, name)
+    if not wells:
+        return pd.DataFrame(columns=platform_aggregate.AGGREGATE_COLUMNS)
+    return platform_aggregate.platform_data(excel_file, wells, name=(mode, name))
+
+
+def cumulative(excel_file, mode, name, start_date, end_date):
+    """Cumulative production of a well, platform or field between two dates (inclusive)"""
+    if mode == 'well':
+        return cumulative_production.well_cumulative(excel_file, name, start_date, end_date)
+    df = rate_data(excel_file, mode, name)
+    mask = (df['DATE_STAMP'] >= start_date) & (df['DATE_STAMP'] <= end_date)
+    return cumulative_production.cumulative(df.loc[mask, 'DATE_STAMP'], df.loc[mask, RATE_COLUMN])
+
+
+def _aggregate_key(excel_file, mode, name, initial_date, final_date, qi_change, di_change, engine, decline_exponents, refine_models):
+    path, mtime = data_cache.file_version(excel_file)
+    return (path, mtime, mode, name, pd.Timestamp(initial_date), pd.Timestamp(final_date), qi_change, di_change,
+            engine, None if decline_exponents is None else tuple(decline_exponents), tuple(refine_models))
+
+
+def fit(excel_file, mode, name, initial_date, final_date, qi_change=0, di_change=0,
+        engine='closed_form', decline_exponents=None, refine_models=ccf.ARPS_MODELS):
+    """
+    process_data on a well, platform or field, memoized like process_data_cached
+
+    Returns:
+        Same tuple as ccf.process_data
+    """
+    if mode == 'well':
+        return ccf.process_data_cached(excel_file, name, initial_date, final_date, qi_change, di_change, RATE_COLUMN, 'oil',
+                                       engine, decline_exponents, refine_models)
+
+    key = _aggregate_key(excel_file, mode, name, initial_date, final_date, qi_change, di_change, engine, decline_exponents, refine_models)
+    result = _aggregate_fit_cache.get(key)
+    if result is None:
+        result = ccf.process_data(rate_data(excel_file, mode, name), None, initial_date, final_date, qi_change, di_change, RATE_COLUMN, 'oil',
+                                  decline_exponents, engine, refine_models)
+        _aggregate_fit_cache.put(key, result)
+    return result[:-1] + (result[-1].copy(),)
+
+
+def bands(excel_file, mode, name, initial_date, final_date, qi_change=0, di_change=0,
+          engine='closed_form', decline_exponents=None, refine_models=ccf.ARPS_MODELS):
+    """
+    Bootstrap bands of the fit of a well, platform or field, memoized like
+    decline_bands.bootstrap_bands_cached
+
+    Returns:
+        The bands and the fit window dates they are drawn along
+    """
+    if mode == 'well':
+        return decline_bands.bootstrap_bands_cached(excel_file, name, initial_date, final_date, qi_change, di_change, RATE_COLUMN, 'oil',
+                                                    engine, decline_exponents, refine_models)
+
+    best_b, _, _, _, exp_model, har_model, hyper_model, df_fit = fit(excel_file, mode, name, initial_date, final_date, qi_change, di_change,
+                                                                     engine, decline_exponents, refine_models)
+    if df_fit.empty:
+        return {}, df_fit['DATE_STAMP']
+
+    key = _aggregate_key(excel_file, mode, name, initial_date, final_date, qi_change, di_change, engine, decline_exponents, refine_models)
+    result = _aggregate_band_cache.get(key)
+    if result is None:
+        models = {'Exponential': exp_model, 'Harmonic': har_model, 'Hyperbolic': hyper_model}
+        result = decline_bands.bootstrap_bands(df_fit['TIME'], df_fit[RATE_COLUMN], best_b, qi_change, di_change, models=models)
+        _aggregate_band_cache.put(key, result)
+    return result, df_fit['DATE_STAMP']
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import curve_cum_function as ccf
+import data_cache
+import downsample
+
+# Residual bootstrap of the closed-form fits in process_data: every resample
+# of the fit window is refitted at once with matrix sums over the resamples,
+# and the band is the spread of the refitted model curves around the model
+# line shown, whichever engine fitted it.
+
+BOOTSTRAP_RESAMPLES = 200
+BAND_PERCENTILES = (5, 95)
+
+MAX_BAND_CACHE_BYTES = 64 * 1024 * 1024
+
+_band_cache = data_cache.LRUCache(MAX_BAND_CACHE_BYTES, sizeof=lambda bands: sum(lower.nbytes + upper.nbytes for lower, upper in bands.values()),
+                                  ttl=ccf.FIT_CACHE_TTL)
+
+
+def batched_models(series_time, rates, b, qi_change=0, di_change=0):
+    """
+    Closed-form exponential, harmonic and hyperbolic fits of process_data for
+    every row of rates at once
+
+    Args:
+        series_time: TIME of the fit window
+        rates: Rate samples, one series per row
+        b: Hyperbolic exponent, kept fixed across the rows
+        qi_change, di_change: Same adjustments as process_data
+
+    Returns:
+        Dict of model name to its fitted curves, one row per series
+    """
+    t = np.asarray(series_time, dtype=float)
+    rates = np.atleast_2d(np.asarray(rates, dtype=float))
+    initial_rate, final_rate = rates[:, :1], rates[:, -1:]
+    di_change /= 1000000
+    t2 = np.sum(t**2)
+
+    exp_di = di_change + np.log(initial_rate / rates) @ t / t2
+    har_di = di_change + ((initial_rate / rates) @ t - np.sum(t)) / t2
+    b_hyper = 0.9999 if b == 1 else 0.0001 if b == 0 else b
+    hyper_di = di_change + (((initial_rate[:, 0] / final_rate[:, 0])**b_hyper) - 1) / (b_hyper * t[-1])
+
+    qi = initial_rate + qi_change
+    return {
+        'Exponential': ccf.exponential_rate(qi, exp_di[:, None], t),
+        'Harmonic': ccf.harmonic_rate(qi, har_di[:, None], t),
+        'Hyperbolic': ccf.hyperbolic_rate(qi, hyper_di[:, None], b, t),
+    }
+
+
+def bootstrap_bands(series_time, observed, b, qi_change=0, di_change=0, n_resamples=BOOTSTRAP_RESAMPLES,
+                    percentiles=BAND_PERCENTILES, seed=0, models=None):
+    """
+    Confidence band of each fitted model by residual bootstrap
+
+    The residuals of each model are resampled onto its fitted curve and all
+    resamples are refitted in one batch. b stays at the fitted value and the
+    band is corrected for the bootstrap bias of the fit.
+
+    Args:
+        models: Model lines to centre the bands on, by model name, e.g. those
+            of a least-squares fit; defaults to the closed-form fits
+
+    Returns:
+        Dict of model name to (lower, upper) arrays along the fit window
+    """
+    observed = np.asarray(observed, dtype=float)
+    fitted = {model: curve[0] for model, curve in batched_models(series_time, observed, b, qi_change, di_change).items()}
+    if models is not None:
+        fitted.update({model: np.asarray(curve, dtype=float) for model, curve in models.items()})
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(observed), size=(n_resamples, len(observed)))
+
+    bands = {}
+    for model, curve in fitted.items():
+        residuals = observed - curve
+        residuals -= residuals.mean()
+        # The log fits need positive rates
+        resampled = np.maximum(curve + residuals[picks], observed.min())
+        curves = batched_models(series_time, resampled, b, qi_change, di_change)[model]
+        # The closed-form fits are biased on noisy data, keep the band around the shown model
+        bias = curves.mean(axis=0) - curve
+        lower, upper = np.percentile(curves, percentiles, axis=0) - bias
+        bands[model] = (lower, upper)
+    return bands
+
+
+def bootstrap_bands_cached(excel_file, sheet_name, initial_date, final_date, qi_change, di_change, rate_column, rate_type,
+                           engine='closed_form', decline_exponents=None, refine_models=ccf.ARPS_MODELS):
+    """
+    bootstrap_bands of the process_data_cached fit, memoized per workbook
+    version, well, date window, qi/Di adjustment and fit settings
+
+    engine, decline_exponents and refine_models are those of the model lines
+    the bands are drawn with, so the bands share their fit and best b.
+
+    Returns:
+        The bands and the fit window dates they are drawn along
+    """
+    path, mtime = data_cache.file_version(excel_file)
+    key = (path, mtime, sheet_name, pd.Timestamp(initial_date), pd.Timestamp(final_date),
+           qi_change, di_change, rate_column, rate_type, engine,
+           None if decline_exponents is None else tuple(decline_exponents), tuple(refine_models))
+
+    best_b, _, _, _, exp_model, har_model, hyper_model, df_filtered = ccf.process_data_cached(
+        excel_file, sheet_name, initial_date, final_date, qi_change, di_change, rate_column, rate_type,
+        engine, decline_exponents, refine_models)
+    if df_filtered.empty:
+        return {}, df_filtered['DATE_STAMP']
+
+    bands = _band_cache.get(key)
+    if bands is None:
+        models = {'Exponential': exp_model, 'Harmonic': har_model, 'Hyperbolic': hyper_model}
+        bands = bootstrap_bands(df_filtered['TIME'], df_filtered[rate_column], best_b, qi_change, di_change, models=models)
+        _band_cache.put(key, bands)
+
+    return bands, df_filtered['DATE_STAMP']
+
+
+def band_traces(bands, dates, x_range=None, colors=None):
+    """Filled Plotly traces of the bands, one per model, thinned to the x_range view"""
+    colors = colors or {'Exponential': 'blue', 'Hyperbolic': 'green', 'Harmonic': 'orange'}
+    dates = np.asarray(dates)
+    traces = []
+    for model, (lower, upper) in bands.items():
+        index = np.union1d(downsample.indices(dates, lower, x_range, downsample.CURVE_POINTS),
+                           downsample.indices(dates, upper, x_range, downsample.CURVE_POINTS))
+        x, lower, upper = dates[index], lower[index], upper[index]
+        traces.append(go.Scatter(
+            x=np.concatenate([x, x[::-1]]), y=np.concatenate([upper, lower[::-1]]),
+            fill='toself', mode='lines', line=dict(width=0), fillcolor=colors[model], opacity=0.2,
+            hoverinfo='skip', name=f'{model} Model {BAND_PERCENTILES[1] - BAND_PERCENTILES[0]}% band'))
+    return traces
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# Closed-form Arps rate, cumulative, time to the economic limit and EUR.
+# Every function broadcasts over arrays of qi, Di, b and limits, so many wells
+# or scenarios are solved in one call. b == 0 is exponential, b == 1 harmonic
+# and any other b hyperbolic, as in the DCA apps. Time is in forecast steps
+# (months in the apps) and Di per step.
+
+
+def _arrays(*values):
+    return np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in values))
+
+
+def _result(values):
+    # Plain numpy scalars for scalar input, so results format like floats
+    return values[()] if values.ndim == 0 else values
+
+
+def rate_at(qi, di, b, t):
+    """Rate after t steps"""
+    qi, di, b, t = _arrays(qi, di, b, t)
+    exponential, harmonic = b == 0, b == 1
+    b_hyper = np.where(exponential | harmonic, 0.5, b)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        rate = np.where(exponential, qi * np.exp(-di * t),
+               np.where(harmonic, qi / (1 + di * t),
+                        qi / (1 + b_hyper * di * t)**(1 / b_hyper)))
+    return _result(rate)
+
+
+def cumulative_at(qi, di, b, t):
+    """Production from the start of the forecast until t steps, t may be inf"""
+    qi, di, b, t = _arrays(qi, di, b, t)
+    exponential, harmonic = b == 0, b == 1
+    b_hyper = np.where(exponential | harmonic, 0.5, b)
+    di_safe = np.where(di != 0, di, 1.0)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        rate = rate_at(qi, di_safe, b, t)
+        cumulative = np.where(exponential, (qi - rate) / di_safe,
+                     np.where(harmonic, qi / di_safe * np.log1p(di_safe * t),
+                              qi / (di_safe * (1 - b_hyper)) * (1 - (rate / qi)**(1 - b_hyper))))
+        # No decline: the rate stays at qi; a negative Di is a rising rate,
+        # integrated along the same Arps curve
+        cumulative = np.where(di != 0, cumulative, qi * t)
+        cumulative = np.where(t > 0, cumulative, 0.0)
+    return _result(cumulative)
+
+
+def time_to_limit(qi, di, b, limit_rate):
+    """
+    Steps until the rate falls to limit_rate
+
+    0 when qi is already at or below the limit, inf when the rate never
+    reaches it (limit <= 0, no decline or a rising rate, Di < 0).
+    """
+    qi, di, b, limit_rate = _arrays(qi, di, b, limit_rate)
+    exponential, harmonic = b == 0, b == 1
+    b_hyper = np.where(exponential | harmonic, 0.5, b)
+
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        ratio = np.where(limit_rate > 0, qi / limit_rate, np.inf)
+        steps = np.where(exponential, np.log(ratio) / di,
+                np.where(harmonic, (ratio - 1) / di,
+                         (ratio**b_hyper - 1) / (b_hyper * di)))
+        steps = np.where((di > 0) | (ratio <= 1), steps, np.inf)
+        steps = np.where(ratio <= 1, 0.0, steps)
+    return _result(steps)
+
+
+def solve_eur(qi, di, b, limit_rate, cumulative_production=0.0, horizon=None, month_grid=False):
+    """
+    EUR and reserves at the economic limit
+
+    Args:
+        qi, di, b: Forecast model, scalars or arrays
+        limit_rate: Economic rate limit
+        cumulative_production: Production to date, added to the EUR
+        horizon: Optional last forecast step; production stops there if the
+            limit is reached later
+        month_grid: Stop at the last whole step still at or above the limit,
+            matching a monthly forecast table
+
+    Returns:
+        EUR, reserves and the (unsnapped) steps to the limit
+    """
+    steps = time_to_limit(qi, di, b, limit_rate)
+    end = steps if horizon is None else np.minimum(steps, horizon)
+    if month_grid:
+        end = np.floor(end)
+
+    reserves = cumulative_at(qi, di, b, end)
+    return _result(np.asarray(cumulative_production + reserves)), reserves, steps
+
+
+def cut_off_date(forecast_dates, steps):
+    """First forecast date at or below the limit, or None within the forecast dates"""
+    if not np.isfinite(steps):
+        return None
+    forecast_dates = pd.DatetimeIndex(forecast_dates)
+    index = int(np.ceil(steps))
+    return forecast_dates[index] if index < len(forecast_dates) else None
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import data_cache
+
+# Points kept per trace, about two per horizontal pixel of the DCA plots.
+# Each bucket keeps its minimum and maximum, so spikes and shut-ins stay
+# visible, and zooming in thins only the points inside the view.
+MAX_POINTS = 1500
+
+# Fitted model curves and bands are smooth and need far fewer points
+CURVE_POINTS = 300
+
+MAX_INDEX_CACHE_BYTES = 32 * 1024 * 1024
+
+_index_cache = data_cache.LRUCache(MAX_INDEX_CACHE_BYTES, sizeof=lambda index: index.nbytes)
+
+
+def minmax_indices(values, n_out=MAX_POINTS):
+    """Sorted positions of the min and max of each of n_out/2 equal buckets, plus both ends"""
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= n_out:
+        return np.arange(n)
+
+    n_buckets = max(n_out // 2, 1)
+    size = -(-n // n_buckets)
+    buckets = np.full(n_buckets * size, np.nan)
+    buckets[:n] = values
+    buckets = buckets.reshape(n_buckets, size)
+    missing = np.isnan(buckets)
+
+    offsets = np.arange(n_buckets) * size
+    lowest = np.argmin(np.where(missing, np.inf, buckets), axis=1) + offsets
+    highest = np.argmax(np.where(missing, -np.inf, buckets), axis=1) + offsets
+    return np.unique(np.concatenate(([0, n - 1], np.minimum(lowest, n - 1), np.minimum(highest, n - 1))))
+
+
+def window(dates, x_range=None):
+    """Slice of the sorted dates inside x_range, with one point either side so lines reach the edges"""
+    if x_range is None:
+        return slice(0, len(dates))
+    dates = np.asarray(pd.to_datetime(dates), dtype='datetime64[ns]')
+    start = np.searchsorted(dates, np.datetime64(pd.Timestamp(x_range[0]), 'ns'), side='left')
+    stop = np.searchsorted(dates, np.datetime64(pd.Timestamp(x_range[1]), 'ns'), side='right')
+    return slice(max(start - 1, 0), min(stop + 1, len(dates)))
+
+
+def indices(dates, values, x_range=None, n_out=MAX_POINTS):
+    """Positions to plot of a series sorted by date"""
+    view = window(dates, x_range)
+    return view.start + minmax_indices(np.asarray(values, dtype=float)[view], n_out)
+
+
+def thin(dates, values, x_range=None, n_out=MAX_POINTS):
+    """Dates and values to plot, as arrays"""
+    dates, values = np.asarray(dates), np.asarray(values)
+    index = indices(dates, values, x_range, n_out)
+    return dates[index], values[index]
+
+
+def well_indices(excel_file, well_name, column, x_range=None, n_out=MAX_POINTS):
+    """
+    indices of a well sheet column, cached per workbook version, well, column
+    and view, so redrawing the same view does not thin the history again
+    """
+    path, mtime = data_cache.file_version(excel_file)
+    x_range = None if x_range is None else (pd.Timestamp(x_range[0]), pd.Timestamp(x_range[1]))
+    key = (path, mtime, well_name, column, x_range, n_out)
+
+    index = _index_cache.get(key)
+    if index is None:
+        df = data_cache.read_well_sheet(excel_file, well_name)
+        index = indices(df['DATE_STAMP'], df[column], x_range, n_out)
+        _index_cache.put(key, index)
+    return index
+
+
+def relayout_range(relayout_data):
+    """
+    x-axis range of a dcc.Graph relayoutData event
+
+    Returns the (start, end) of a zoom or pan, 'autorange' when the view is
+    reset, and None when the event does not touch the x-axis.
+    """
+    if not relayout_data:
+        return None
+    if relayout_data.get('xaxis.autorange'):
+        return 'autorange'
+    if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'][:2])
+    return None
+
@@ -0,0 +1,37 @@
+from dash import Patch
+
+# Partial figure updates for the DCA and history pages. The pages add their
+# traces in a fixed order, so a trace keeps its index across redraws of the
+# same well and only the traces that changed are sent to the browser.
+
+
+def triggered_ids(callback_context):
+    """Ids of the components that triggered the current callback"""
+    return {trigger['prop_id'].split('.')[0] for trigger in callback_context.triggered}
+
+
+def trace_patch(figure, indices, shared_props=('hovertemplate',)):
+    """
+    Patch replacing the traces at indices with those of figure
+
+    shared_props are copied onto the other traces as well, for properties
+    like the hover template that every trace gets from the same inputs.
+    """
+    patch = Patch()
+    for i, trace in enumerate(figure.data):
+        if i in indices:
+            patch['data'][i] = trace.to_plotly_json()
+        else:
+            for prop in shared_props:
+                patch['data'][i][prop] = trace[prop]
+    return patch
+
+
+def legend_patch(show_legend, path=('layout', 'showlegend')):
+    """Patch switching the legend on or off without resending the figure"""
+    patch = Patch()
+    target = patch
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = show_legend
+    return patch
@@ -0,0 +1,313 @@
+import os
+import json
+import time
+import uuid
+import signal
+import sqlite3
+import threading
+import traceback
+import subprocess
+import multiprocessing
+from contextlib import closing
+
+# Job table shared by every server process, so a poll or a cancel works
+# whichever worker process receives it
+JOBS_DB = os.path.join('export', 'ml_jobs.sqlite')
+
+# Finished jobs kept in the job table for status and result lookups
+MAX_FINISHED_JOBS = 50
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+PUBLIC_FIELDS = ('id', 'status', 'progress', 'message', 'result', 'error', 'submitted', 'started', 'finished')
+
+
+# Columns added after the first version of the table
+ADDED_COLUMNS = {'pid_started': 'INTEGER', 'owner_started': 'INTEGER'}
+
+
+def _connect(db_path):
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS jobs ('
+        'id TEXT PRIMARY KEY, status TEXT, progress REAL, message TEXT, result TEXT, error TEXT, '
+        'submitted REAL, started REAL, finished REAL, pid INTEGER, owner INTEGER, '
+        'pid_started INTEGER, owner_started INTEGER)'
+    )
+    columns = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+    for name, column_type in ADDED_COLUMNS.items():
+        if name not in columns:
+            conn.execute(f'ALTER TABLE jobs ADD COLUMN {name} {column_type}')
+    return conn
+
+
+def _update(conn, job_id, statuses, **fields):
+    """Set fields of a job still in one of statuses; returns False if it was not"""
+    assignments = ', '.join(f'{key} = ?' for key in fields)
+    placeholders = ', '.join('?' for _ in statuses)
+    cursor = conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ? AND status IN ({placeholders})',
+                          (*fields.values(), job_id, *statuses))
+    return cursor.rowcount == 1
+
+
+def _windows_process_start(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+    if not handle:
+        # Access denied still means the process exists
+        return 0 if ctypes.get_last_error() == 5 else None
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)) or exit_code.value != 259:  # STILL_ACTIVE
+            return None
+        times = [wintypes.FILETIME() for _ in range(4)]
+        if not kernel32.GetProcessTimes(handle, *(ctypes.byref(t) for t in times)):
+            return 0
+        return (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _process_start(pid):
+    """
+    Start time of a running process, None if no process with that pid runs
+
+    The value only serves to tell a process from a later one that got the
+    same pid; 0 means the process runs but its start time is unknown.
+    """
+    if os.name == 'nt':
+        return _windows_process_start(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # Field 22, counted after the command name, which may hold spaces
+            return int(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def _is_running(pid, started):
+    """Whether the process recorded with pid and start time still runs"""
+    current = _process_start(pid)
+    if current is None:
+        return False
+    return not started or not current or current == started
+
+
+def _kill_group(pid):
+    """Stop a job process and every process it started"""
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+        return
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        # Not yet in its own group
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
+def _run_job(db_path, job_id, target, args, kwargs):
+    """Entry point of a job process, records progress and the outcome in the job table"""
+    # Own process group, so a cancel also stops the worker processes of the job
+    if hasattr(os, 'setsid'):
+        os.setsid()
+
+    with closing(_connect(db_path)) as conn:
+        def progress(fraction, message):
+            _update(conn, job_id, ('running',), progress=fraction, message=message)
+
+        try:
+            result = target(*args, progress=progress, **kwargs)
+            _update(conn, job_id, ('running',), status='done', result=json.dumps(result, default=str),
+                    progress=1.0, message='Finished', finished=time.time())
+        except Exception as e:
+            traceback.print_exc()
+            _update(conn, job_id, ('running',), status='failed', error=str(e), message='Failed', finished=time.time())
+
+
+class JobRunner:
+    """
+    Runs long jobs in separate processes so the web server stays responsive
+
+    Jobs wait in submission order until one of max_workers slots is free. The
+    target is called as target(*args, progress=callback, **kwargs), where
+    callback(fraction, message) reports progress back to the job table.
+
+    The job table is a SQLite file, so every server process sees every job
+    and the slots are shared between them. A job starts in the process that
+    submitted it, in a process group of its own.
+
+    Args:
+        max_workers: Number of jobs running at the same time
+        db_path: SQLite file of the job table
+    """
+    def __init__(self, max_workers=1, db_path=JOBS_DB):
+        self.max_workers = max_workers
+        self.db_path = db_path
+        # Calls of the queued jobs and processes of the running jobs of this process
+        self._calls = {}
+        self._processes = {}
+        self._lock = threading.Lock()
+        self._monitor = None
+
+    def submit(self, target, *args, **kwargs):
+        """Queue a job and return its id"""
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            with closing(_connect(self.db_path)) as conn:
+                conn.execute('INSERT INTO jobs (id, status, progress, message, submitted, owner, owner_started) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (job_id, 'queued', 0.0, 'Waiting for a free worker', time.time(), os.getpid(),
+                              _process_start(os.getpid())))
+            self._calls[job_id] = (target, args, kwargs)
+            self._refresh()
+            self._ensure_monitor()
+        return job_id
+
+    def status(self, job_id):
+        """Public fields of one job, or None if it is unknown"""
+        with self._lock:
+            self._refresh()
+            with closing(_connect(self.db_path)) as conn:
+                row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            return _public(row) if row else None
+
+    def jobs(self):
+        """Public fields of every job in the table, oldest first"""
+        with self._lock:
+            self._refresh()
+            with closing(_connect(self.db_path)) as conn:
+                return [_public(row) for row in conn.execute('SELECT * FROM jobs ORDER BY submitted')]
+
+    def result(self, job_id):
+        job = self.status(job_id)
+        return job['result'] if job and job['status'] == 'done' else None
+
+    def cancel(self, job_id):
+        """Stop a queued or running job; returns False if it already finished"""
+        with self._lock:
+            with closing(_connect(self.db_path)) as conn:
+                if not _update(conn, job_id, ACTIVE_STATUSES, status='cancelled', message='Cancelled', finished=time.time()):
+                    return False
+                # Read after the update, so a job started meanwhile is stopped too
+                pid = conn.execute('SELECT pid FROM jobs WHERE id = ?', (job_id,)).fetchone()['pid']
+            self._calls.pop(job_id, None)
+            if pid is not None:
+                _kill_group(pid)
+            process = self._processes.pop(job_id, None)
+            if process is not None:
+                process.join()
+            self._refresh()
+            return True
+
+    def _ensure_monitor(self):
+        if self._monitor is None or not self._monitor.is_alive():
+            self._monitor = threading.Thread(target=self._watch, daemon=True)
+            self._monitor.start()
+
+    def _watch(self):
+        # Keeps jobs moving and the queue draining while no page is polling
+        while True:
+            time.sleep(0.5)
+            with self._lock:
+                self._refresh()
+                if not self._calls and not self._processes:
+                    self._monitor = None
+                    return
+
+    def _refresh(self):
+        """Record stopped jobs and start queued ones, lock held"""
+        now = time.time()
+        with closing(_connect(self.db_path)) as conn:
+            for job_id, process in list(self._processes.items()):
+                if not process.is_alive():
+                    process.join()
+                    del self._processes[job_id]
+                    # A job that finished has already recorded its outcome
+                    _update(conn, job_id, ('running',), status='failed', error=f"Worker exited with code {process.exitcode}",
+                            message='Failed', finished=now)
+
+            # Jobs whose process or server process is gone, e.g. after a crash or
+            # a closed console; they would hold their slot forever
+            for row in conn.execute('SELECT * FROM jobs WHERE status IN (?, ?)', ACTIVE_STATUSES).fetchall():
+                if row['id'] in self._calls or row['id'] in self._processes:
+                    continue
+                if row['pid'] is not None:
+                    if not _is_running(row['pid'], row['pid_started']):
+                        _update(conn, row['id'], ('running',), status='failed', error='Worker exited', message='Failed', finished=now)
+                elif not _is_running(row['owner'], row['owner_started']):
+                    _update(conn, row['id'], ACTIVE_STATUSES, status='failed', error='Server process stopped before the job started',
+                            message='Failed', finished=now)
+
+            claimed = []
+            for job_id in list(self._calls):
+                started = self._claim(conn, job_id)
+                if started is None:
+                    break
+                if started:
+                    claimed.append(job_id)
+
+            conn.execute('DELETE FROM jobs WHERE status NOT IN (?, ?) AND id NOT IN '
+                         '(SELECT id FROM jobs WHERE status NOT IN (?, ?) ORDER BY finished DESC LIMIT ?)',
+                         (*ACTIVE_STATUSES, *ACTIVE_STATUSES, MAX_FINISHED_JOBS))
+
+        # Started with no connection open, SQLite connections must not cross a fork
+        for job_id in claimed:
+            self._start(job_id)
+
+    def _claim(self, conn, job_id):
+        """
+        Mark a queued job of this process as running if a slot is free
+
+        Returns True if claimed, False if it was cancelled meanwhile and None
+        if every slot is taken.
+        """
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            running = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'running'").fetchone()[0]
+            if running >= self.max_workers:
+                return None
+            claimed = _update(conn, job_id, ('queued',), status='running', message='Starting', started=time.time())
+        finally:
+            conn.execute('COMMIT')
+        if not claimed:
+            del self._calls[job_id]
+        return claimed
+
+    def _start(self, job_id):
+        target, args, kwargs = self._calls.pop(job_id)
+        # Not a daemon, so the job may start its own worker processes
+        process = multiprocessing.Process(target=_run_job, args=(self.db_path, job_id, target, args, kwargs))
+        process.start()
+        self._processes[job_id] = process
+        with closing(_connect(self.db_path)) as conn:
+            recorded = _update(conn, job_id, ('running',), pid=process.pid, pid_started=_process_start(process.pid))
+        if not recorded:
+            # Cancelled before its pid was recorded
+            _kill_group(process.pid)
+
+
+def _public(row):
+    job = {key: row[key] for key in PUBLIC_FIELDS}
+    if job['result'] is not None:
+        job['result'] = json.loads(job['result'])
+    return job
+
+
+runner = JobRunner()
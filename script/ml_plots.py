@@ -0,0 +1,202 @@
+import os
+import json
+import shutil
+import hashlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# Bump when the figure code changes so existing PNGs are rendered again
+RENDER_VERSION = 1
+
+MANIFEST_FILE = 'plot_manifest.json'
+
+
+def plot_well_overlay(path, well_name, targets, result, actual, test, mae):
+    fig, axs = plt.subplots(len(targets), 1, figsize=(len(targets) * 3, 10))
+
+    for i, col_name in enumerate(targets):
+        axs[i].plot(actual['DATE'], actual[col_name], label=f'{col_name} (Actual)')
+        axs[i].scatter(test['DATE'], test[col_name], label=f'{col_name} (Well Test)', color='red', s=5, alpha=0.5)
+
+        for mark in result['mark'].unique():
+            subset = result[result['mark'] == mark]
+            axs[i].plot(subset['DATE'], subset[col_name], label=f'{col_name} ({mark})')
+            error = mae[mark][col_name]
+            if mark != 'TRAIN':
+                axs[i].fill_between(subset['DATE'], subset[col_name] - error, subset[col_name] + error, color='orange', alpha=0.1, label=f'Error band ±{error:.2f}')
+
+        axs[i].set_xlabel('DATE')
+        axs[i].set_ylabel(col_name)
+        axs[i].set_ylim(bottom=0)
+        axs[i].legend()
+
+    plt.suptitle(f'{well_name}')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close(fig)
+
+
+def plot_error_vs_time(path, well_name, targets, error, locpath, supptitle):
+    fig, axs = plt.subplots(len(targets), 1, figsize=(len(targets)*3, 10))
+
+    for i, col_name in enumerate(targets):
+        for mark in error['mark'].unique():
+            subset = error[error['mark'] == mark]
+            axs[i].plot(subset['DATE'], subset[col_name], label=f'{col_name} ({mark})')
+        axs[i].set_xlabel('DATE')
+        axs[i].set_ylabel(col_name)
+        axs[i].set_ylim(bottom=0)
+        if(locpath == 'MAPE vs Time'):
+            axs[i].axhline(y=10, color='r', linestyle='--', linewidth=2)
+            axs[i].set_yscale('log')
+            axs[i].set_ylim(bottom=0.1)
+        axs[i].legend()
+
+    plt.suptitle(f'{supptitle}: {well_name}')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close(fig)
+
+
+def plot_actual_vs_prediction(path, well_name, targets, result, actual, supptitle):
+    fig, axs = plt.subplots(1, len(targets), figsize=(len(targets)*5, 5))
+
+    for i, col_name in enumerate(targets):
+        max_actual = np.max(actual[col_name])
+        max_result = np.max(result[col_name])
+        max_axis = np.max([max_result, max_actual])
+        x = np.linspace(0, max_axis, 10)
+
+        for mark in result['mark'].unique():
+            subset_result = result[result['mark'] == mark]
+            subset_actual = actual[actual['mark'] == mark]
+            axs[i].scatter(subset_actual[col_name], subset_result[col_name], label=f'{col_name} ({mark})')
+        axs[i].plot(x, x, linestyle='--', color='r', linewidth=1)
+        axs[i].set_xlabel('Actual')
+        axs[i].set_ylabel('Prediction')
+        axs[i].set_ylim(bottom=0, top=max_axis)
+        axs[i].set_xlim(left=0, right=max_axis)
+        axs[i].set_title(col_name)
+        axs[i].legend()
+
+    plt.suptitle(f'{supptitle}: {well_name}')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close(fig)
+
+
+def group_by_well(df):
+    """Split a frame into one frame per Universal in a single pass"""
+    return {well: group for well, group in df.groupby('Universal', sort=False)}
+
+
+def figure_digest(plot, kwargs):
+    """Hash of everything a figure is drawn from"""
+    digest = hashlib.sha1(f'{RENDER_VERSION}:{plot.__name__}'.encode())
+    for key in sorted(kwargs):
+        value = kwargs[key]
+        digest.update(key.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(','.join(map(str, value.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _render(plot, path, kwargs):
+    plot(path, **kwargs)
+    return path
+
+
+def _load_manifest(path):
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+    return {}
+
+
+def _collect(results, pending, manifest, expected, progress):
+    for count, (relpath, get_result) in enumerate(results, 1):
+        try:
+            get_result()
+            manifest[relpath] = expected[relpath]
+        except Exception as e:
+            print(f"Error rendering {relpath}: {str(e)}")
+        if progress is not None:
+            progress(count / len(pending))
+
+
+def render_figures(figures, root, workers=None, progress=None, sources=()):
+    """
+    Render figures into PNGs under root, skipping those whose inputs are unchanged
+
+    Args:
+        figures: List of (plot function, path relative to root, kwargs)
+        root: Output directory; PNGs in the figures' directories that are not
+            part of this run are removed
+        workers: Rendering processes, defaults to the number of cores
+        progress: Optional callback(fraction) as figures complete
+        sources: Other output directories whose identical PNGs are copied
+            instead of rendered
+
+    Returns:
+        Number of figures actually rendered
+    """
+    manifest_path = os.path.join(root, MANIFEST_FILE)
+    manifest = _load_manifest(manifest_path)
+
+    reusable = {}
+    for source in sources:
+        for relpath, digest in _load_manifest(os.path.join(source, MANIFEST_FILE)).items():
+            if os.path.exists(os.path.join(source, relpath)):
+                reusable.setdefault(digest, os.path.join(source, relpath))
+
+    expected = {}
+    pending = []
+    copies = []
+    for plot, relpath, kwargs in figures:
+        digest = figure_digest(plot, kwargs)
+        expected[relpath] = digest
+        path = os.path.join(root, relpath)
+        if manifest.get(relpath) == digest and os.path.exists(path):
+            continue
+        if digest in reusable:
+            copies.append((reusable[digest], path, relpath))
+        else:
+            pending.append((plot, path, kwargs, relpath))
+
+    for directory in {os.path.dirname(relpath) for relpath in expected}:
+        directory = os.path.join(root, directory)
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            relpath = os.path.relpath(os.path.join(directory, name), root)
+            if name.endswith('.png') and relpath not in expected:
+                os.remove(os.path.join(directory, name))
+
+    manifest = {relpath: digest for relpath, digest in manifest.items() if expected.get(relpath) == digest}
+    for source, path, relpath in copies:
+        shutil.copyfile(source, path)
+        manifest[relpath] = expected[relpath]
+
+    if workers == 1 or len(pending) <= 1:
+        results = ((relpath, partial(_render, plot, path, kwargs)) for plot, path, kwargs, relpath in pending)
+        _collect(results, pending, manifest, expected, progress)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_render, plot, path, kwargs): relpath for plot, path, kwargs, relpath in pending}
+            results = ((futures[future], future.result) for future in as_completed(futures))
+            _collect(results, pending, manifest, expected, progress)
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    return len(pending)
@@ -1,19 +1,44 @@
 import pandas as pd
 import numpy as np
-import os, time, shutil
+import os, time
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import MinMaxScaler
-import matplotlib.pyplot as plt
-
-def run_ml(filtered_df, start_date, end_date):
-    folder_marker = 'export'
-    if os.path.exists(folder_marker):
-        for item in os.listdir(folder_marker):
-            item_path = os.path.join(folder_marker, item)
-            if os.path.isfile(item_path) or os.path.islink(item_path):
-                os.unlink(item_path)
-            elif os.path.isdir(item_path):
-                shutil.rmtree(item_path)
+import ml_plots
+import run_store
+
+# Trees of the forest, grown in steps so training can report progress
+RF_TREES = 500
+RF_TREES_PER_STEP = 50
+# Fixed so the same data gives the same predictions and unchanged figures are reused
+RF_RANDOM_STATE = 42
+
+TEST_DATA_FILE = './Data/test_df.csv'
+
+def run_ml(filtered_df, start_date, end_date, progress=None, plot_workers=None):
+    """
+    Train the Random Forest and write metrics and plots into a run directory
+
+    Runs are stored under export/runs/ keyed by a hash of the input slice, the
+    date split and the model settings. If the same run already finished, its
+    directory is returned without training again.
+
+    Args:
+        progress: Optional callback(fraction, message) called as the run advances
+        plot_workers: Processes rendering the figures, defaults to the number of cores
+    """
+    def report(fraction, message):
+        if progress is not None:
+            progress(fraction, message)
+
+    settings = {'trees': RF_TREES, 'random_state': RF_RANDOM_STATE, 'test_data': run_store.file_digest(TEST_DATA_FILE)}
+    key = run_store.run_key(filtered_df, start_date, end_date, settings)
+    folder_marker = run_store.run_dir(key)
+    if run_store.load_manifest(folder_marker) is not None:
+        report(1.0, 'Reusing previous run')
+        return folder_marker
+
+    os.makedirs(folder_marker, exist_ok=True)
+    report(0.0, 'Preparing data')
 
     matched_universal_values = filtered_df['Universal'].unique()
     dataset = filtered_df[filtered_df['Universal'].isin(matched_universal_values)]
@@ -60,8 +85,11 @@ def run_ml(filtered_df, start_date, end_date):
     train_X_scaled = scaler.fit_transform(train_x)
     test_X_scaled = scaler.transform(test_x)
 
-    rf_model = RandomForestRegressor(n_estimators=500)
-    rf_model.fit(train_X_scaled, train_y)
+    rf_model = RandomForestRegressor(n_estimators=RF_TREES_PER_STEP, warm_start=True, random_state=RF_RANDOM_STATE)
+    for grown in range(0, RF_TREES, RF_TREES_PER_STEP):
+        report(0.05 + 0.45 * grown / RF_TREES, f'Training Random Forest ({grown}/{RF_TREES} trees)')
+        rf_model.set_params(n_estimators=grown + RF_TREES_PER_STEP)
+        rf_model.fit(train_X_scaled, train_y)
 
     train_score = rf_model.score(train_X_scaled, train_y)
     test_score = rf_model.score(test_X_scaled, test_y)
@@ -111,6 +139,7 @@ def run_ml(filtered_df, start_date, end_date):
     result_rolling = pd.concat([result[['DATE', 'Universal', 'mark']], grouped], axis=1)
 
     ### ERROR SECTION ###
+    report(0.5, 'Computing errors')
     save_dir = f'./{folder_marker}/1-Metrics'
 
     if not os.path.exists(save_dir):
@@ -163,110 +192,55 @@ def run_ml(filtered_df, start_date, end_date):
 
 
     ### PLOTTING SECTION ###
-    test_df = pd.read_csv('./Data/test_df.csv')
-
-    def plot_well_data(locpath, dataset, pivot_mae):
-        save_dir = f'./{folder_marker}/{locpath}'
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
-
-        for well_name in dataset.Universal.unique():
-            filtered_result = result[result['Universal'] == well_name]
-            filtered_actual = actual[actual['Universal'] == well_name]
-            filtered_test = test_df[test_df['Universal'] == well_name]
-
-            fig, axs = plt.subplots(len(targets), 1, figsize=(len(targets) * 3, 10))
-
-            for i, col_name in enumerate(targets):
-                axs[i].plot(filtered_actual['DATE'], filtered_actual[col_name], label=f'{col_name} (Actual)')
-                axs[i].scatter(filtered_test['DATE'], filtered_test[col_name], label=f'{col_name} (Well Test)', color='red', s=5, alpha=0.5)
-
-                for mark in filtered_result['mark'].unique():
-                    subset = filtered_result[filtered_result['mark'] == mark]
-                    axs[i].plot(subset['DATE'], subset[col_name], label=f'{col_name} ({mark})')
-                    mae = pivot_mae.loc[(well_name, mark), col_name]
-                    if mark != 'TRAIN':
-                        axs[i].fill_between(subset['DATE'], subset[col_name] - mae, subset[col_name] + mae, color='orange', alpha=0.1, label=f'Error band ±{mae:.2f}')
-
-                axs[i].set_xlabel('DATE')
-                axs[i].set_ylabel(col_name)
-                axs[i].set_ylim(bottom=0)
-                axs[i].legend()
-
-            plt.suptitle(f'{well_name}')
-            plt.tight_layout()
-            plt.savefig(os.path.join(save_dir, f'{well_name}.png'))
-            plt.close()
-
-    plot_well_data('0-Result Overlay', dataset, pivot_table_mae)
-    plot_well_data('0-Rolling Result Overlay', dataset, pivot_table_mae_rolling)
-
-    ## PLOTTING VS SECTION ##
-    def plot_vs_data(locpath, dataset, error_type, supptitle):
-        save_dir = f'./{folder_marker}/1-Error {locpath}'
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
-
-        for well_name in dataset.Universal.unique():
-            filtered_result = error_type[error_type['Universal'] == well_name]
-            fig, axs = plt.subplots(len(targets), 1, figsize=(len(targets)*3, 10))
-
-            for i, col_name in enumerate(targets):
-                for mark in filtered_result['mark'].unique():
-                    subset = filtered_result[filtered_result['mark'] == mark]
-                    axs[i].plot(subset['DATE'], subset[col_name], label=f'{col_name} ({mark})')
-                axs[i].set_xlabel('DATE')
-                axs[i].set_ylabel(col_name)
-                axs[i].set_ylim(bottom=0)
-                if(locpath == 'MAPE vs Time'):
-                    axs[i].axhline(y=10, color='r', linestyle='--', linewidth=2)
-                    axs[i].set_yscale('log')
-                    axs[i].set_ylim(bottom=0.1)
-                axs[i].legend()
-
-            plt.suptitle(f'{supptitle}: {well_name}')
-            plt.tight_layout()
-            plt.savefig(os.path.join(save_dir, f'{well_name}.png'))
-            plt.close()
-
-    plot_vs_data('MAPE vs Time', dataset, relative_error, 'MAPE(%)')
-    plot_vs_data('vs Time', dataset, absolute_error, 'Absolute Error')
-    plot_vs_data('vs Time (Rolling)', dataset, absolute_error_rolling, 'Absolute Error (Rolling)')
-
-    ## PLOTTING VS SECTION II ##
-    def plot_vs_data_2(locpath, dataset, supptitle):
-        save_dir = f'./{folder_marker}/2-Actual vs {locpath}'
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
-
-        for well_name in dataset.Universal.unique():
-            filtered_result = result[result['Universal'] == well_name]
-            filtered_actual = actual[actual['Universal'] == well_name]
-            fig, axs = plt.subplots(1, len(targets), figsize=(len(targets)*5, 5))
-
-            for i, col_name in enumerate(targets):
-                max_actual = np.max(filtered_actual[col_name])
-                max_result = np.max(filtered_result[col_name])
-                max_axis = np.max([max_result, max_actual])
-                x = np.linspace(0, max_axis, 10)
-
-                for mark in filtered_result['mark'].unique():
-                    subset_result = filtered_result[filtered_result['mark'] == mark]
-                    subset_actual = filtered_actual[filtered_actual['mark'] == mark]
-                    axs[i].scatter(subset_actual[col_name], subset_result[col_name], label=f'{col_name} ({mark})')
-                axs[i].plot(x, x, linestyle='--', color='r', linewidth=1)
-                axs[i].set_xlabel('Actual')
-                axs[i].set_ylabel('Prediction')
-                axs[i].set_ylim(bottom=0, top=max_axis)
-                axs[i].set_xlim(left=0, right=max_axis)
-                axs[i].set_title(col_name)
-                axs[i].legend()
-
-            plt.suptitle(f'{supptitle}: {well_name}')
-            plt.tight_layout()
-            plt.savefig(os.path.join(save_dir, f'{well_name}.png'))
-            plt.close()
-
-    plot_vs_data_2('Prediction', dataset, 'Actual vs Prediction')
+    test_df = pd.read_csv(TEST_DATA_FILE)
+
+    # Group once per frame instead of masking every frame for every figure
+    result_by_well = ml_plots.group_by_well(result)
+    actual_by_well = ml_plots.group_by_well(actual)
+    test_by_well = ml_plots.group_by_well(test_df)
+    no_test = test_df.iloc[0:0]
+    errors_by_well = {
+        'MAPE vs Time': (ml_plots.group_by_well(relative_error), 'MAPE(%)'),
+        'vs Time': (ml_plots.group_by_well(absolute_error), 'Absolute Error'),
+        'vs Time (Rolling)': (ml_plots.group_by_well(absolute_error_rolling), 'Absolute Error (Rolling)'),
+    }
+
+    figures = []
+    for well_name in dataset.Universal.unique():
+        filtered_result = result_by_well[well_name]
+        filtered_actual = actual_by_well[well_name]
+        marks = filtered_result['mark'].unique()
+
+        for locpath, pivot_mae in [('0-Result Overlay', pivot_table_mae), ('0-Rolling Result Overlay', pivot_table_mae_rolling)]:
+            mae = {mark: pivot_mae.loc[(well_name, mark), targets].to_dict() for mark in marks}
+            figures.append((ml_plots.plot_well_overlay, os.path.join(locpath, f'{well_name}.png'), dict(
+                well_name=well_name, targets=targets, result=filtered_result, actual=filtered_actual,
+                test=test_by_well.get(well_name, no_test), mae=mae)))
+
+        for locpath, (error_by_well, supptitle) in errors_by_well.items():
+            figures.append((ml_plots.plot_error_vs_time, os.path.join(f'1-Error {locpath}', f'{well_name}.png'), dict(
+                well_name=well_name, targets=targets, error=error_by_well[well_name], locpath=locpath, supptitle=supptitle)))
+
+        figures.append((ml_plots.plot_actual_vs_prediction, os.path.join('2-Actual vs Prediction', f'{well_name}.png'), dict(
+            well_name=well_name, targets=targets, result=filtered_result, actual=filtered_actual,
+            supptitle='Actual vs Prediction')))
+
+    report(0.6, 'Plotting')
+    ml_plots.render_figures(figures, folder_marker, workers=plot_workers,
+                            progress=lambda fraction: report(0.6 + 0.4 * fraction, 'Plotting'),
+                            sources=run_store.other_run_dirs(folder_marker))
+
+    run_store.write_manifest(folder_marker, {
+        'key': key,
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'wells': [str(well) for well in dataset.Universal.unique()],
+        'features': predictors,
+        'rows': len(dataset),
+        'train_score': train_score,
+        'test_score': test_score,
+        'mae': absolute_error.groupby('mark')[targets].mean().round(2).to_dict('index'),
+        'settings': settings,
+    })
 
     return folder_marker
\ No newline at end of file
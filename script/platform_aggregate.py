@@ -0,0 +1,107 @@
+import os
+import threading
+
+import pandas as pd
+import data_cache
+
+RATE_COLUMN = 'CORR_OIL_RATE_STBD'
+AGGREGATE_COLUMNS = ['DATE_STAMP', RATE_COLUMN, 'WELL_NAME', 'TIME']
+
+
+class PlatformAggregate:
+    """
+    Oil rate summed by date over a set of wells of one workbook
+
+    The set is updated incrementally: selecting or deselecting a well adds or
+    subtracts that well's series instead of regrouping every sheet. Everything
+    is rebuilt when the workbook changes on disk.
+
+    Args:
+        excel_file: Path of the well workbook
+    """
+    def __init__(self, excel_file):
+        self.excel_file = excel_file
+        self._version = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._contributions = {}
+        self._rate = pd.Series(dtype=float)
+        self._count = pd.Series(dtype=float)
+        self._frame = None
+
+    def _well_series(self, well):
+        df = data_cache.read_well_sheet(self.excel_file, well)
+        grouped = df.groupby('DATE_STAMP')[RATE_COLUMN]
+        return grouped.sum(), grouped.size().astype(float)
+
+    def _apply(self, added, removed):
+        """Add and subtract (rate, count) series in one grouping pass"""
+        rates = [self._rate] + [rate for rate, _ in added] + [-rate for rate, _ in removed]
+        counts = [self._count] + [count for _, count in added] + [-count for _, count in removed]
+        self._rate = pd.concat(rates).groupby(level=0).sum()
+        self._count = pd.concat(counts).groupby(level=0).sum()
+
+    def update(self, wells):
+        """
+        Aggregate over exactly the given wells
+
+        Returns:
+            DataFrame with DATE_STAMP, the summed rate, WELL_NAME holding the
+            number of wells reporting on that date, and a TIME index
+        """
+        version = data_cache.file_version(self.excel_file)
+        wells = set(wells)
+
+        with self._lock:
+            if version != self._version:
+                self._reset()
+                self._version = version
+
+            removed = [self._contributions.pop(well) for well in self._contributions.keys() - wells]
+            added = []
+            for well in wells - self._contributions.keys():
+                try:
+                    self._contributions[well] = self._well_series(well)
+                except Exception as e:
+                    print(f"Error reading well {well}: {str(e)}")
+                    continue
+                added.append(self._contributions[well])
+
+            if added or removed:
+                self._apply(added, removed)
+                # Dates no remaining well reports on disappear from the aggregate
+                reported = self._count > 0.5
+                self._rate = self._rate[reported].sort_index()
+                self._count = self._count[reported].reindex(self._rate.index)
+                self._frame = None
+
+            if self._frame is None:
+                self._frame = pd.DataFrame({
+                    'DATE_STAMP': self._rate.index,
+                    RATE_COLUMN: self._rate.values,
+                    'WELL_NAME': self._count.round().astype(int).values,
+                    'TIME': range(len(self._rate)),
+                }, columns=AGGREGATE_COLUMNS)
+
+            return self._frame.copy()
+
+
+_aggregates = {}
+_aggregates_lock = threading.Lock()
+
+
+def platform_data(excel_file, wells, name=None):
+    """
+    Shared aggregate of the given wells, see PlatformAggregate.update
+
+    Aggregates with a different name are kept apart, so a process switching
+    between e.g. platforms and fields does not re-add every well each time.
+    """
+    key = (os.path.abspath(excel_file), name)
+    with _aggregates_lock:
+        if key not in _aggregates:
+            _aggregates[key] = PlatformAggregate(key[0])
+        aggregate = _aggregates[key]
+    return aggregate.update(wells)
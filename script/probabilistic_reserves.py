@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import curve_cum_function as ccf
+import decline_solver
+
+# Monte Carlo reserves: qi, Di (and b for hyperbolic models) are drawn around
+# the fitted model from the covariance of the fit, and every sample is solved
+# in closed form with decline_solver, CHUNK_SAMPLES at a time.
+
+DEFAULT_SAMPLES = 100_000
+CHUNK_SAMPLES = 250_000
+
+# P90 is the low case, i.e. exceeded by 90% of the samples
+PERCENTILES = {'P90': 10, 'P50': 50, 'P10': 90}
+
+
+def parameter_covariance(series_time, observed, qi, di, b, fit_b=False):
+    """
+    Covariance of (qi, Di[, b]) from the residuals of a fitted Arps model
+
+    Linearised around the given parameters: s^2 (J^T J)^-1, with J the
+    analytic Jacobian of the rate and s^2 the residual variance.
+    """
+    t = np.asarray(series_time, dtype=float)
+    q = np.asarray(observed, dtype=float)
+    params = [qi, di, b] if fit_b else [qi, di]
+
+    rate, jacobian = ccf.arps_rate_and_jacobian(params, t, None if fit_b else b)
+    dof = len(q) - len(params)
+    if dof <= 0:
+        return np.zeros((len(params), len(params)))
+
+    residual_variance = np.sum((q - rate)**2) / dof
+    return residual_variance * np.linalg.pinv(jacobian.T @ jacobian)
+
+
+def sample_parameters(qi, di, b, covariance, n_samples, rng, b_bounds=(0.0001, 1.0)):
+    """
+    Draw qi, Di and b from a normal distribution around the fitted model
+
+    b is only drawn when the covariance covers it (3x3), otherwise it stays
+    fixed. Draws are clipped to physical values.
+    """
+    fit_b = covariance.shape[0] == 3
+    mean = [qi, di, b] if fit_b else [qi, di]
+    draws = rng.multivariate_normal(mean, covariance, size=n_samples, method='eigh')
+
+    qi_samples = np.maximum(draws[:, 0], 1e-9)
+    di_samples = np.maximum(draws[:, 1], 0.0)
+    if fit_b:
+        b_samples = np.clip(draws[:, 2], *b_bounds)
+    else:
+        b_samples = np.full(n_samples, float(b))
+    return qi_samples, di_samples, b_samples
+
+
+def simulate_reserves(series_time, observed, qi, di, b, start_rate, limit_rate, cumulative_production,
+                      forecast_dates, n_samples=DEFAULT_SAMPLES, b_bounds=(0.0001, 1.0), seed=None):
+    """
+    P90/P50/P10 EUR, reserves and cut-off date of one model
+
+    The forecast starts from start_rate like the DCA apps; each sample scales
+    it by how far the sampled model sits from the fitted one at the end of
+    the fit window.
+
+    Args:
+        series_time, observed: TIME and rate of the fit window
+        qi, di, b: Fitted model; b is sampled as well for hyperbolic models
+        start_rate: Rate the forecast starts from
+        limit_rate: Economic rate limit
+        cumulative_production: Production to date, added to the EUR
+        forecast_dates: Monthly forecast dates, the first one being step 0
+        n_samples: Number of Monte Carlo samples
+        seed: Random seed, the same inputs and seed give the same percentiles
+
+    Returns:
+        Dict of 'P90', 'P50' and 'P10' to their EUR, reserves and cut-off
+        date (None when the limit is not reached within the forecast dates)
+    """
+    rng = np.random.default_rng(seed)
+    fit_b = b not in (0, 1)
+    covariance = parameter_covariance(series_time, observed, qi, di, b, fit_b)
+
+    t_end = float(np.asarray(series_time, dtype=float)[-1])
+    fitted_end_rate = decline_solver.rate_at(qi, di, b, t_end)
+    horizon = len(forecast_dates) - 1
+
+    EURs = np.empty(n_samples)
+    steps = np.empty(n_samples)
+    for start in range(0, n_samples, CHUNK_SAMPLES):
+        stop = min(start + CHUNK_SAMPLES, n_samples)
+        qi_samples, di_samples, b_samples = sample_parameters(qi, di, b, covariance, stop - start, rng, b_bounds)
+
+        start_rates = np.full(stop - start, float(start_rate))
+        if fitted_end_rate > 0:
+            start_rates *= decline_solver.rate_at(qi_samples, di_samples, b_samples, t_end) / fitted_end_rate
+        EURs[start:stop], _, steps[start:stop] = decline_solver.solve_eur(
+            start_rates, di_samples, b_samples, limit_rate, cumulative_production, horizon, month_grid=True)
+
+    results = {}
+    for name, percentile in PERCENTILES.items():
+        EUR = np.percentile(EURs, percentile)
+        # Low reserves come with an early cut-off
+        step = np.percentile(steps, percentile, method='nearest')
+        results[name] = {
+            'EUR': EUR,
+            'reserves': EUR - cumulative_production,
+            'cut_off_date': decline_solver.cut_off_date(forecast_dates, step),
+        }
+    return results
+
+
+def summary_table(results):
+    """Percentiles as a frame with one row per case, for display"""
+    return pd.DataFrame([
+        {
+            "Case": name,
+            "Reserves (bbl)": f"{result['reserves']:,.2f}",
+            "EUR": f"{result['EUR']:,.2f}",
+            "Cut Off Date": result['cut_off_date'].strftime('%d-%m-%Y') if result['cut_off_date'] is not None else "N/A",
+        }
+        for name, result in results.items()
+    ])
@@ -0,0 +1,90 @@
+import os
+import json
+import time
+import hashlib
+
+import pandas as pd
+
+# Bump when run_ml changes what it writes, so older runs are not reused
+RUN_STORE_VERSION = 1
+
+RUNS_DIR = os.path.join('export', 'runs')
+MANIFEST_FILE = 'manifest.json'
+
+
+def run_key(filtered_df, start_date, end_date, settings):
+    """
+    Hash identifying a training run
+
+    Covers the input slice (rows, columns and index), the train/test split
+    dates and any other settings the outputs depend on.
+    """
+    digest = hashlib.sha1(f'{RUN_STORE_VERSION}'.encode())
+    digest.update(','.join(map(str, filtered_df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(filtered_df, index=True).values.tobytes())
+    digest.update(str(pd.to_datetime(start_date)).encode())
+    digest.update(str(pd.to_datetime(end_date)).encode())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def run_dir(key, root=RUNS_DIR):
+    return os.path.join(root, key[:12])
+
+
+def load_manifest(path):
+    """Manifest of a finished run directory, or None if the run is incomplete"""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(path, manifest):
+    """Record the run and the digest of every file it produced, written last"""
+    files = {}
+    for folder, _, names in os.walk(path):
+        for name in names:
+            if name != MANIFEST_FILE:
+                file_path = os.path.join(folder, name)
+                files[os.path.relpath(file_path, path).replace(os.sep, '/')] = file_digest(file_path)
+
+    manifest = {**manifest, 'files': files, 'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+    tmp_path = os.path.join(path, f'{MANIFEST_FILE}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, default=str)
+    os.replace(tmp_path, os.path.join(path, MANIFEST_FILE))
+    return manifest
+
+
+def list_runs(root=RUNS_DIR):
+    """Manifests of all finished runs, newest first, each with its 'path'"""
+    if not os.path.isdir(root):
+        return []
+    runs = []
+    for name in os.listdir(root):
+        manifest = load_manifest(os.path.join(root, name))
+        if manifest is not None:
+            runs.append({**manifest, 'path': os.path.join(root, name)})
+    return sorted(runs, key=lambda run: run.get('created', ''), reverse=True)
+
+
+def other_run_dirs(path, root=RUNS_DIR):
+    """Directories of the other runs, to reuse identical artifacts from"""
+    if not os.path.isdir(root):
+        return []
+    current = os.path.abspath(path)
+    return [os.path.join(root, name) for name in os.listdir(root)
+            if os.path.abspath(os.path.join(root, name)) != current and os.path.isdir(os.path.join(root, name))]
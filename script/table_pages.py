@@ -0,0 +1,265 @@
+import io
+import os
+import re
+import json
+import math
+import time
+import zlib
+import hashlib
+import tempfile
+from urllib.parse import urlencode
+
+import flask
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import data_cache
+
+# Server-side pages of the DTF and ML data tables. The rows of a filter state
+# stay on the server, cached per dataset version; the table asks for one page
+# at a time, so only that page is formatted and sent to the browser. Downloads
+# of the same rows are streamed from a Flask route in chunks; the link only
+# carries a token for the filter state, which is kept on the server.
+
+# Upper bound for the cached selections (bytes)
+MAX_SELECTION_BYTES = 256 * 1024 * 1024
+
+# Rows formatted and sent per chunk of a download
+DOWNLOAD_CHUNK_ROWS = 50000
+
+# Download format: (mimetype, file extension)
+DOWNLOAD_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'csv.gz': ('application/gzip', '.csv.gz'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+}
+
+# Filter states of download links, shared by all server processes; kept out
+# of export/, which the ML page lists as results
+DOWNLOAD_SPECS_DIR = os.path.join(tempfile.gettempdir(), 'smartwell-downloads')
+
+# Filter states unused for this long are removed (seconds); a link older
+# than that answers 404
+DOWNLOAD_SPEC_MAX_AGE = 24 * 3600
+
+# How long a process trusts its own copy of a filter state before marking
+# the file as used again (seconds)
+DOWNLOAD_SPEC_REFRESH = 3600
+
+_selection_cache = data_cache.LRUCache(MAX_SELECTION_BYTES, sizeof=data_cache.frame_nbytes)
+_download_specs = data_cache.LRUCache(16 * 1024 * 1024, sizeof=len, ttl=DOWNLOAD_SPEC_REFRESH)
+
+
+def sort_rows(df, sort_by):
+    """
+    Rows ordered by a DataTable sort_by list
+
+    The sort is stable, so rows that tie keep the order of the selection.
+    Columns no longer in the selection are ignored.
+    """
+    sort_by = [column for column in sort_by or [] if column['column_id'] in df.columns]
+    if not sort_by:
+        return df
+    return df.sort_values(by=[column['column_id'] for column in sort_by],
+                          ascending=[column['direction'] == 'asc' for column in sort_by],
+                          kind='mergesort')
+
+
+def rows(source_file, params, select, sort_by=None):
+    """
+    Rows of a filter state in table order, cached
+
+    Args:
+        source_file: Dataset the rows come from; a new version misses the cache
+        params: JSON-serialisable filter state, as kept in the page's store
+        select: Function returning the rows of params
+        sort_by: sort_by of the table, applied on top of the selection's order
+    """
+    key = (data_cache.file_version(source_file), json.dumps(params, sort_keys=True, default=str))
+    df = _selection_cache.get(key)
+    if df is None:
+        df = select(params)
+        _selection_cache.put(key, df)
+
+    if not sort_by:
+        return df
+    sorted_key = key + (json.dumps(sort_by, sort_keys=True),)
+    sorted_df = _selection_cache.get(sorted_key)
+    if sorted_df is None:
+        sorted_df = sort_rows(df, sort_by)
+        _selection_cache.put(sorted_key, sorted_df)
+    return sorted_df
+
+
+def page(df, page_current, page_size):
+    """Rows of one table page"""
+    start = (page_current or 0) * page_size
+    return df.iloc[start:start + page_size]
+
+
+def page_count(df, page_size):
+    return max(1, math.ceil(len(df) / page_size))
+
+
+def _spec_path(token):
+    return os.path.join(DOWNLOAD_SPECS_DIR, f'{token}.json')
+
+
+def store_spec(params):
+    """
+    Keep a filter state on the server and return its token
+
+    The token is a hash of the state, so the same filters always get the
+    same token. The state is also written under DOWNLOAD_SPECS_DIR, where
+    any server process can read it back; files unused for
+    DOWNLOAD_SPEC_MAX_AGE are removed when a new one is written.
+    """
+    spec = json.dumps(params, sort_keys=True, default=str)
+    token = hashlib.sha1(spec.encode()).hexdigest()
+    if _download_specs.get(token) is None:
+        path = _spec_path(token)
+        try:
+            # Still in use, so it is not pruned under a live link
+            os.utime(path)
+        except FileNotFoundError:
+            os.makedirs(DOWNLOAD_SPECS_DIR, exist_ok=True)
+            prune_specs()
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(spec)
+            os.replace(tmp_path, path)
+        _download_specs.put(token, spec)
+    return token
+
+
+def prune_specs(max_age=DOWNLOAD_SPEC_MAX_AGE):
+    """Remove filter states, and leftover temporary files, older than max_age seconds"""
+    cutoff = time.time() - max_age
+    with os.scandir(DOWNLOAD_SPECS_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                # Removed by another server process meanwhile
+                pass
+
+
+def load_spec(token):
+    """
+    Filter state of a token from store_spec
+
+    Raises:
+        ValueError: The token is malformed
+        KeyError: No filter state is stored for the token
+    """
+    if not re.fullmatch(r'[0-9a-f]{40}', token):
+        raise ValueError(f"Malformed download token: {token}")
+    spec = _download_specs.get(token)
+    if spec is None:
+        try:
+            with open(_spec_path(token)) as f:
+                spec = f.read()
+        except FileNotFoundError:
+            raise KeyError(token)
+        _download_specs.put(token, spec)
+    return json.loads(spec)
+
+
+def download_href(app, route, params, sort_by, file_format):
+    """
+    Link to a download route for the rows of a filter state, in table order
+
+    The filter state stays on the server; the link carries its token, so it
+    stays short however many wells and filters are selected.
+    """
+    query = urlencode({'token': store_spec(params), 'sort_by': json.dumps(sort_by or []), 'format': file_format})
+    return f"{app.get_relative_path(route)}?{query}"
+
+
+def download_request(args):
+    """
+    Filter state, sort_by and format of a download link's query arguments
+
+    Raises:
+        ValueError, KeyError: The arguments are missing or malformed, or the
+            token is unknown
+    """
+    params = load_spec(args['token'])
+    sort_by = json.loads(args.get('sort_by', '[]'))
+    file_format = args.get('format', 'csv')
+    if file_format not in DOWNLOAD_FORMATS:
+        raise ValueError(f"Unknown download format: {file_format}")
+    return params, sort_by, file_format
+
+
+def csv_chunks(df, date_format='%d-%m-%Y'):
+    """CSV of the rows as encoded chunks, the header in the first one"""
+    if df.empty:
+        yield df.to_csv(index=False).encode('utf-8')
+    for start in range(0, len(df), DOWNLOAD_CHUNK_ROWS):
+        chunk = df.iloc[start:start + DOWNLOAD_CHUNK_ROWS].copy()
+        chunk['DATE'] = chunk['DATE'].dt.strftime(date_format)
+        yield chunk.to_csv(index=False, header=(start == 0)).encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file handing out what was written since the last take()"""
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        # Parquet records offsets from the start of the file
+        return self._position
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def parquet_chunks(df):
+    """Parquet file of the rows, one row group per chunk"""
+    sink = _ChunkSink()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema) as writer:
+        for start in range(0, len(df), DOWNLOAD_CHUNK_ROWS):
+            chunk = df.iloc[start:start + DOWNLOAD_CHUNK_ROWS]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.take()
+    yield sink.take()
+
+
+def download_response(df, file_format, filename):
+    """
+    Streamed download of the rows
+
+    CSV gets the table's day-first dates; Parquet keeps the column types.
+    """
+    mimetype, extension = DOWNLOAD_FORMATS[file_format]
+    if file_format == 'parquet':
+        body = parquet_chunks(df)
+    elif file_format == 'csv.gz':
+        body = gzip_chunks(csv_chunks(df))
+    else:
+        body = csv_chunks(df)
+    return flask.Response(body, mimetype=mimetype,
+                          headers={'Content-Disposition': f'attachment; filename="{filename}{extension}"'})
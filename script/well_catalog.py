@@ -0,0 +1,101 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+
+# Wells of the apps: the field -> platform -> well hierarchy of the well names
+# (<field>-<platform>-<well>) and, per sheet, the rows of every well. The
+# index is built once per file version, so a callback slices one well's rows
+# instead of comparing the whole name column.
+
+
+def object_tree(names, field_label="{}ekapai Field"):
+    """
+    Nested dict of field -> platform -> wells, labelled as in the apps
+
+    Names not of the form <field>-<platform>-<well> are left out.
+
+    Args:
+        names: Well names, kept in this order
+        field_label: Format of a field's label from its code
+    """
+    objects = {}
+    for name in names:
+        parents = name.split("-")
+        if len(parents) < 3:
+            continue
+        field_key = field_label.format(parents[0])
+        platform_key = f"Platform {parents[1]}"
+        objects.setdefault(field_key, {}).setdefault(platform_key, []).append(name)
+    return objects
+
+
+class WellIndex:
+    """
+    Row range of every well of a frame
+
+    When the rows of each well are not already contiguous, the frame is
+    copied with its rows stably sorted by well, so every well is one slice.
+    Rows without a well name belong to no well and are left out.
+
+    Args:
+        df: Frame with one row per well and date
+        column: Column holding the well name
+    """
+    def __init__(self, df, column='Universal'):
+        self.nbytes = 0
+        named = df[column].notna()
+        if not named.all():
+            df = df[named]
+            self.nbytes = data_cache.frame_nbytes(df)
+
+        values = df[column].to_numpy()
+        # Well names in order of first appearance, as Series.unique() gives them
+        self.names = list(pd.unique(values))
+
+        starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+        if self.names and len(starts) >= len(self.names):
+            # Sorted as text, so names read as numbers do not break the sort
+            df = df.take(np.argsort(values.astype(str), kind='stable'))
+            values = df[column].to_numpy()
+            starts = np.flatnonzero(values[1:] != values[:-1]) + 1
+            self.nbytes = data_cache.frame_nbytes(df)
+
+        self.frame = df
+        bounds = np.concatenate(([0], starts, [len(values)]))
+        self._ranges = {values[start]: (start, end) for start, end in zip(bounds[:-1], bounds[1:]) if end > start}
+        self.nbytes += sys.getsizeof(self._ranges)
+
+    def rows(self, well):
+        """Rows of one well in their original order; empty for an unknown well"""
+        start, end = self._ranges.get(well, (0, 0))
+        return self.frame.iloc[start:end]
+
+    def __contains__(self, well):
+        return well in self._ranges
+
+    def __len__(self):
+        return len(self._ranges)
+
+
+_index_cache = data_cache.LRUCache(data_cache.MAX_SHEET_CACHE_BYTES, sizeof=lambda index: index.nbytes)
+
+
+def sheet_index(excel_file, sheet_name, column='Universal'):
+    """
+    WellIndex of one workbook sheet
+
+    Cached per file version like the sheet itself; the index shares the
+    frame of data_cache.read_sheet unless it had to regroup the rows.
+    """
+    path, mtime = data_cache.file_version(excel_file)
+    key = (path, mtime, sheet_name, column)
+
+    index = _index_cache.get(key)
+    if index is None:
+        index = WellIndex(data_cache.read_sheet(excel_file, sheet_name), column)
+        _index_cache.put(key, index)
+
+    return index
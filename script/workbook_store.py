@@ -0,0 +1,211 @@
+import os
+import sys
+import json
+import shutil
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# Date columns and their text format, per workbook
+WELL_DATE_FORMATS = {'DATE_STAMP': '%d/%m/%Y'}
+HISTORICAL_DATE_FORMATS = {
+    'MDATE': '%m/%d/%Y',
+    'START_TIME': '%Y-%m-%d',
+    'DATE_STAMP': '%d/%m/%Y %H:%M',
+}
+DATE_FORMATS = {
+    'show_historicalData.xlsx': HISTORICAL_DATE_FORMATS,
+}
+
+SHEET_LIST = '_sheets.json'
+# Partition name of a CSV file's single table
+CSV_PARTITION = '_csv'
+
+
+def date_formats_for(excel_file):
+    return DATE_FORMATS.get(os.path.basename(excel_file), WELL_DATE_FORMATS)
+
+
+def store_root(excel_file):
+    """Directory holding the columnar copies of a workbook, next to the workbook"""
+    stem = os.path.splitext(os.path.abspath(excel_file))[0]
+    return f'{stem}_store'
+
+
+def version_dir(excel_file):
+    """
+    Directory of the partitions for the workbook's current content
+
+    The directory name encodes the workbook's mtime and size, so a re-uploaded
+    or edited workbook never matches an older conversion.
+    """
+    stat = os.stat(excel_file)
+    return os.path.join(store_root(excel_file), f'{stat.st_mtime_ns}-{stat.st_size}')
+
+
+def partition_path(excel_file, sheet_name):
+    return os.path.join(version_dir(excel_file), f'{quote(str(sheet_name), safe="")}.feather')
+
+
+def parse_dates(df, date_formats):
+    for column, date_format in (date_formats or {}).items():
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], format=date_format)
+    return df
+
+
+def _prepare_version_dir(excel_file):
+    current = version_dir(excel_file)
+    root = store_root(excel_file)
+    if os.path.isdir(root):
+        for name in os.listdir(root):
+            stale = os.path.join(root, name)
+            if stale != current and os.path.isdir(stale):
+                shutil.rmtree(stale, ignore_errors=True)
+    os.makedirs(current, exist_ok=True)
+    return current
+
+
+def _write_atomic(path, write):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_json(path, data):
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+    _write_atomic(path, write)
+
+
+def write_partition(excel_file, sheet_name, df):
+    """Store one parsed sheet; returns False if the frame can't be stored as Arrow"""
+    _prepare_version_dir(excel_file)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Uncompressed so the file can be memory-mapped without decoding
+        _write_atomic(partition_path(excel_file, sheet_name),
+                      lambda path: feather.write_feather(table, path, compression='uncompressed'))
+    except (pa.ArrowException, OSError) as e:
+        print(f"Could not store sheet {sheet_name} of {excel_file}: {str(e)}")
+        return False
+    return True
+
+
+def mapped_frame(table):
+    """
+    DataFrame over a memory-mapped table without copying its buffers
+
+    Numeric and date columns without nulls stay views of the mapped file, so
+    every process reading the same partition shares one copy in the OS page
+    cache. Those columns are read-only; other columns are converted as usual.
+    """
+    columns = {}
+    for name, column in zip(table.column_names, table.columns):
+        try:
+            chunk = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            columns[name] = chunk.to_numpy(zero_copy_only=True)
+        except (pa.ArrowInvalid, IndexError):
+            columns[name] = column.to_pandas()
+    return pd.DataFrame(columns, columns=table.column_names, copy=False)
+
+
+def read_sheet(excel_file, sheet_name, date_formats=None, shared=False):
+    """
+    Read one sheet of a workbook with its date columns already parsed
+
+    Reads the memory-mapped columnar copy when it matches the workbook on
+    disk. Otherwise falls back to Excel and stores the result for next time.
+
+    Args:
+        shared: Return a read-only frame backed by the mapped file (see
+            mapped_frame) instead of a private copy
+    """
+    if date_formats is None:
+        date_formats = date_formats_for(excel_file)
+
+    path = partition_path(excel_file, sheet_name)
+    if os.path.exists(path):
+        try:
+            table = feather.read_table(path, memory_map=True)
+            return mapped_frame(table) if shared else table.to_pandas()
+        except (pa.ArrowException, OSError):
+            pass
+
+    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    df = parse_dates(df, date_formats)
+    if write_partition(excel_file, sheet_name, df) and shared:
+        try:
+            return mapped_frame(feather.read_table(path, memory_map=True))
+        except (pa.ArrowException, OSError):
+            pass
+    return df
+
+
+def read_csv(csv_file, date_columns=(), shared=False):
+    """
+    Read a CSV file with its date columns parsed, through a columnar copy
+
+    Stored like a single-sheet workbook next to the file, so worker processes
+    map the same copy instead of each parsing the CSV (see read_sheet).
+    """
+    path = partition_path(csv_file, CSV_PARTITION)
+    if os.path.exists(path):
+        try:
+            table = feather.read_table(path, memory_map=True)
+            return mapped_frame(table) if shared else table.to_pandas()
+        except (pa.ArrowException, OSError):
+            pass
+
+    df = pd.read_csv(csv_file)
+    for column in date_columns:
+        df[column] = pd.to_datetime(df[column])
+    if write_partition(csv_file, CSV_PARTITION, df) and shared:
+        try:
+            return mapped_frame(feather.read_table(path, memory_map=True))
+        except (pa.ArrowException, OSError):
+            pass
+    return df
+
+
+def sheet_names(excel_file):
+    """Sheet names of a workbook, without opening it when a fresh copy exists"""
+    path = os.path.join(version_dir(excel_file), SHEET_LIST)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+
+    names = pd.ExcelFile(excel_file).sheet_names
+    try:
+        _prepare_version_dir(excel_file)
+        _write_json(path, names)
+    except OSError:
+        pass
+    return names
+
+
+def ingest_workbook(excel_file, date_formats=None):
+    """Convert every sheet of a workbook in one pass, e.g. right after an upload"""
+    if date_formats is None:
+        date_formats = date_formats_for(excel_file)
+
+    sheets = pd.read_excel(excel_file, sheet_name=None)
+    current = _prepare_version_dir(excel_file)
+    for sheet_name, df in sheets.items():
+        write_partition(excel_file, sheet_name, parse_dates(df, date_formats))
+
+    _write_json(os.path.join(current, SHEET_LIST), list(sheets))
+    return list(sheets)
+
+
+if __name__ == '__main__':
+    for workbook in sys.argv[1:]:
+        converted = ingest_workbook(workbook)
+        print(f"{workbook}: {len(converted)} sheets converted")
@@ -0,0 +1,41 @@
+import os
+
+import SmartWell
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
+# Production entry point of the SmartWell pages: no debugger, no reloader,
+# and callbacks served concurrently instead of one at a time.
+#
+# Run from the repository root, the data paths (./Data/..., export/) are
+# relative to it, as in the .bat files.
+#
+# Windows (threads of one process, sharing every cache):
+#   python script\wsgi.py
+#
+# Linux (worker processes; --preload imports the pages once before forking):
+#   gunicorn --pythonpath script --workers 4 --threads 2 --preload wsgi:application
+#
+# Worker processes do not copy the well data: data_cache keeps sheets and
+# the DTF and ML datasets as read-only views of the memory-mapped columnar store (workbook_store), so
+# the OS page cache holds one copy for all of them. ML training jobs are
+# kept in export/ml_jobs.sqlite, so any worker answers a poll or a cancel.
+
+# Workers start with every page ready, so no request waits on a page import
+SmartWell.preload()
+
+application = SmartWell.application
+
+if __name__ == '__main__':
+    host = os.environ.get('SMARTWELL_HOST', '0.0.0.0')
+    port = int(os.environ.get('SMARTWELL_PORT', 8050))
+    threads = int(os.environ.get('SMARTWELL_THREADS', 8))
+    if serve is not None:
+        serve(application, host=host, port=port, threads=threads)
+    else:
+        from werkzeug.serving import run_simple
+        print("waitress is not installed, serving with werkzeug's threaded server")
+        run_simple(host, port, application, threaded=True)